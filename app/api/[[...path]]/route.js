@@ -1,29 +1,182 @@
+import { rm } from 'node:fs/promises'
 import { NextResponse } from 'next/server'
-import { submitHackathonForm, getSubmissions, uploadFile } from '../../../lib/supabase.js'
+import {
+  submitHackathonForm,
+  submitHackathonForms,
+  getSubmitCoalescerMetrics,
+  getDemoStoreMetrics,
+  getSubmissionsVersion,
+  getUploadMetrics,
+  MAX_BATCH_SIZE,
+  getSubmissions,
+  getSubmissionsPage,
+  uploadLocalFile,
+  decodeCursor,
+  DEFAULT_PAGE_SIZE,
+  MAX_PAGE_SIZE
+} from '../../../lib/supabase.js'
+import { createExportStream, EXPORT_FORMATS } from '../../../lib/export.js'
+import {
+  validateSubmission,
+  parseSubmissionFilters,
+  SUBMISSION_FILTER_PARAMS,
+  MAX_SUBMISSION_BYTES,
+  MAX_BATCH_BYTES
+} from '../../../lib/validation.js'
+import { runIdempotent, fingerprint } from '../../../lib/idempotency.js'
+import { spoolToTempFile } from '../../../lib/spool.js'
+import { timePhase, withServerTiming } from '../../../lib/server-timing.js'
+import { getEventLoopMetrics } from '../../../lib/event-loop.js'
+import {
+  MAX_UPLOAD_SIZE,
+  MULTIPART_OVERHEAD_ALLOWANCE,
+  UploadTooLargeError,
+  getMultipartBoundary,
+  readMultipart,
+  sniffAndLimit,
+  isImageSignature
+} from '../../../lib/multipart.js'
+import {
+  MAX_UPLOAD_CHUNK_SIZE,
+  initiateChunkedUpload,
+  writeChunk,
+  getChunkedUploadStatus,
+  completeChunkedUpload,
+  getChunkedUploadMetrics,
+  parseContentDigest,
+  readLimited
+} from '../../../lib/chunked-upload.js'
+import {
+  getCachedResponse,
+  matchesIfNoneMatch,
+  recordNotModified,
+  getResponseCacheMetrics
+} from '../../../lib/response-cache.js'
 
-export async function GET(request) {
+// Replays of an Idempotency-Key are marked so clients can tell them apart
+const idempotentResponse = ({ status, body, replayed }) =>
+  NextResponse.json(body, { status, headers: replayed ? { 'Idempotent-Replayed': 'true' } : undefined })
+
+// Serve a JSON GET from the short-TTL response cache, answering 304 when the
+// client's If-None-Match still matches. no-cache makes browsers revalidate
+// every time instead of reusing a stale copy.
+const cachedJsonResponse = async (request, key, version, produce) => {
+  const { status, body, text, etag, hit } = await timePhase('cache', () => getCachedResponse(key, version, produce))
+  if (status !== 200) {
+    return NextResponse.json(body, { status })
+  }
+
+  const headers = { ETag: etag, 'Cache-Control': 'no-cache', 'X-Cache': hit ? 'HIT' : 'MISS' }
+  if (matchesIfNoneMatch(request.headers.get('if-none-match'), etag)) {
+    recordNotModified()
+    return new Response(null, { status: 304, headers })
+  }
+  return new Response(text, { status: 200, headers: { ...headers, 'Content-Type': 'application/json' } })
+}
+
+// Session id from /api/upload/chunked/<uploadId>[/complete]
+const chunkedUploadId = (pathname) => pathname.split('/upload/chunked/')[1]?.split('/')[0]
+
+// Cache key for a GET: path plus query parameters in a stable order
+const cacheKeyFor = (pathname, searchParams) => {
+  const params = new URLSearchParams(searchParams)
+  params.sort()
+  return `${pathname}?${params}`
+}
+
+async function handleGet(request) {
   try {
-    const { pathname } = new URL(request.url)
+    const { pathname, searchParams } = new URL(request.url)
     
+    // Bulk export streams every submission as NDJSON (default) or CSV
+    if (pathname.includes('/submissions/export')) {
+      const wantsCsv = searchParams.get('format') === 'csv' ||
+        (!searchParams.has('format') && request.headers.get('accept')?.includes('text/csv'))
+      const format = wantsCsv ? 'csv' : (searchParams.get('format') ?? 'ndjson')
+
+      if (!EXPORT_FORMATS[format]) {
+        return NextResponse.json({ error: 'format must be one of: ndjson, csv' }, { status: 400 })
+      }
+
+      return new Response(createExportStream(format), {
+        headers: {
+          'Content-Type': EXPORT_FORMATS[format].contentType,
+          'Content-Disposition': `attachment; filename="submissions.${EXPORT_FORMATS[format].extension}"`,
+          'Cache-Control': 'no-store'
+        }
+      })
+    }
+
     if (pathname.includes('/submissions')) {
-      const result = await getSubmissions()
-      
-      if (!result.success) {
-        return NextResponse.json({ error: result.error }, { status: 500 })
+      // Cursor pagination and filtering are opt-in so existing clients keep getting a plain array
+      if (searchParams.has('limit') || searchParams.has('cursor') || SUBMISSION_FILTER_PARAMS.some(param => searchParams.has(param))) {
+        const limit = Number(searchParams.get('limit') ?? DEFAULT_PAGE_SIZE)
+        if (!Number.isInteger(limit) || limit < 1 || limit > MAX_PAGE_SIZE) {
+          return NextResponse.json({ error: `limit must be an integer between 1 and ${MAX_PAGE_SIZE}` }, { status: 400 })
+        }
+
+        const cursor = searchParams.get('cursor') ? decodeCursor(searchParams.get('cursor')) : null
+        if (searchParams.get('cursor') && !cursor) {
+          return NextResponse.json({ error: 'Invalid cursor' }, { status: 400 })
+        }
+
+        const { filters, error } = parseSubmissionFilters(searchParams)
+        if (error) {
+          return NextResponse.json({ error }, { status: 400 })
+        }
+
+        return cachedJsonResponse(request, cacheKeyFor(pathname, searchParams), getSubmissionsVersion(), async () => {
+          const page = await getSubmissionsPage({ limit, cursor, filters })
+
+          if (!page.success) {
+            return { status: 500, body: { error: page.error } }
+          }
+
+          return { status: 200, body: { data: page.data, next: page.next } }
+        })
       }
-      
-      return NextResponse.json(result.data)
+
+      return cachedJsonResponse(request, cacheKeyFor(pathname, searchParams), getSubmissionsVersion(), async () => {
+        const result = await getSubmissions()
+
+        if (!result.success) {
+          return { status: 500, body: { error: result.error } }
+        }
+
+        return { status: 200, body: result.data }
+      })
     }
 
-    // Health check endpoint
-    if (pathname.includes('/health')) {
-      return NextResponse.json({ 
-        status: 'ok', 
-        timestamp: new Date().toISOString(),
-        mode: process.env.NEXT_PUBLIC_SUPABASE_URL?.includes('demo') ? 'demo' : 'production'
+    // Resumable upload status: which byte ranges have arrived
+    if (pathname.includes('/upload/chunked/')) {
+      const { status, body } = getChunkedUploadStatus(chunkedUploadId(pathname))
+      return NextResponse.json(body, { status, headers: { 'Cache-Control': 'no-store' } })
+    }
+
+    // Server metrics (group commit flushes, demo store occupancy, GET response cache, upload dedupe, resumable uploads, event-loop delay)
+    if (pathname.includes('/metrics')) {
+      return NextResponse.json({
+        submitCoalescer: getSubmitCoalescerMetrics(),
+        demoStore: getDemoStoreMetrics(),
+        responseCache: getResponseCacheMetrics(),
+        uploads: getUploadMetrics(),
+        chunkedUploads: getChunkedUploadMetrics(),
+        eventLoop: getEventLoopMetrics()
       })
     }
 
+    // Health check endpoint; the cached timestamp is at most one TTL old
+    if (pathname.includes('/health')) {
+      return cachedJsonResponse(request, cacheKeyFor(pathname, searchParams), 0, async () => ({
+        status: 200,
+        body: {
+          status: 'ok',
+          timestamp: new Date().toISOString(),
+          mode: process.env.NEXT_PUBLIC_SUPABASE_URL?.includes('demo') ? 'demo' : 'production'
+        }
+      }))
+    }
+
     return NextResponse.json({ error: 'Endpoint not found' }, { status: 404 })
   } catch (error) {
     console.error('API GET Error:', error)
@@ -31,75 +184,237 @@ export async function GET(request) {
   }
 }
 
-export async function POST(request) {
+const isEnabled = (value) => value === 'true' || value === '1'
+
+// The body as text, or null when it is over maxBytes: a declared Content-Length
+// is refused unread, and a longer stream is cut off once it passes the limit
+const readBodyLimited = async (request, maxBytes) => {
+  if (Number(request.headers.get('content-length')) > maxBytes) {
+    return null
+  }
+  const body = await readLimited(request.body, maxBytes)
+  // TextDecoder drops a leading BOM as request.text() does
+  return body && new TextDecoder().decode(body)
+}
+
+// The parsed body, or undefined when it is not valid JSON
+const parseJson = (rawBody) => {
   try {
-    const { pathname } = new URL(request.url)
-    
-    if (pathname.includes('/submit')) {
-      const body = await request.json()
-      
-      // Validate required fields
-      const { teamName, teamLeadName, teamLeadEmail, teamLeadContact, projectTitle, projectDescription } = body
-      
-      if (!teamName || !teamLeadName || !teamLeadEmail || !teamLeadContact || !projectTitle || !projectDescription) {
-        return NextResponse.json({ 
-          error: 'Missing required fields: teamName, teamLeadName, teamLeadEmail, teamLeadContact, projectTitle, projectDescription' 
-        }, { status: 400 })
-      }
-
-      // Validate project description word count (max 100 words)
-      const wordCount = projectDescription.trim().split(/\s+/).length
-      if (wordCount > 100) {
-        return NextResponse.json({ 
-          error: `Project description must be 100 words or less. Current: ${wordCount} words.` 
-        }, { status: 400 })
-      }
-      
-      const result = await submitHackathonForm(body)
-      
-      if (!result.success) {
-        return NextResponse.json({ error: result.error }, { status: 500 })
-      }
-      
-      return NextResponse.json({ 
-        success: true, 
-        message: 'Hackathon submission successful! 🎉',
-        data: result.data 
-      })
+    return JSON.parse(rawBody)
+  } catch {
+    return undefined
+  }
+}
+
+const invalidJson = () => NextResponse.json({ error: 'Invalid JSON' }, { status: 400 })
+
+const payloadTooLarge = (maxBytes) => NextResponse.json(
+  { error: `Request body must be ${maxBytes >= 1024 * 1024 ? `${maxBytes / 1024 / 1024}MB` : `${maxBytes / 1024}KB`} or less` },
+  { status: 413 }
+)
+
+// Stream the file part of a multipart upload into storage without buffering it.
+// The folder comes from ?folder= or a field sent before the file, as does
+// variants=true, which adds thumbnail and medium WebP variant URLs to the result.
+// An Idempotency-Key is bound to the file's sha256 (and those options): the body
+// is always spooled, and a replay carrying a different file gets a 422.
+const receiveUpload = async (request, searchParams) => {
+  const boundary = getMultipartBoundary(request.headers.get('content-type'))
+  if (!boundary || !request.body) {
+    return { status: 400, body: { error: 'No file provided' } }
+  }
+
+  // A declared length over the limit is rejected before reading any of the body
+  if (Number(request.headers.get('content-length')) > MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD_ALLOWANCE) {
+    return { status: 400, body: { error: new UploadTooLargeError().message } }
+  }
+
+  let folder = searchParams.get('folder') || 'uploads'
+  let variants = isEnabled(searchParams.get('variants'))
+  for await (const part of readMultipart(request.body, boundary)) {
+    if (!part.body) {
+      if (part.name === 'folder' && part.value) {
+        folder = part.value
+      } else if (part.name === 'variants') {
+        variants = isEnabled(part.value)
+      }
+      continue
     }
 
-    if (pathname.includes('/upload')) {
-      try {
-        const formData = await request.formData()
-        const file = formData.get('file')
-        const folder = formData.get('folder') || 'uploads'
+    if (part.name !== 'file') {
+      // Skip other file parts without keeping them
+      for await (const chunk of part.body) {} // eslint-disable-line no-unused-vars
+      continue
+    }
+
+    // Validate file type for images: the declared type, then the magic bytes
+    if (!part.contentType.startsWith('image/')) {
+      return { status: 400, body: { error: 'Only image files are allowed' } }
+    }
+
+    const { head, stream, exceeded } = await sniffAndLimit(part.body, MAX_UPLOAD_SIZE)
+    if (!isImageSignature(head)) {
+      return { status: 400, body: { error: 'Only image files are allowed' } }
+    }
 
-        if (!file) {
-          return NextResponse.json({ error: 'No file provided' }, { status: 400 })
+    // Validate file size (max 15MB) while the bytes are hashed into a temporary file
+    let spooled
+    try {
+      spooled = await timePhase('spool', () => spoolToTempFile(stream))
+    } catch (error) {
+      if (exceeded()) {
+        return { status: 400, body: { error: new UploadTooLargeError().message } }
+      }
+      throw error
+    }
+
+    try {
+      const key = request.headers.get('idempotency-key')
+      return await runIdempotent('upload', key, key && fingerprint(JSON.stringify([spooled.sha256, folder, variants])), async () => {
+        const result = await uploadLocalFile({ ...spooled, name: part.filename, type: part.contentType }, folder, { variants })
+
+        if (!result.success) {
+          return { status: 500, body: { error: result.error } }
         }
 
-        // Validate file type for images
-        if (!file.type.startsWith('image/')) {
-          return NextResponse.json({ error: 'Only image files are allowed' }, { status: 400 })
+        return {
+          status: 200,
+          body: {
+            success: true,
+            url: result.url,
+            ...(variants && { variants: result.variants }),
+            message: 'File uploaded successfully'
+          }
         }
+      })
+    } finally {
+      await rm(spooled.filePath, { force: true })
+    }
+  }
+
+  return { status: 400, body: { error: 'No file provided' } }
+}
+
+async function handlePost(request) {
+  try {
+    const { pathname, searchParams } = new URL(request.url)
+    
+    if (pathname.includes('/submit/batch')) {
+      const rawBody = await timePhase('read-body', () => readBodyLimited(request, MAX_BATCH_BYTES))
+      if (rawBody === null) {
+        return payloadTooLarge(MAX_BATCH_BYTES)
+      }
+
+      const body = await timePhase('parse', () => parseJson(rawBody))
+      if (body === undefined) {
+        return invalidJson()
+      }
+      const submissions = Array.isArray(body) ? body : body?.submissions
+
+      if (!Array.isArray(submissions) || submissions.length === 0) {
+        return NextResponse.json({ error: 'Request body must be a non-empty array of submissions' }, { status: 400 })
+      }
+
+      if (submissions.length > MAX_BATCH_SIZE) {
+        return NextResponse.json({ error: `Batch size must be ${MAX_BATCH_SIZE} submissions or less` }, { status: 400 })
+      }
+
+      // Validate every entry up front; only the valid ones are inserted
+      const results = new Array(submissions.length)
+      const valid = []
+      const validIndexes = []
+      await timePhase('validate', () => submissions.forEach((submission, index) => {
+        const error = validateSubmission(submission)
+        if (error) {
+          results[index] = { index, success: false, error }
+        } else {
+          valid.push(submission)
+          validIndexes.push(index)
+        }
+      }))
+
+      if (valid.length > 0) {
+        const inserted = await submitHackathonForms(valid)
+        inserted.results.forEach((result, position) => {
+          results[validIndexes[position]] = { index: validIndexes[position], ...result }
+        })
+      }
+
+      const insertedCount = results.filter(result => result.success).length
+      return NextResponse.json({
+        success: insertedCount === submissions.length,
+        inserted: insertedCount,
+        failed: submissions.length - insertedCount,
+        results
+      })
+    }
+
+    if (pathname.includes('/submit')) {
+      const rawBody = await timePhase('read-body', () => readBodyLimited(request, MAX_SUBMISSION_BYTES))
+      if (rawBody === null) {
+        return payloadTooLarge(MAX_SUBMISSION_BYTES)
+      }
+      const key = request.headers.get('idempotency-key')
 
-        // Validate file size (max 15MB)
-        const maxSize = 15 * 1024 * 1024 // 15MB
-        if (file.size > maxSize) {
-          return NextResponse.json({ error: 'File size must be less than 5MB' }, { status: 400 })
+      const outcome = await runIdempotent('submit', key, key && fingerprint(rawBody), async () => {
+        const body = await timePhase('parse', () => parseJson(rawBody))
+        if (body === undefined) {
+          return { status: 400, body: { error: 'Invalid JSON' } }
         }
 
-        const result = await uploadFile(file, folder)
+        const validationError = await timePhase('validate', () => validateSubmission(body))
+        if (validationError) {
+          return { status: 400, body: { error: validationError } }
+        }
+        
+        const result = await submitHackathonForm(body)
         
         if (!result.success) {
-          return NextResponse.json({ error: result.error }, { status: 500 })
+          return { status: 500, body: { error: result.error } }
+        }
+        
+        return {
+          status: 200,
+          body: {
+            success: true, 
+            message: 'Hackathon submission successful! 🎉',
+            data: result.data 
+          }
         }
+      })
 
-        return NextResponse.json({ 
-          success: true, 
-          url: result.url,
-          message: 'File uploaded successfully'
-        })
+      return idempotentResponse(outcome)
+    }
+
+    if (pathname.includes('/upload/chunked')) {
+      if (pathname.endsWith('/complete')) {
+        const { status, body } = await completeChunkedUpload(chunkedUploadId(pathname))
+        return NextResponse.json(body, { status })
+      }
+      if (chunkedUploadId(pathname)) {
+        // A session URL takes GET (status) and PUT (chunks); only /complete is POSTed
+        return NextResponse.json({ error: 'Method not allowed' }, { status: 405, headers: { Allow: 'GET, PUT' } })
+      }
+
+      // Initiating a resumable upload; a retried request with the same Idempotency-Key reuses the session
+      const rawBody = await timePhase('read-body', () => readBodyLimited(request, MAX_SUBMISSION_BYTES))
+      if (rawBody === null) {
+        return payloadTooLarge(MAX_SUBMISSION_BYTES)
+      }
+      const details = parseJson(rawBody)
+      if (details === undefined) {
+        return invalidJson()
+      }
+      const key = request.headers.get('idempotency-key')
+      const outcome = await runIdempotent('upload-chunked', key, key && fingerprint(rawBody), () =>
+        initiateChunkedUpload(details)
+      )
+      return idempotentResponse(outcome)
+    }
+
+    if (pathname.includes('/upload')) {
+      try {
+        return idempotentResponse(await receiveUpload(request, searchParams))
       } catch (uploadError) {
         console.error('Upload error:', uploadError)
         return NextResponse.json({ error: 'File upload failed' }, { status: 500 })
@@ -113,13 +428,46 @@ export async function POST(request) {
   }
 }
 
+// PUT /api/upload/chunked/<uploadId>?offset=N stores one chunk of a resumable upload
+async function handlePut(request) {
+  try {
+    const { pathname, searchParams } = new URL(request.url)
+
+    if (pathname.includes('/upload/chunked/')) {
+      const tooLarge = { error: `Chunk size must be ${MAX_UPLOAD_CHUNK_SIZE / 1024 / 1024}MB or less` }
+      if (Number(request.headers.get('content-length')) > MAX_UPLOAD_CHUNK_SIZE) {
+        return NextResponse.json(tooLarge, { status: 400 })
+      }
+      const chunk = await timePhase('read-body', () => readLimited(request.body, MAX_UPLOAD_CHUNK_SIZE))
+      if (!chunk) {
+        return NextResponse.json(tooLarge, { status: 400 })
+      }
+
+      const offset = searchParams.get('offset') ? Number(searchParams.get('offset')) : NaN
+      const digest = parseContentDigest(request.headers.get('content-digest'))
+      const { status, body } = await timePhase('chunk-write', () => writeChunk(chunkedUploadId(pathname), offset, chunk, digest))
+      return NextResponse.json(body, { status })
+    }
+
+    return NextResponse.json({ error: 'Endpoint not found' }, { status: 404 })
+  } catch (error) {
+    console.error('API PUT Error:', error)
+    return NextResponse.json({ error: 'Internal server error' }, { status: 500 })
+  }
+}
+
+// Every response carries a Server-Timing header with the phases of its request
+export const GET = (request) => withServerTiming(request, () => handleGet(request))
+export const POST = (request) => withServerTiming(request, () => handlePost(request))
+export const PUT = (request) => withServerTiming(request, () => handlePut(request))
+
 export async function OPTIONS(request) {
   return new NextResponse(null, {
     status: 200,
     headers: {
       'Access-Control-Allow-Origin': '*',
       'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
-      'Access-Control-Allow-Headers': 'Content-Type, Authorization',
+      'Access-Control-Allow-Headers': 'Content-Type, Authorization, Idempotency-Key, If-None-Match, Content-Digest',
     },
   })
 }
\ No newline at end of file
@@ -21,6 +21,8 @@ export default function HackathonForm() {
     projectUrl: '',
     projectLogoUrl: '',
     projectBannerUrl: '',
+    projectLogoVariants: null,
+    projectBannerVariants: null,
     videoDemoLink: ''
   })
 
@@ -79,8 +81,11 @@ export default function HackathonForm() {
           try {
             const formData = new FormData()
             const resizedFile = new File([blob], file.name, { type: file.type })
-            formData.append('file', resizedFile)
+            // The server streams the file straight to storage, so the folder must come first
             formData.append('folder', type === 'logo' ? 'logos' : 'banners')
+            // Thumbnail and medium WebP variants let galleries skip the full-size image
+            formData.append('variants', 'true')
+            formData.append('file', resizedFile)
 
             const response = await fetch('/api/upload', {
               method: 'POST',
@@ -92,7 +97,8 @@ export default function HackathonForm() {
             if (response.ok) {
               setFormData(prev => ({
                 ...prev,
-                [type === 'logo' ? 'projectLogoUrl' : 'projectBannerUrl']: result.url
+                [type === 'logo' ? 'projectLogoUrl' : 'projectBannerUrl']: result.url,
+                [type === 'logo' ? 'projectLogoVariants' : 'projectBannerVariants']: result.variants ?? null
               }))
               resolve({ success: true, url: result.url })
             } else {
@@ -113,7 +119,8 @@ export default function HackathonForm() {
   const removeUploadedFile = (type) => {
     setFormData(prev => ({
       ...prev,
-      [type === 'logo' ? 'projectLogoUrl' : 'projectBannerUrl']: ''
+      [type === 'logo' ? 'projectLogoUrl' : 'projectBannerUrl']: '',
+      [type === 'logo' ? 'projectLogoVariants' : 'projectBannerVariants']: null
     }))
   }
 
@@ -148,6 +155,8 @@ export default function HackathonForm() {
           projectUrl: '',
           projectLogoUrl: '',
           projectBannerUrl: '',
+          projectLogoVariants: null,
+          projectBannerVariants: null,
           videoDemoLink: ''
         })
         setWordCount(0)
@@ -4,22 +4,632 @@ Backend API Testing for Hackathon Form Submission App
 Tests all API endpoints in demo mode with comprehensive validation
 """
 
-import requests
+import argparse
+import atexit
+import base64
+import contextlib
+import csv
+import hashlib
+import http.client
+import io
 import json
+import math
+import statistics
 import time
 import os
+import platform
+import random
+import re
+import select
+import shutil
+import sys
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+import tracemalloc
+import urllib.parse
+from collections import defaultdict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from datetime import datetime
 
 # Get base URL from environment
 BASE_URL = os.getenv('NEXT_PUBLIC_BASE_URL', 'https://project-nexus-22.preview.emergentagent.com')
 API_BASE = f"{BASE_URL}/api"
 
+# Per-endpoint request timeouts (seconds) for the shared client
+DEFAULT_TIMEOUTS = {'/health': 10, '/submit': 15, '/submissions': 10, '/export': 120, '/upload': 30}
+
+# Canonical valid submission payload shared by the functional and load tests
+VALID_SUBMISSION = {
+    "teamName": "Tech Innovators",
+    "teamLeadName": "Alice Johnson",
+    "teamLeadEmail": "alice.johnson@example.com",
+    "teamLeadContact": "+1-555-0123",
+    "projectTitle": "AI Sustainability Tracker",
+    "projectDescription": "We're building an AI-powered sustainability tracker that helps organizations monitor and reduce their carbon footprint through intelligent data analysis and actionable insights.",
+    "gitLink": "https://github.com/techinnovators/hackathon-project",
+    "projectUrl": "https://techinnovators.demo.com",
+    "projectLogoUrl": "https://demo-storage.supabase.co/logos/tech-innovators-logo.png",
+    "projectBannerUrl": "https://demo-storage.supabase.co/banners/tech-innovators-banner.jpg",
+    "videoDemoLink": "https://youtube.com/watch?v=demo123"
+}
+
+# Minimal 1x1 PNG used for upload tests
+TEST_PNG_BYTES = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00\x90wS\xde\x00\x00\x00\tpHYs\x00\x00\x0b\x13\x00\x00\x0b\x13\x01\x00\x9a\x9c\x18\x00\x00\x00\nIDATx\x9cc\xf8\x00\x00\x00\x01\x00\x01\x00\x00\x00\x00IEND\xaeB`\x82'
+
+# Streamed upload sizes: a large banner under the 15MB limit, a file well over it
+# (big enough that rejection visibly comes before the client finishes sending),
+# and how many large uploads run at once when measuring server memory
+LARGE_UPLOAD_SIZE = 12 * 1024 * 1024
+OVERSIZED_UPLOAD_SIZE = 48 * 1024 * 1024
+CONCURRENT_LARGE_UPLOADS = 4
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Resumable uploads: file size for the functional test, how many chunks go up
+# at once, and how many status/resend rounds a client makes before giving up
+CHUNKED_UPLOAD_SIZE = 5 * 1024 * 1024 + 12345
+CHUNKED_UPLOAD_PARALLEL = 4
+MAX_UPLOAD_RESUMES = 5
+
+# Content-addressed upload dedupe: logo size and how often each one is re-uploaded
+DEDUPE_LOGO_SIZE = 256 * 1024
+DEDUPE_REPEATS = 3
+
+# Gallery benchmark (--gallery-bench): originals sized like unprocessed phone
+# and design-tool exports, and the variant each card shows instead
+GALLERY_LOGO_SIZE = 300 * 1024
+GALLERY_BANNER_SIZE = 1536 * 1024
+GALLERY_CARD_VARIANTS = {'logo': 'thumbnail', 'banner': 'medium'}
+
+# Limits from lib/validation.js: request bodies over these get a 413, and text fields a 400
+MAX_SUBMISSION_BYTES = 64 * 1024
+MAX_BATCH_BYTES = 8 * 1024 * 1024
+MAX_FIELD_LENGTHS = {'teamName': 200, 'teamLeadName': 200, 'teamLeadEmail': 254, 'teamLeadContact': 50, 'projectTitle': 200}
+
+# Fields every row returned by /api/submissions must carry
+SUBMISSION_ROW_FIELDS = ['id', 'teamName', 'teamLeadName', 'teamLeadEmail', 'teamLeadContact', 'projectTitle', 'projectDescription', 'createdAt']
+
+# Page size used when walking /api/submissions
+SUBMISSIONS_PAGE_SIZE = 50
+
+# Process handle of local_server.py when started with --local
+LOCAL_SERVER_PROCESS = None
+# PID of the server whose memory is sampled from /proc: the local stand-in with
+# --local, or e.g. a `next start` process given with --server-pid
+SERVER_PID = None
+
+# Payloads that must be rejected with 'Missing required fields'
+MISSING_FIELD_CASES = [
+    {
+        "name": "Missing teamName",
+        "data": {
+            "teamLeadName": "Bob Smith",
+            "teamLeadEmail": "bob@example.com",
+            "teamLeadContact": "+1-555-0456",
+            "projectTitle": "Test Project",
+            "projectDescription": "A test project description"
+        }
+    },
+    {
+        "name": "Missing teamLeadName", 
+        "data": {
+            "teamName": "Code Warriors",
+            "teamLeadEmail": "team@example.com",
+            "teamLeadContact": "+1-555-0789",
+            "projectTitle": "Test Project",
+            "projectDescription": "A test project description"
+        }
+    },
+    {
+        "name": "Missing teamLeadEmail",
+        "data": {
+            "teamName": "Data Wizards",
+            "teamLeadName": "Carol Davis",
+            "teamLeadContact": "+1-555-0321",
+            "projectTitle": "Test Project",
+            "projectDescription": "A test project description"
+        }
+    },
+    {
+        "name": "Missing teamLeadContact",
+        "data": {
+            "teamName": "AI Pioneers",
+            "teamLeadName": "David Wilson",
+            "teamLeadEmail": "david@example.com",
+            "projectTitle": "Test Project",
+            "projectDescription": "A test project description"
+        }
+    },
+    {
+        "name": "Missing projectTitle",
+        "data": {
+            "teamName": "Innovation Squad",
+            "teamLeadName": "Emma Brown",
+            "teamLeadEmail": "emma@example.com",
+            "teamLeadContact": "+1-555-0654",
+            "projectDescription": "A test project description"
+        }
+    },
+    {
+        "name": "Missing projectDescription",
+        "data": {
+            "teamName": "Future Builders",
+            "teamLeadName": "Frank Miller",
+            "teamLeadEmail": "frank@example.com",
+            "teamLeadContact": "+1-555-0987",
+            "projectTitle": "Test Project"
+        }
+    },
+    {
+        "name": "Empty payload",
+        "data": {}
+    }
+]
+
+class RetryPolicy:
+    """Retry/backoff settings for one endpoint.
+
+    Connection failures are always retried up to `retries` times; HTTP
+    responses are only retried when their status is listed in `statuses`.
+    """
+
+    def __init__(self, retries=0, backoff=0.1, statuses=(502, 503, 504)):
+        self.retries = retries
+        self.backoff = backoff
+        self.statuses = statuses
+
+    def delay(self, attempt):
+        """Exponential backoff with full jitter for the given retry attempt"""
+        return random.uniform(0, self.backoff * (2 ** attempt))
+
+# Only idempotent GETs are retried by default; a retried POST could create a duplicate submission
+DEFAULT_RETRY_POLICIES = {
+    '/health': RetryPolicy(retries=2),
+    '/submissions': RetryPolicy(retries=2),
+}
+
+class HttpResponse:
+    """Minimal response object mirroring the parts of requests.Response the tests use"""
+
+    def __init__(self, status_code, headers, content, timing):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.timing = timing
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+class PooledConnection:
+    """A keep-alive HTTP/1.1 connection plus the cost of establishing it"""
+
+    def __init__(self, scheme, host, port, timeout):
+        self.setup_timing = {'dns': 0.0, 'connect': 0.0, 'tls': 0.0}
+
+        start = time.perf_counter()
+        family, socktype, proto, _, address = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0]
+        resolved = time.perf_counter()
+        self.setup_timing['dns'] = resolved - start
+
+        sock = socket.socket(family, socktype, proto)
+        sock.settimeout(timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.connect(address)
+        connected = time.perf_counter()
+        self.setup_timing['connect'] = connected - resolved
+
+        if scheme == 'https':
+            sock = ssl.create_default_context().wrap_socket(sock, server_hostname=host)
+            self.setup_timing['tls'] = time.perf_counter() - connected
+            self.conn = http.client.HTTPSConnection(host, port, timeout=timeout)
+        else:
+            self.conn = http.client.HTTPConnection(host, port, timeout=timeout)
+        self.conn.sock = sock
+
+    def close(self):
+        self.conn.close()
+
+class HttpClient:
+    """Shared pooled HTTP client used by every functional test and load mode.
+
+    Connections are kept alive and reused per origin, bounded by `pool_size`
+    (size it to the concurrency level). Each response carries a `timing`
+    dict splitting the request into dns/connect/tls/ttfb/transfer so network
+    overhead can be told apart from time spent in the route handler.
+    """
+
+    def __init__(self, pool_size=10, default_timeout=10, timeouts=None, retry_policies=None):
+        self.pool_size = pool_size
+        self.default_timeout = default_timeout
+        self.timeouts = timeouts if timeouts is not None else dict(DEFAULT_TIMEOUTS)
+        self.retry_policies = retry_policies if retry_policies is not None else dict(DEFAULT_RETRY_POLICIES)
+        self._idle = defaultdict(list)
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(pool_size)
+
+    def _endpoint(self, path):
+        for endpoint in self.timeouts.keys() | self.retry_policies.keys():
+            if path.rstrip('/').endswith(endpoint):
+                return endpoint
+        return None
+
+    def _checkout(self, origin, timeout):
+        with self._lock:
+            if self._idle[origin]:
+                return self._idle[origin].pop(), True
+        return PooledConnection(*origin, timeout), False
+
+    def _checkin(self, origin, pooled):
+        with self._lock:
+            self._idle[origin].append(pooled)
+
+    def _resolve(self, url):
+        """Split a URL (or a path relative to API_BASE) into (origin, path with query, endpoint)"""
+        parsed = urllib.parse.urlsplit(url if '://' in url else f"{API_BASE}{url}")
+        origin = (parsed.scheme, parsed.hostname, parsed.port or (443 if parsed.scheme == 'https' else 80))
+        path = parsed.path + (f"?{parsed.query}" if parsed.query else '')
+        return origin, path, self._endpoint(parsed.path)
+
+    def request(self, method, url, json=None, data=None, files=None, content=None, headers=None, timeout=None):
+        origin, path, endpoint = self._resolve(url)
+        timeout = timeout or self.timeouts.get(endpoint, self.default_timeout)
+        policy = self.retry_policies.get(endpoint) or RetryPolicy()
+
+        # content sends raw bytes as-is (resumable upload chunks)
+        body, request_headers = (content, {}) if content is not None else encode_body(json, data, files)
+        request_headers.update(headers or {})
+
+        attempt = 0
+        while True:
+            try:
+                response = self._send(origin, method, path, body, request_headers, timeout)
+            except (OSError, http.client.HTTPException):
+                if attempt >= policy.retries:
+                    raise
+            else:
+                if response.status_code not in policy.statuses or attempt >= policy.retries:
+                    response.timing['attempts'] = attempt + 1
+                    return response
+            time.sleep(policy.delay(attempt))
+            attempt += 1
+
+    def _send(self, origin, method, path, body, headers, timeout):
+        with self._slots:
+            pooled, reused = self._checkout(origin, timeout)
+            try:
+                pooled.conn.sock.settimeout(timeout)
+                start = time.perf_counter()
+                try:
+                    pooled.conn.request(method, path, body=body, headers=headers)
+                    raw = pooled.conn.getresponse()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    if not reused:
+                        raise
+                    # The server closed an idle keep-alive connection; retry once on a fresh one
+                    pooled.close()
+                    pooled, reused = PooledConnection(*origin, timeout), False
+                    pooled.conn.sock.settimeout(timeout)
+                    start = time.perf_counter()
+                    pooled.conn.request(method, path, body=body, headers=headers)
+                    raw = pooled.conn.getresponse()
+                first_byte = time.perf_counter()
+                content = raw.read()
+                finished = time.perf_counter()
+            except BaseException:
+                pooled.close()
+                raise
+
+            if raw.will_close:
+                pooled.close()
+            else:
+                self._checkin(origin, pooled)
+
+        setup = {'dns': 0.0, 'connect': 0.0, 'tls': 0.0} if reused else pooled.setup_timing
+        timing = dict(setup, ttfb=first_byte - start, transfer=finished - first_byte, reused=reused)
+        timing['total'] = timing['dns'] + timing['connect'] + timing['tls'] + timing['ttfb'] + timing['transfer']
+        timing['server'] = parse_server_timing(raw.headers.get('Server-Timing'))
+        return HttpResponse(raw.status, raw.headers, content, timing)
+
+    @contextlib.contextmanager
+    def stream(self, method, url, headers=None, timeout=None):
+        """Send a request and yield the raw http.client response for incremental reads.
+
+        The connection goes back to the pool only if the body was read to the
+        end; an abandoned stream closes it.
+        """
+        origin, path, endpoint = self._resolve(url)
+        timeout = timeout or self.timeouts.get(endpoint, self.default_timeout)
+        with self._slots:
+            pooled, _ = self._checkout(origin, timeout)
+            try:
+                pooled.conn.sock.settimeout(timeout)
+                pooled.conn.request(method, path, headers=headers or {})
+                raw = pooled.conn.getresponse()
+                yield raw
+            except BaseException:
+                pooled.close()
+                raise
+            if raw.isclosed() and not raw.will_close:
+                self._checkin(origin, pooled)
+            else:
+                pooled.close()
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            for connections in self._idle.values():
+                for pooled in connections:
+                    pooled.close()
+            self._idle.clear()
+
+def encode_body(json_body=None, data=None, files=None):
+    """Encode a JSON or multipart/form-data request body the way requests would"""
+    if json_body is not None:
+        return json.dumps(json_body).encode('utf-8'), {'Content-Type': 'application/json'}
+    if files is None and data is None:
+        return None, {'Content-Length': '0'}
+
+    boundary = f"----backendtest{random.getrandbits(64):016x}"
+    parts = []
+    for name, value in (data or {}).items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode('utf-8')
+        )
+    for name, (filename, content, content_type) in (files or {}).items():
+        if hasattr(content, 'read'):
+            content = content.read()
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'.encode('utf-8') + content + b'\r\n'
+        )
+    parts.append(f'--{boundary}--\r\n'.encode('utf-8'))
+    return b''.join(parts), {'Content-Type': f'multipart/form-data; boundary={boundary}'}
+
+def synthetic_png_chunks(size, chunk_size=UPLOAD_CHUNK_SIZE):
+    """Yield `size` bytes that start with a PNG signature, without holding them all.
+
+    Each call produces different bytes, so content-addressed storage never
+    deduplicates one synthetic image against another.
+    """
+    header = TEST_PNG_BYTES + os.urandom(16)
+    yield header
+    remaining = size - len(header)
+    filler = bytes(range(256)) * (chunk_size // 256)
+    while remaining > 0:
+        yield filler[:remaining]
+        remaining -= len(filler)
+
+def stream_post(url, pieces, content_type, length=None, timeout=60):
+    """POST a body whose bytes come from an iterator: with Content-Length when `length`
+    is given, otherwise with chunked encoding.
+
+    Between pieces the socket is polled, so a response sent before the body
+    ends stops the upload the way a browser would. Returns a dict with status,
+    body, bytes_sent (request body bytes written) and time_to_response.
+    """
+    parsed = urllib.parse.urlsplit(url)
+    port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+    sock = socket.create_connection((parsed.hostname, port), timeout)
+    if parsed.scheme == 'https':
+        sock = ssl.create_default_context().wrap_socket(sock, server_hostname=parsed.hostname)
+
+    path = parsed.path + (f"?{parsed.query}" if parsed.query else '')
+    framing = f"Content-Length: {length}" if length is not None else "Transfer-Encoding: chunked"
+    request_head = (
+        f"POST {path} HTTP/1.1\r\nHost: {parsed.netloc}\r\n"
+        f"Content-Type: {content_type}\r\n{framing}\r\nConnection: close\r\n\r\n"
+    )
+    bytes_sent = 0
+    start = time.perf_counter()
+    try:
+        sock.sendall(request_head.encode('latin-1'))
+        for piece in pieces:
+            if select.select([sock], [], [], 0)[0]:
+                # The server answered before reading the whole body
+                break
+            sock.sendall(piece if length is not None else f"{len(piece):x}\r\n".encode('latin-1') + piece + b'\r\n')
+            bytes_sent += len(piece)
+        else:
+            if length is None:
+                sock.sendall(b'0\r\n\r\n')
+    except (BrokenPipeError, ConnectionResetError):
+        # The server closed the connection after answering early
+        pass
+
+    try:
+        response = http.client.HTTPResponse(sock)
+        response.begin()
+        time_to_response = time.perf_counter() - start
+        body = response.read()
+    finally:
+        sock.close()
+    return {'status': response.status, 'body': body, 'bytes_sent': bytes_sent, 'time_to_response': time_to_response}
+
+def stream_multipart_upload(url, chunks, filename='banner.png', content_type='image/png', fields=None, timeout=60):
+    """POST a multipart upload whose file bytes come from an iterator, with chunked encoding (see stream_post)"""
+    boundary = f"----backendtest{random.getrandbits(64):016x}"
+    opening = b''.join(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode('utf-8')
+        for name, value in (fields or {}).items()
+    ) + (
+        f'--{boundary}\r\nContent-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        f'Content-Type: {content_type}\r\n\r\n'.encode('utf-8')
+    )
+
+    def body_pieces():
+        yield opening
+        yield from chunks
+        yield f'\r\n--{boundary}--\r\n'.encode('utf-8')
+
+    return stream_post(url, body_pieces(), f"multipart/form-data; boundary={boundary}", timeout=timeout)
+
+def content_digest(chunk):
+    """Content-Digest header value (RFC 9530) for a resumable upload chunk"""
+    return f"sha-256=:{base64.b64encode(hashlib.sha256(chunk).digest()).decode('ascii')}:"
+
+def drop_chunk_midway(url, chunk, timeout=10):
+    """Simulate a dropped connection: send half of a chunk PUT, then hang up.
+
+    Returns the number of body bytes that went out before the drop.
+    """
+    parsed = urllib.parse.urlsplit(url)
+    port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+    sock = socket.create_connection((parsed.hostname, port), timeout)
+    if parsed.scheme == 'https':
+        sock = ssl.create_default_context().wrap_socket(sock, server_hostname=parsed.hostname)
+    sent = len(chunk) // 2
+    try:
+        sock.sendall((
+            f"PUT {parsed.path}?{parsed.query} HTTP/1.1\r\nHost: {parsed.netloc}\r\n"
+            f"Content-Length: {len(chunk)}\r\nContent-Digest: {content_digest(chunk)}\r\n\r\n"
+        ).encode('latin-1') + chunk[:sent])
+    finally:
+        sock.close()
+    return sent
+
+def chunked_upload(http, content, filename='banner.png', content_type='image/png', folder='banners',
+                   parallel=CHUNKED_UPLOAD_PARALLEL, chunk_size=None, drop_every=0):
+    """Upload bytes through the resumable protocol with `parallel` chunks in flight.
+
+    With drop_every=N, every Nth chunk of the first pass loses its connection
+    halfway; the client then asks the server which ranges are missing and
+    resends only those, as it would after a real network drop. Returns a dict
+    with status/body of the completion, elapsed seconds, bytes_sent (including
+    the wasted halves), resumes and dropped counts.
+    """
+    started = time.perf_counter()
+    initiate = http.post(f"{API_BASE}/upload/chunked", json={
+        'filename': filename, 'contentType': content_type, 'size': len(content), 'folder': folder,
+        'sha256': hashlib.sha256(content).hexdigest(),
+    })
+    if initiate.status_code != 201:
+        return {'status': initiate.status_code, 'body': initiate.json(), 'elapsed': 0, 'bytes_sent': 0, 'resumes': 0, 'dropped': 0}
+    session = initiate.json()
+    upload_url = f"{API_BASE}/upload/chunked/{session['uploadId']}"
+    chunk_size = chunk_size or session['chunkSize']
+    lock = threading.Lock()
+    totals = {'bytes_sent': 0, 'dropped': 0}
+
+    def send(job):
+        index, offset, chunk = job
+        url = f"{upload_url}?offset={offset}"
+        # Only first-pass chunks are dropped; resends go through
+        if drop_every and index is not None and index % drop_every == drop_every - 1:
+            sent = drop_chunk_midway(url, chunk)
+            with lock:
+                totals['bytes_sent'] += sent
+                totals['dropped'] += 1
+            return
+        try:
+            http.put(url, content=chunk, headers={'Content-Digest': content_digest(chunk)})
+        finally:
+            with lock:
+                totals['bytes_sent'] += len(chunk)
+
+    def jobs(ranges, first_pass):
+        index = 0
+        for start, end in ranges:
+            for offset in range(start, end, chunk_size):
+                yield index if first_pass else None, offset, content[offset:min(offset + chunk_size, end)]
+                index += 1
+
+    resumes = 0
+    with ThreadPoolExecutor(max_workers=parallel) as pool:
+        list(pool.map(send, jobs([(0, len(content))], True)))
+        while True:
+            missing = http.get(upload_url).json().get('missing', [])
+            if not missing or resumes >= MAX_UPLOAD_RESUMES:
+                break
+            resumes += 1
+            list(pool.map(send, jobs(missing, False)))
+
+    complete = http.post(f"{upload_url}/complete", timeout=60)
+    return {
+        'status': complete.status_code,
+        'body': complete.json(),
+        'elapsed': time.perf_counter() - started,
+        'resumes': resumes,
+        **totals,
+    }
+
+def parse_server_timing(header):
+    """Phases of a Server-Timing header as {name: seconds}; repeated names are summed"""
+    phases = {}
+    for metric in (header or '').split(','):
+        name, *params = [part.strip() for part in metric.split(';')]
+        if not name:
+            continue
+        duration = 0.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'dur':
+                try:
+                    duration = float(value.strip().strip('"')) / 1000
+                except ValueError:
+                    pass
+        phases[name] = phases.get(name, 0.0) + duration
+    return phases
+
+def summarize_timings(responses_timing):
+    """Mean of each timing phase in milliseconds"""
+    phases = ('dns', 'connect', 'tls', 'ttfb', 'transfer', 'total')
+    if not responses_timing:
+        return {phase: 0.0 for phase in phases}
+    return {
+        phase: sum(timing[phase] for timing in responses_timing) / len(responses_timing) * 1000
+        for phase in phases
+    }
+
+def print_request_timing(response):
+    """Print the dns/connect/tls/ttfb/transfer split of a single request"""
+    timing = response.timing
+    print(
+        f"Timing: dns {timing['dns'] * 1000:.1f}ms, connect {timing['connect'] * 1000:.1f}ms, "
+        f"tls {timing['tls'] * 1000:.1f}ms, ttfb {timing['ttfb'] * 1000:.1f}ms, "
+        f"transfer {timing['transfer'] * 1000:.1f}ms{' (reused connection)' if timing['reused'] else ''}"
+    )
+    if timing.get('server'):
+        print("Server: " + ", ".join(f"{name} {duration * 1000:.1f}ms" for name, duration in timing['server'].items()))
+
+def conditional_get(http, url, validators):
+    """GET that revalidates with If-None-Match; returns (response, body bytes).
+
+    `validators` maps url -> (ETag, body) from earlier 200s; a 304 reuses the
+    stored body instead of downloading it again.
+    """
+    etag, body = validators.get(url, (None, None))
+    response = http.get(url, headers={'If-None-Match': etag} if etag else None)
+    if response.status_code == 304:
+        return response, body
+    if response.status_code == 200 and response.headers.get('ETag'):
+        validators[url] = (response.headers['ETag'], response.content)
+    return response, response.content
+
+# Shared client for the functional tests (sized for concurrent groups and cases);
+# load modes build their own sized to the concurrency level
+client = HttpClient(pool_size=16)
+
 def test_health_endpoint():
     """Test the health check endpoint"""
     print("\n=== Testing Health Endpoint ===")
     try:
-        response = requests.get(f"{API_BASE}/health", timeout=10)
+        response = client.get(f"{API_BASE}/health", timeout=10)
         print(f"Status Code: {response.status_code}")
+        print_request_timing(response)
         
         if response.status_code == 200:
             data = response.json()
@@ -63,33 +673,29 @@ def test_submit_valid_data():
     """Test form submission with valid data"""
     print("\n=== Testing Form Submission with Valid Data ===")
     
-    valid_data = {
-        "teamName": "Tech Innovators",
-        "teamLeadName": "Alice Johnson",
-        "teamLeadEmail": "alice.johnson@example.com",
-        "teamLeadContact": "+1-555-0123",
-        "projectTitle": "AI Sustainability Tracker",
-        "projectDescription": "We're building an AI-powered sustainability tracker that helps organizations monitor and reduce their carbon footprint through intelligent data analysis and actionable insights.",
-        "gitLink": "https://github.com/techinnovators/hackathon-project",
-        "projectUrl": "https://techinnovators.demo.com",
-        "projectLogoUrl": "https://demo-storage.supabase.co/logos/tech-innovators-logo.png",
-        "projectBannerUrl": "https://demo-storage.supabase.co/banners/tech-innovators-banner.jpg",
-        "videoDemoLink": "https://youtube.com/watch?v=demo123"
-    }
-    
     try:
-        response = requests.post(
+        response = client.post(
             f"{API_BASE}/submit",
-            json=valid_data,
+            json=VALID_SUBMISSION,
             headers={'Content-Type': 'application/json'},
             timeout=15
         )
         
         print(f"Status Code: {response.status_code}")
+        print_request_timing(response)
         
         if response.status_code == 200:
             data = response.json()
             print(f"Response: {json.dumps(data, indent=2)}")
+
+            # The route reports where its time went
+            server = response.timing['server']
+            if not {'parse', 'validate', 'total'} <= server.keys():
+                print(f"❌ Expected parse/validate/total in Server-Timing, got: {response.headers.get('Server-Timing')}")
+                return False
+            if not {'coalesce', 'demo-delay', 'db-insert'} & server.keys():
+                print(f"❌ Server-Timing has no insert phase: {response.headers.get('Server-Timing')}")
+                return False
             
             # Validate response structure
             if not data.get('success'):
@@ -106,7 +712,7 @@ def test_submit_valid_data():
                 
             # Validate returned data contains submitted fields
             returned_data = data['data']
-            for key, value in valid_data.items():
+            for key, value in VALID_SUBMISSION.items():
                 if returned_data.get(key) != value:
                     print(f"❌ Mismatch in {key}: expected '{value}', got '{returned_data.get(key)}'")
                     return False
@@ -127,109 +733,44 @@ def test_submit_valid_data():
         print(f"❌ Form submission test failed: {str(e)}")
         return False
 
+def check_missing_field_case(test_case):
+    """Submit one payload with missing required fields and expect a 400"""
+    print(f"\nTesting: {test_case['name']}")
+    try:
+        response = client.post(
+            f"{API_BASE}/submit",
+            json=test_case['data'],
+            headers={'Content-Type': 'application/json'},
+            timeout=10
+        )
+        
+        print(f"Status Code: {response.status_code}")
+        print_request_timing(response)
+        
+        if response.status_code == 400:
+            data = response.json()
+            print(f"Response: {json.dumps(data, indent=2)}")
+            
+            if 'error' in data and 'Missing required fields' in data['error']:
+                print(f"✅ {test_case['name']} - Correctly rejected")
+                return True
+            print(f"❌ {test_case['name']} - Wrong error message")
+            return False
+        
+        print(f"❌ {test_case['name']} - Expected 400, got {response.status_code}")
+        print(f"Response: {response.text}")
+        return False
+            
+    except Exception as e:
+        print(f"❌ {test_case['name']} test failed: {str(e)}")
+        return False
+
 def test_submit_missing_required_fields():
     """Test form submission with missing required fields"""
     print("\n=== Testing Form Submission with Missing Required Fields ===")
     
-    # Test cases with missing required fields
-    test_cases = [
-        {
-            "name": "Missing teamName",
-            "data": {
-                "teamLeadName": "Bob Smith",
-                "teamLeadEmail": "bob@example.com",
-                "teamLeadContact": "+1-555-0456",
-                "projectTitle": "Test Project",
-                "projectDescription": "A test project description"
-            }
-        },
-        {
-            "name": "Missing teamLeadName", 
-            "data": {
-                "teamName": "Code Warriors",
-                "teamLeadEmail": "team@example.com",
-                "teamLeadContact": "+1-555-0789",
-                "projectTitle": "Test Project",
-                "projectDescription": "A test project description"
-            }
-        },
-        {
-            "name": "Missing teamLeadEmail",
-            "data": {
-                "teamName": "Data Wizards",
-                "teamLeadName": "Carol Davis",
-                "teamLeadContact": "+1-555-0321",
-                "projectTitle": "Test Project",
-                "projectDescription": "A test project description"
-            }
-        },
-        {
-            "name": "Missing teamLeadContact",
-            "data": {
-                "teamName": "AI Pioneers",
-                "teamLeadName": "David Wilson",
-                "teamLeadEmail": "david@example.com",
-                "projectTitle": "Test Project",
-                "projectDescription": "A test project description"
-            }
-        },
-        {
-            "name": "Missing projectTitle",
-            "data": {
-                "teamName": "Innovation Squad",
-                "teamLeadName": "Emma Brown",
-                "teamLeadEmail": "emma@example.com",
-                "teamLeadContact": "+1-555-0654",
-                "projectDescription": "A test project description"
-            }
-        },
-        {
-            "name": "Missing projectDescription",
-            "data": {
-                "teamName": "Future Builders",
-                "teamLeadName": "Frank Miller",
-                "teamLeadEmail": "frank@example.com",
-                "teamLeadContact": "+1-555-0987",
-                "projectTitle": "Test Project"
-            }
-        },
-        {
-            "name": "Empty payload",
-            "data": {}
-        }
-    ]
-    
-    all_passed = True
-    
-    for test_case in test_cases:
-        print(f"\nTesting: {test_case['name']}")
-        try:
-            response = requests.post(
-                f"{API_BASE}/submit",
-                json=test_case['data'],
-                headers={'Content-Type': 'application/json'},
-                timeout=10
-            )
-            
-            print(f"Status Code: {response.status_code}")
-            
-            if response.status_code == 400:
-                data = response.json()
-                print(f"Response: {json.dumps(data, indent=2)}")
-                
-                if 'error' in data and 'Missing required fields' in data['error']:
-                    print(f"✅ {test_case['name']} - Correctly rejected")
-                else:
-                    print(f"❌ {test_case['name']} - Wrong error message")
-                    all_passed = False
-            else:
-                print(f"❌ {test_case['name']} - Expected 400, got {response.status_code}")
-                print(f"Response: {response.text}")
-                all_passed = False
-                
-        except Exception as e:
-            print(f"❌ {test_case['name']} test failed: {str(e)}")
-            all_passed = False
+    results = run_cases_concurrently(check_missing_field_case, MISSING_FIELD_CASES)
+    all_passed = all(results)
     
     if all_passed:
         print("\n✅ All missing required fields tests passed")
@@ -238,105 +779,457 @@ def test_submit_missing_required_fields():
     
     return all_passed
 
-def test_get_submissions():
-    """Test retrieving all submissions"""
-    print("\n=== Testing Get Submissions Endpoint ===")
+class PageFetchError(Exception):
+    """Raised when a submissions page request does not return 200"""
+
+    def __init__(self, response):
+        super().__init__(f"status {response.status_code}")
+        self.response = response
+
+def iter_submission_pages(limit=None, http=None, filters=None):
+    """Lazily walk GET /api/submissions with cursor pagination, yielding one page of rows at a time"""
+    http = http or client
+    limit = limit or SUBMISSIONS_PAGE_SIZE
+    cursor = None
+    while True:
+        query = dict(filters or {}, limit=limit)
+        if cursor:
+            query['cursor'] = cursor
+        response = http.get(f"{API_BASE}/submissions?{urllib.parse.urlencode(query)}")
+        if response.status_code != 200:
+            raise PageFetchError(response)
+        page = response.json()
+        yield page['data']
+        cursor = page.get('next')
+        if not cursor:
+            return
+
+def test_submit_batch():
+    """Test batch submission with a mix of valid and invalid entries"""
+    print("\n=== Testing Batch Submission Endpoint ===")
+    
+    batch = [
+        dict(VALID_SUBMISSION, teamName="Batch Team A"),
+        MISSING_FIELD_CASES[0]['data'],
+        dict(VALID_SUBMISSION, teamName="Batch Team B"),
+        dict(VALID_SUBMISSION, projectDescription=" ".join(f"word{i}" for i in range(101))),
+        # Under 100 words but over the 1000-character CHECK on project_description
+        dict(VALID_SUBMISSION, projectDescription=" ".join("x" * 20 for _ in range(60))),
+    ]
+    expected_success = [True, False, True, False, False]
     
     try:
-        response = requests.get(f"{API_BASE}/submissions", timeout=10)
+        response = client.post(f"{API_BASE}/submit/batch", json=batch)
         print(f"Status Code: {response.status_code}")
+        print_request_timing(response)
         
-        if response.status_code == 200:
-            data = response.json()
-            print(f"Response: {json.dumps(data, indent=2)}")
-            
-            # Should return an array
-            if not isinstance(data, list):
-                print(f"❌ Expected array response, got {type(data)}")
+        if response.status_code != 200:
+            print(f"❌ Batch submission failed with status {response.status_code}")
+            print(f"Response: {response.text}")
+            return False
+        
+        data = response.json()
+        print(f"Inserted: {data.get('inserted')}, Failed: {data.get('failed')}")
+        results = data.get('results', [])
+        
+        if len(results) != len(batch):
+            print(f"❌ Expected {len(batch)} results, got {len(results)}")
+            return False
+        
+        for index, (result, expected) in enumerate(zip(results, expected_success)):
+            if result.get('index') != index or result.get('success') != expected:
+                print(f"❌ Result {index} not aligned with its entry: {result}")
                 return False
+        
+        if results[0]['data'].get('teamName') != "Batch Team A" or results[2]['data'].get('teamName') != "Batch Team B":
+            print("❌ Inserted rows do not match their entries")
+            return False
+        
+        if 'Missing required fields' not in results[1].get('error', '') or 'Current: 101 words' not in results[3].get('error', ''):
+            print(f"❌ Wrong per-item errors: {results[1].get('error')!r}, {results[3].get('error')!r}")
+            return False
+        
+        if '1000 characters' not in results[4].get('error', ''):
+            print(f"❌ Expected a length error for the 1000+ character description, got {results[4]}")
+            return False
+        
+        if data.get('inserted') != 2 or data.get('failed') != 3 or data.get('success') is not False:
+            print(f"❌ Wrong batch totals: {data}")
+            return False
+        
+        empty = client.post(f"{API_BASE}/submit/batch", json=[])
+        if empty.status_code != 400:
+            print(f"❌ Expected 400 for an empty batch, got {empty.status_code}")
+            return False
+        
+        print("✅ Batch submission returns index-aligned results and errors")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Batch submission test failed: {str(e)}")
+        return False
+
+def test_get_submissions(page_size=None):
+    """Test retrieving all submissions page by page"""
+    print("\n=== Testing Get Submissions Endpoint ===")
+    
+    try:
+        started = time.perf_counter()
+        first_page_at = None
+        pages = 0
+        rows = 0
+        seen_ids = set()
+        duplicate_ids = 0
+        
+        # Validate rows as they stream in instead of holding the whole dataset
+        for page in iter_submission_pages(page_size):
+            if first_page_at is None:
+                first_page_at = time.perf_counter() - started
+            pages += 1
             
-            print(f"✅ Retrieved {len(data)} submissions successfully")
+            if not isinstance(page, list):
+                print(f"❌ Expected array page, got {type(page)}")
+                return False
             
-            # If there are submissions, validate structure
-            if len(data) > 0:
-                submission = data[0]
-                required_fields = ['id', 'teamName', 'teamLeadName', 'teamLeadEmail', 'teamLeadContact', 'projectTitle', 'projectDescription', 'createdAt']
-                for field in required_fields:
+            for submission in page:
+                if rows == 0:
+                    print(f"First submission: {json.dumps(submission, indent=2)}")
+                for field in SUBMISSION_ROW_FIELDS:
                     if field not in submission:
-                        print(f"❌ Missing field '{field}' in submission")
+                        print(f"❌ Missing field '{field}' in submission {submission.get('id')}")
                         return False
-                print("✅ Submission structure is valid")
-            
-            return True
-        else:
-            print(f"❌ Get submissions failed with status {response.status_code}")
-            print(f"Response: {response.text}")
+                if submission['id'] in seen_ids:
+                    duplicate_ids += 1
+                seen_ids.add(submission['id'])
+                rows += 1
+        
+        elapsed = time.perf_counter() - started
+        print(f"✅ Retrieved {rows} submissions successfully across {pages} page(s)")
+        if rows > 0:
+            print("✅ Submission structure is valid")
+        if duplicate_ids:
+            print(f"❌ {duplicate_ids} submissions share an id with another row")
             return False
+        print(f"Time to first page: {first_page_at * 1000:.1f}ms, {pages / elapsed:.1f} pages/s, {rows / elapsed:.1f} rows/s")
+        return True
             
+    except PageFetchError as e:
+        print(f"❌ Get submissions failed with status {e.response.status_code}")
+        print(f"Response: {e.response.text}")
+        return False
     except Exception as e:
         print(f"❌ Get submissions test failed: {str(e)}")
         return False
 
-def test_project_description_word_count():
-    """Test project description word count validation (max 100 words)"""
-    print("\n=== Testing Project Description Word Count Validation ===")
+DUPLICATE_BURST_SIZE = 100
+
+def test_concurrent_submit_ids():
+    """Fire a burst of concurrent submits and check every returned id is unique"""
+    print("\n=== Testing Concurrent Submission IDs ===")
     
-    # Test with exactly 100 words (should pass)
-    words_100 = " ".join([f"word{i}" for i in range(100)])
-    valid_data_100_words = {
-        "teamName": "Word Count Team",
-        "teamLeadName": "Test Leader",
-        "teamLeadEmail": "test@example.com",
-        "teamLeadContact": "+1-555-1234",
-        "projectTitle": "Word Count Test",
-        "projectDescription": words_100
-    }
+    def submit(index):
+        response = client.post(f"{API_BASE}/submit", json=dict(VALID_SUBMISSION, teamName=f"Burst Team {index}"))
+        if response.status_code != 200:
+            raise RuntimeError(f"submit {index} failed with status {response.status_code}: {response.text[:200]}")
+        return response.json()['data']['id']
     
-    # Test with 101 words (should fail)
-    words_101 = " ".join([f"word{i}" for i in range(101)])
-    invalid_data_101_words = {
-        "teamName": "Word Count Team",
-        "teamLeadName": "Test Leader",
-        "teamLeadEmail": "test@example.com",
-        "teamLeadContact": "+1-555-1234",
-        "projectTitle": "Word Count Test",
-        "projectDescription": words_101
-    }
+    try:
+        with ThreadPoolExecutor(max_workers=DUPLICATE_BURST_SIZE) as pool:
+            ids = list(pool.map(submit, range(DUPLICATE_BURST_SIZE)))
+        
+        duplicates = len(ids) - len(set(ids))
+        if duplicates:
+            print(f"❌ {duplicates} of {len(ids)} concurrent submits returned an id already in use")
+            return False
+        
+        print(f"✅ {len(ids)} concurrent submits returned {len(set(ids))} unique ids")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Concurrent submission id test failed: {str(e)}")
+        return False
+
+def test_idempotent_replay():
+    """Test that a repeated Idempotency-Key replays the original response without a new row"""
+    print("\n=== Testing Idempotency-Key Replay ===")
     
-    all_passed = True
+    key = f"backend-test-{random.getrandbits(64):016x}"
+    payload = dict(VALID_SUBMISSION, teamName="Idempotent Team")
     
-    # Test 100 words (should pass)
-    print("\nTesting with exactly 100 words (should pass):")
     try:
-        response = requests.post(
+        first = client.post(f"{API_BASE}/submit", json=payload, headers={'Idempotency-Key': key})
+        replay = client.post(f"{API_BASE}/submit", json=payload, headers={'Idempotency-Key': key})
+        print(f"Status Codes: {first.status_code}, {replay.status_code}")
+        
+        if first.status_code != 200 or replay.status_code != 200:
+            print(f"❌ Expected 200 for both requests, got {first.status_code} and {replay.status_code}")
+            return False
+        
+        if first.headers.get('Idempotent-Replayed') or replay.headers.get('Idempotent-Replayed') != 'true':
+            print("❌ Only the replay should carry Idempotent-Replayed: true")
+            return False
+        
+        if replay.json() != first.json():
+            print(f"❌ Replay body differs from the original: {replay.text[:200]}")
+            return False
+        
+        submission_id = first.json()['data']['id']
+        matches = sum(
+            1 for page in iter_submission_pages() for row in page
+            if row.get('teamName') == "Idempotent Team" and row.get('id') == submission_id
+        )
+        if matches != 1:
+            print(f"❌ Expected exactly one stored row for the key, found {matches}")
+            return False
+        
+        conflict = client.post(
             f"{API_BASE}/submit",
-            json=valid_data_100_words,
-            headers={'Content-Type': 'application/json'},
-            timeout=15
+            json=dict(payload, teamName="Different Team"),
+            headers={'Idempotency-Key': key}
         )
+        if conflict.status_code != 422:
+            print(f"❌ Expected 422 when reusing the key with a different body, got {conflict.status_code}")
+            return False
         
-        print(f"Status Code: {response.status_code}")
+        first_ms = first.timing['ttfb'] * 1000
+        replay_ms = replay.timing['ttfb'] * 1000
+        print(f"First request ttfb: {first_ms:.1f}ms, replay ttfb: {replay_ms:.1f}ms")
+        print("✅ Idempotent replay returned the original response without storing a second row")
+        return True
         
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('success'):
-                print("✅ 100 words accepted correctly")
-            else:
-                print("❌ 100 words rejected incorrectly")
-                all_passed = False
-        else:
-            print(f"❌ 100 words test failed with status {response.status_code}")
-            print(f"Response: {response.text}")
-            all_passed = False
-            
     except Exception as e:
-        print(f"❌ 100 words test failed: {str(e)}")
-        all_passed = False
+        print(f"❌ Idempotency replay test failed: {str(e)}")
+        return False
+
+def test_submission_filters():
+    """Test the email, team name prefix, title and created_at filters on GET /api/submissions"""
+    print("\n=== Testing Submission Filters ===")
+    
+    tag = f"{random.getrandbits(32):08x}"
+    batch = [
+        dict(VALID_SUBMISSION, teamName=f"Filter {tag} Alpha", teamLeadEmail=f"filter-{tag}@example.com", projectTitle=f"Filter{tag} solar tracker"),
+        dict(VALID_SUBMISSION, teamName=f"Filter {tag} Beta", teamLeadEmail=f"filter-{tag}@example.com", projectTitle=f"Filter{tag} river monitor"),
+        dict(VALID_SUBMISSION, teamName=f"Other {tag}", teamLeadEmail=f"other-{tag}@example.com", projectTitle=f"Filter{tag} Solar grid"),
+    ]
     
-    # Test 101 words (should fail)
-    print("\nTesting with 101 words (should fail):")
     try:
-        response = requests.post(
+        response = client.post(f"{API_BASE}/submit/batch", json=batch)
+        if response.status_code != 200 or response.json().get('inserted') != len(batch):
+            print(f"❌ Could not create filter fixtures: {response.status_code} {response.text[:200]}")
+            return False
+        alpha, beta, other = (result['data'] for result in response.json()['results'])
+        
+        cases = [
+            ("email", {'email': f"filter-{tag}@example.com"}, [beta, alpha]),
+            ("team name prefix", {'teamName': f"Filter {tag}"}, [beta, alpha]),
+            ("title words", {'title': f"filter{tag} SOLAR"}, [other, alpha]),
+            ("email and title", {'email': f"filter-{tag}@example.com", 'title': "solar"}, [alpha]),
+            ("created_at range", {'email': f"other-{tag}@example.com", 'from': alpha['createdAt']}, [other]),
+            ("empty range", {'email': f"filter-{tag}@example.com", 'to': alpha['createdAt']}, []),
+        ]
+        all_passed = True
+        for name, filters, expected in cases:
+            # A page size of 1 also exercises the cursor on filtered results
+            ids = [row['id'] for page in iter_submission_pages(1, filters=filters) for row in page]
+            if ids != [row['id'] for row in expected]:
+                print(f"❌ {name} filter returned {ids}, expected {[row['id'] for row in expected]}")
+                all_passed = False
+            else:
+                print(f"✅ {name} filter returned {len(ids)} matching row(s) newest first")
+        
+        invalid = client.get(f"{API_BASE}/submissions?from=not-a-date")
+        if invalid.status_code != 400:
+            print(f"❌ Expected 400 for an invalid from timestamp, got {invalid.status_code}")
+            all_passed = False
+        
+        # A non-string team name must be refused, not stored where it would break the prefix index
+        numeric = client.post(f"{API_BASE}/submit", json=dict(VALID_SUBMISSION, teamName=12345))
+        after = client.get(f"{API_BASE}/submissions?teamName=Filter")
+        if numeric.status_code != 400 or 'teamName must be a string' not in numeric.json().get('error', '') or after.status_code != 200:
+            print(f"❌ Expected 400 for a numeric teamName and a working filter after it, got {numeric.status_code}, {after.status_code}")
+            all_passed = False
+        
+        # Cursor fields are interpolated into a PostgREST filter, so filter syntax must be refused
+        for forged in (['2024-01-01T00:00:00Z",id.gt."', alpha['id']], [alpha['createdAt'], 'x",or(id.gt.0)'], ['yesterday', alpha['id']]):
+            cursor = base64.urlsafe_b64encode(json.dumps(forged).encode('utf-8')).decode('ascii').rstrip('=')
+            response = client.get(f"{API_BASE}/submissions?limit=1&cursor={cursor}")
+            if response.status_code != 400:
+                print(f"❌ Expected 400 for forged cursor {forged}, got {response.status_code}")
+                all_passed = False
+        
+        return all_passed
+        
+    except PageFetchError as e:
+        print(f"❌ Filtered query failed with status {e.response.status_code}: {e.response.text[:200]}")
+        return False
+    except Exception as e:
+        print(f"❌ Submission filters test failed: {str(e)}")
+        return False
+
+def test_conditional_get():
+    """Test ETag / If-None-Match revalidation on /api/submissions and /api/health"""
+    print("\n=== Testing Conditional GET ===")
+    
+    # Filtered to rows only this test creates, so concurrent groups can't change the body
+    email = f"etag-{random.getrandbits(32):08x}@example.com"
+    url = f"{API_BASE}/submissions?{urllib.parse.urlencode({'email': email, 'limit': 10})}"
+    validators = {}
+    
+    try:
+        first, _ = conditional_get(client, url, validators)
+        etag = first.headers.get('ETag')
+        if first.status_code != 200 or not etag:
+            print(f"❌ Expected 200 with an ETag, got {first.status_code} (ETag {etag!r})")
+            return False
+        
+        second, body = conditional_get(client, url, validators)
+        if second.status_code != 304 or second.content or body != first.content:
+            print(f"❌ Expected an empty 304 for an unchanged page, got {second.status_code}")
+            return False
+        print(f"✅ Unchanged page revalidated with 304 ({len(first.content)} bytes saved)")
+        
+        response = client.post(f"{API_BASE}/submit", json=dict(VALID_SUBMISSION, teamLeadEmail=email))
+        if response.status_code != 200:
+            print(f"❌ Submission failed with status {response.status_code}")
+            return False
+        
+        third, body = conditional_get(client, url, validators)
+        if third.status_code != 200 or third.headers.get('ETag') == etag or email not in body.decode('utf-8'):
+            print(f"❌ Expected a fresh 200 with a new ETag after a write, got {third.status_code}")
+            return False
+        print("✅ Write invalidated the cached page and changed its ETag")
+        
+        health, _ = conditional_get(client, f"{API_BASE}/health", validators)
+        revalidated, _ = conditional_get(client, f"{API_BASE}/health", validators)
+        if health.status_code != 200 or revalidated.status_code not in (200, 304):
+            print(f"❌ Unexpected health statuses {health.status_code}, {revalidated.status_code}")
+            return False
+        print(f"✅ Health check revalidation returned {revalidated.status_code}")
+        return True
+        
+    except Exception as e:
+        print(f"❌ Conditional GET test failed: {str(e)}")
+        return False
+
+def iter_export_rows(export_format='ndjson', http=None):
+    """Stream /api/submissions/export and yield one parsed row at a time"""
+    http = http or client
+    with http.stream('GET', f"{API_BASE}/submissions/export?format={export_format}") as response:
+        if response.status != 200:
+            raise RuntimeError(f"export failed with status {response.status}: {response.read()[:200]!r}")
+        if export_format == 'csv':
+            reader = csv.reader(io.TextIOWrapper(response, encoding='utf-8', newline=''))
+            header = next(reader)
+            for values in reader:
+                yield dict(zip(header, values))
+        else:
+            for line in response:
+                if line.strip():
+                    yield json.loads(line)
+
+def validate_export_rows(rows):
+    """Count rows while checking each one carries the required fields; returns (count, first bad row)"""
+    count = 0
+    for row in rows:
+        if any(field not in row for field in SUBMISSION_ROW_FIELDS):
+            return count, row
+        count += 1
+    return count, None
+
+def test_submissions_export():
+    """Test the streaming NDJSON and CSV submission exports"""
+    print("\n=== Testing Submissions Export Endpoint ===")
+    
+    try:
+        expected = sum(len(page) for page in iter_submission_pages())
+        all_passed = True
+        
+        for export_format in ('ndjson', 'csv'):
+            count, bad_row = validate_export_rows(iter_export_rows(export_format))
+            if bad_row is not None:
+                print(f"❌ {export_format} export row missing required fields: {bad_row}")
+                all_passed = False
+            elif count != expected:
+                print(f"❌ {export_format} export returned {count} rows, expected {expected}")
+                all_passed = False
+            else:
+                print(f"✅ {export_format} export streamed {count} rows with valid structure")
+        
+        # Cells a spreadsheet would evaluate (e.g. a +1-555 phone number) must be quoted with '
+        formulas = [value for row in iter_export_rows('csv') for value in row.values() if value[:1] in ('=', '+', '-', '@', '\t', '\r')]
+        if formulas:
+            print(f"❌ CSV export has {len(formulas)} cells a spreadsheet would run as formulas, e.g. {formulas[0]!r}")
+            all_passed = False
+        else:
+            print("✅ CSV export neutralises formula-like cells")
+        
+        return all_passed
+        
+    except Exception as e:
+        print(f"❌ Submissions export test failed: {str(e)}")
+        return False
+
+def test_project_description_word_count():
+    """Test project description word count validation (max 100 words)"""
+    print("\n=== Testing Project Description Word Count Validation ===")
+    
+    # Test with exactly 100 words (should pass)
+    words_100 = " ".join([f"word{i}" for i in range(100)])
+    valid_data_100_words = {
+        "teamName": "Word Count Team",
+        "teamLeadName": "Test Leader",
+        "teamLeadEmail": "test@example.com",
+        "teamLeadContact": "+1-555-1234",
+        "projectTitle": "Word Count Test",
+        "projectDescription": words_100
+    }
+    
+    # Test with 101 words (should fail)
+    words_101 = " ".join([f"word{i}" for i in range(101)])
+    invalid_data_101_words = {
+        "teamName": "Word Count Team",
+        "teamLeadName": "Test Leader",
+        "teamLeadEmail": "test@example.com",
+        "teamLeadContact": "+1-555-1234",
+        "projectTitle": "Word Count Test",
+        "projectDescription": words_101
+    }
+    
+    all_passed = True
+    
+    # Test 100 words (should pass)
+    print("\nTesting with exactly 100 words (should pass):")
+    try:
+        response = client.post(
+            f"{API_BASE}/submit",
+            json=valid_data_100_words,
+            headers={'Content-Type': 'application/json'},
+            timeout=15
+        )
+        
+        print(f"Status Code: {response.status_code}")
+        print_request_timing(response)
+        
+        if response.status_code == 200:
+            data = response.json()
+            if data.get('success'):
+                print("✅ 100 words accepted correctly")
+            else:
+                print("❌ 100 words rejected incorrectly")
+                all_passed = False
+        else:
+            print(f"❌ 100 words test failed with status {response.status_code}")
+            print(f"Response: {response.text}")
+            all_passed = False
+            
+    except Exception as e:
+        print(f"❌ 100 words test failed: {str(e)}")
+        all_passed = False
+    
+    # Test 101 words (should fail)
+    print("\nTesting with 101 words (should fail):")
+    try:
+        response = client.post(
             f"{API_BASE}/submit",
             json=invalid_data_101_words,
             headers={'Content-Type': 'application/json'},
@@ -344,6 +1237,7 @@ def test_project_description_word_count():
         )
         
         print(f"Status Code: {response.status_code}")
+        print_request_timing(response)
         
         if response.status_code == 400:
             data = response.json()
@@ -363,6 +1257,84 @@ def test_project_description_word_count():
     
     return all_passed
 
+def adversarial_submission(size, batch=False):
+    """(pieces, size): a JSON submission, or a one-entry batch, of exactly `size` bytes.
+
+    Its projectDescription is "w w w ...", the most words per byte, generated
+    lazily so 50MB bodies are never held in memory. Returns the word count too.
+    """
+    fields = json.dumps({key: value for key, value in VALID_SUBMISSION.items() if key != 'projectDescription'})
+    head = ('[' if batch else '') + fields[:-1] + ', "projectDescription": "'
+    tail = '"}' + (']' if batch else '')
+    filler = size - len(head) - len(tail)
+
+    def pieces():
+        yield head.encode('ascii')
+        block = b'w ' * (UPLOAD_CHUNK_SIZE // 2)
+        remaining = filler
+        while remaining > 0:
+            yield block[:remaining]
+            remaining -= len(block)
+        yield tail.encode('ascii')
+
+    return pieces(), size, (filler + 1) // 2
+
+def test_payload_limits():
+    """Oversized bodies get a 413 before parsing; malformed JSON, long fields and descriptions a 400"""
+    print("\n=== Testing Payload Limits ===")
+    all_passed = True
+
+    try:
+        # Far past the 100-word short-circuit, the message still carries the exact count
+        pieces, size, words = adversarial_submission(10 * 1024)
+        response = client.post(f"{API_BASE}/submit", content=b''.join(pieces), headers={'Content-Type': 'application/json'})
+        expected = f"Project description must be 100 words or less. Current: {words} words."
+        if response.status_code == 400 and response.json().get('error') == expected:
+            print(f"✅ {words}-word description rejected with its exact word count")
+        else:
+            print(f"❌ Expected 400 '{expected}', got {response.status_code}: {response.text[:200]}")
+            all_passed = False
+
+        response = client.post(f"{API_BASE}/submit", json=dict(VALID_SUBMISSION, teamName="x" * (MAX_FIELD_LENGTHS['teamName'] + 1)))
+        expected = f"teamName must be {MAX_FIELD_LENGTHS['teamName']} characters or less"
+        if response.status_code == 400 and response.json().get('error') == expected:
+            print("✅ Over-long teamName rejected")
+        else:
+            print(f"❌ Expected 400 '{expected}', got {response.status_code}: {response.text[:200]}")
+            all_passed = False
+
+        for endpoint in ("/submit", "/submit/batch"):
+            response = client.post(f"{API_BASE}{endpoint}", content=b'{"teamName": ', headers={'Content-Type': 'application/json'})
+            if response.status_code == 400 and response.json().get('error') == 'Invalid JSON':
+                print(f"✅ Malformed JSON to {endpoint} rejected")
+            else:
+                print(f"❌ Expected 400 'Invalid JSON' from {endpoint}, got {response.status_code}: {response.text[:200]}")
+                all_passed = False
+
+        # Declared too large, streamed without a length, and a batch over its own limit
+        for name, endpoint, size, length in (
+            ("submit with Content-Length", "/submit", MAX_SUBMISSION_BYTES + 1, True),
+            ("chunked submit", "/submit", 4 * 1024 * 1024, False),
+            ("batch with Content-Length", "/submit/batch", MAX_BATCH_BYTES + 1, True),
+        ):
+            pieces, size, _ = adversarial_submission(size, batch=endpoint.endswith('batch'))
+            result = stream_post(f"{API_BASE}{endpoint}", pieces, 'application/json', size if length else None)
+            print(f"{name}: {result['status']} after sending {result['bytes_sent'] / 1024:.0f} of {size / 1024:.0f} KiB "
+                  f"({result['time_to_response'] * 1000:.1f}ms)")
+            if result['status'] != 413:
+                print(f"❌ Expected 413 for an oversized {name}, got {result['status']}: {result['body'][:200]!r}")
+                all_passed = False
+            elif not length and result['bytes_sent'] >= size:
+                print(f"❌ The server read the whole {name} before rejecting it")
+                all_passed = False
+    except Exception as e:
+        print(f"❌ Payload limit test failed: {str(e)}")
+        return False
+
+    if all_passed:
+        print("✅ Payload limits enforced")
+    return all_passed
+
 def test_file_upload_endpoint():
     """Test file upload endpoint with validation"""
     print("\n=== Testing File Upload Endpoint ===")
@@ -372,21 +1344,19 @@ def test_file_upload_endpoint():
     # Test 1: No file provided
     print("\nTesting upload with no file (should fail):")
     try:
-        response = requests.post(f"{API_BASE}/upload", timeout=10)
+        response = client.post(f"{API_BASE}/upload", timeout=10)
         print(f"Status Code: {response.status_code}")
+        print_request_timing(response)
         
-        # Accept both 400 and 500 as valid responses for no file
-        # 500 occurs when no form data is sent at all (request.formData() fails)
-        # 400 occurs when form data is sent but no file field is present
-        if response.status_code in [400, 500]:
+        if response.status_code == 400:
             data = response.json()
-            if ('error' in data and ('No file provided' in data['error'] or 'File upload failed' in data['error'])):
+            if 'No file provided' in data.get('error', ''):
                 print("✅ No file correctly rejected")
             else:
                 print(f"❌ Wrong error message for no file: {data.get('error')}")
                 all_passed = False
         else:
-            print(f"❌ Expected 400 or 500 for no file, got {response.status_code}")
+            print(f"❌ Expected 400 for no file, got {response.status_code}")
             all_passed = False
             
     except Exception as e:
@@ -396,15 +1366,12 @@ def test_file_upload_endpoint():
     # Test 2: Valid image file (simulated)
     print("\nTesting upload with valid image file (simulated):")
     try:
-        # Create a small test image data
-        import io
-        test_image_data = b'\x89PNG\r\n\x1a\n\x00\x00\x00\rIHDR\x00\x00\x00\x01\x00\x00\x00\x01\x08\x02\x00\x00\x00\x90wS\xde\x00\x00\x00\tpHYs\x00\x00\x0b\x13\x00\x00\x0b\x13\x01\x00\x9a\x9c\x18\x00\x00\x00\nIDATx\x9cc\xf8\x00\x00\x00\x01\x00\x01\x00\x00\x00\x00IEND\xaeB`\x82'
-        
-        files = {'file': ('test.png', io.BytesIO(test_image_data), 'image/png')}
+        files = {'file': ('test.png', io.BytesIO(TEST_PNG_BYTES), 'image/png')}
         data = {'folder': 'test-uploads'}
         
-        response = requests.post(f"{API_BASE}/upload", files=files, data=data, timeout=15)
+        response = client.post(f"{API_BASE}/upload", files=files, data=data, timeout=15)
         print(f"Status Code: {response.status_code}")
+        print_request_timing(response)
         
         if response.status_code == 200:
             response_data = response.json()
@@ -428,8 +1395,9 @@ def test_file_upload_endpoint():
     try:
         files = {'file': ('test.txt', io.BytesIO(b'This is a text file'), 'text/plain')}
         
-        response = requests.post(f"{API_BASE}/upload", files=files, timeout=10)
+        response = client.post(f"{API_BASE}/upload", files=files, timeout=10)
         print(f"Status Code: {response.status_code}")
+        print_request_timing(response)
         
         if response.status_code == 400:
             data = response.json()
@@ -446,83 +1414,2147 @@ def test_file_upload_endpoint():
     except Exception as e:
         print(f"❌ Invalid file type test failed: {str(e)}")
         all_passed = False
+
+    # Test 4: An image content type whose bytes are not an image
+    print("\nTesting upload with an image content type but non-image bytes (should fail):")
+    try:
+        files = {'file': ('fake.png', io.BytesIO(b'This is not really a PNG'), 'image/png')}
+
+        response = client.post(f"{API_BASE}/upload", files=files, timeout=10)
+        print(f"Status Code: {response.status_code}")
+
+        if response.status_code == 400 and 'Only image files are allowed' in response.json().get('error', ''):
+            print("✅ Mismatched magic bytes correctly rejected")
+        else:
+            print(f"❌ Expected 400 'Only image files are allowed', got {response.status_code}: {response.text}")
+            all_passed = False
+
+    except Exception as e:
+        print(f"❌ Magic byte test failed: {str(e)}")
+        all_passed = False
+
+    # Test 5: Large images streamed from a generator, several at once
+    size_mib = LARGE_UPLOAD_SIZE / 1024 / 1024
+    print(f"\nTesting {CONCURRENT_LARGE_UPLOADS} concurrent streamed {size_mib:.0f} MiB image uploads:")
+    try:
+        memory_before = server_memory(SERVER_PID)
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=CONCURRENT_LARGE_UPLOADS) as pool:
+            results = list(pool.map(
+                lambda _: stream_multipart_upload(
+                    f"{API_BASE}/upload", synthetic_png_chunks(LARGE_UPLOAD_SIZE), fields={'folder': 'test-uploads'}
+                ),
+                range(CONCURRENT_LARGE_UPLOADS)
+            ))
+        elapsed = time.perf_counter() - started
+        memory_after = server_memory(SERVER_PID)
+
+        statuses = [result['status'] for result in results]
+        streamed = CONCURRENT_LARGE_UPLOADS * LARGE_UPLOAD_SIZE
+        print(f"Statuses: {statuses}, {streamed / 1024 / 1024 / elapsed:.1f} MiB/s aggregate")
+        if all(status == 200 for status in statuses):
+            print("✅ Large streamed uploads accepted")
+        else:
+            print(f"❌ Expected 200 for every large upload: {[result['body'][:200] for result in results]}")
+            all_passed = False
+
+        if memory_before and memory_after:
+            growth = memory_after['peak'] - memory_before['peak']
+            print(f"Server peak RSS ({server_label()}): {memory_after['peak'] / 1024 / 1024:.1f} MiB "
+                  f"({growth / 1024 / 1024:+.1f} MiB for {streamed / 1024 / 1024:.0f} MiB uploaded)")
+            # Buffering each file would raise the peak by at least half of what was uploaded
+            if growth >= streamed / 2:
+                print("❌ Server peak memory grew with upload size; uploads look buffered")
+                all_passed = False
+
+    except Exception as e:
+        print(f"❌ Large streamed upload test failed: {str(e)}")
+        all_passed = False
+
+    # Test 6: Oversized image rejected before the client finishes sending it
+    size_mib = OVERSIZED_UPLOAD_SIZE / 1024 / 1024
+    print(f"\nTesting streamed {size_mib:.0f} MiB image upload (should fail early):")
+    try:
+        result = stream_multipart_upload(f"{API_BASE}/upload", synthetic_png_chunks(OVERSIZED_UPLOAD_SIZE))
+        print(f"Status Code: {result['status']}")
+        print(f"Time to rejection: {result['time_to_response'] * 1000:.0f}ms after sending {result['bytes_sent'] / 1024 / 1024:.1f} MiB")
+
+        error = json.loads(result['body'] or b'{}').get('error', '')
+        if result['status'] == 400 and 'File size must be less than 15MB' in error:
+            print("✅ Oversized upload correctly rejected")
+        else:
+            print(f"❌ Expected 400 'File size must be less than 15MB', got {result['status']}: {result['body'][:200]}")
+            all_passed = False
+
+        if result['bytes_sent'] >= OVERSIZED_UPLOAD_SIZE:
+            print("❌ Oversized upload was only rejected after the whole file was sent")
+            all_passed = False
+
+    except Exception as e:
+        print(f"❌ Oversized upload test failed: {str(e)}")
+        all_passed = False
+
+    # Test 7: An Idempotency-Key replays its upload, but only for the same file
+    print("\nTesting Idempotency-Key on uploads (same file replays, another file is refused):")
+    try:
+        key = f"backend-upload-{random.getrandbits(64):016x}"
+        image = b''.join(synthetic_png_chunks(64 * 1024))
+        responses = [
+            client.post(f"{API_BASE}/upload", files={'file': ('key.png', io.BytesIO(content), 'image/png')}, headers={'Idempotency-Key': key})
+            for content in (image, image, b''.join(synthetic_png_chunks(64 * 1024)))
+        ]
+        statuses = [response.status_code for response in responses]
+        print(f"Status Codes: {statuses}")
+        if statuses == [200, 200, 422] and responses[1].headers.get('Idempotent-Replayed') == 'true' and responses[1].json() == responses[0].json():
+            print("✅ Replay returned the original upload; a different file under the same key got 422")
+        else:
+            print(f"❌ Expected [200, 200 replayed, 422], got {statuses}: {responses[2].text[:200]}")
+            all_passed = False
+
+    except Exception as e:
+        print(f"❌ Upload idempotency test failed: {str(e)}")
+        all_passed = False
     
     return all_passed
 
-def test_invalid_endpoints():
-    """Test invalid endpoints return 404"""
-    print("\n=== Testing Invalid Endpoints ===")
-    
-    invalid_endpoints = [
-        f"{API_BASE}/invalid",
-        f"{API_BASE}/nonexistent",
-        f"{API_BASE}/test"
-    ]
-    
+def test_chunked_upload():
+    """Resumable uploads: parallel chunks, resume after dropped connections, checksums"""
+    print("\n=== Testing Resumable Chunked Upload ===")
     all_passed = True
-    
-    for endpoint in invalid_endpoints:
-        try:
-            response = requests.get(endpoint, timeout=10)
-            print(f"GET {endpoint}: Status {response.status_code}")
-            
-            if response.status_code == 404:
-                data = response.json()
-                if 'error' in data and 'not found' in data['error'].lower():
-                    print(f"✅ Correctly returned 404 for {endpoint}")
-                else:
-                    print(f"❌ Wrong error message for {endpoint}")
-                    all_passed = False
-            else:
-                print(f"❌ Expected 404, got {response.status_code} for {endpoint}")
-                all_passed = False
-                
-        except Exception as e:
-            print(f"❌ Test failed for {endpoint}: {str(e)}")
+    content = b''.join(synthetic_png_chunks(CHUNKED_UPLOAD_SIZE))
+
+    # A client of its own, so the reported throughput is not spent waiting for shared connections
+    http = HttpClient(pool_size=CHUNKED_UPLOAD_PARALLEL)
+    try:
+        result = chunked_upload(http, content, drop_every=3)
+        size_mib = len(content) / 1024 / 1024
+        print(f"Uploaded {size_mib:.1f} MiB in {result['elapsed']:.2f}s ({size_mib / result['elapsed']:.1f} MiB/s effective), "
+              f"{result['dropped']} dropped chunk(s), {result['resumes']} resume(s), "
+              f"{result['bytes_sent'] / len(content):.2f}x bytes sent")
+        if result['status'] == 200 and result['body'].get('success') and result['body'].get('url'):
+            print("✅ Upload completed after resuming the dropped chunks")
+        else:
+            print(f"❌ Resumed upload failed with {result['status']}: {result['body']}")
             all_passed = False
-    
+        if result['dropped'] and not result['resumes']:
+            print("❌ Dropped chunks were not detected through the status endpoint")
+            all_passed = False
+    except Exception as e:
+        print(f"❌ Resumed upload test failed: {str(e)}")
+        all_passed = False
+    finally:
+        http.close()
+
+    try:
+        session = client.post(f"{API_BASE}/upload/chunked", json={'filename': 'logo.png', 'contentType': 'image/png', 'size': len(TEST_PNG_BYTES)}).json()
+        upload_url = f"{API_BASE}/upload/chunked/{session['uploadId']}"
+
+        response = client.put(f"{upload_url}?offset=0", content=TEST_PNG_BYTES, headers={'Content-Digest': content_digest(b'tampered')})
+        if response.status_code == 400 and 'checksum' in response.json().get('error', ''):
+            print("✅ Chunk with a wrong Content-Digest rejected")
+        else:
+            print(f"❌ Expected 400 checksum mismatch, got {response.status_code}: {response.text}")
+            all_passed = False
+
+        response = client.post(f"{upload_url}/complete")
+        if response.status_code == 409 and response.json().get('missing') == [[0, len(TEST_PNG_BYTES)]]:
+            print("✅ Completing with missing chunks rejected with the missing ranges")
+        else:
+            print(f"❌ Expected 409 with missing ranges, got {response.status_code}: {response.text}")
+            all_passed = False
+
+        client.put(f"{upload_url}?offset=0", content=TEST_PNG_BYTES, headers={'Content-Digest': content_digest(TEST_PNG_BYTES)})
+        first, second = client.post(f"{upload_url}/complete"), client.post(f"{upload_url}/complete")
+        if first.status_code == second.status_code == 200 and first.json()['url'] == second.json()['url']:
+            print("✅ Completing twice returns the same URL")
+        else:
+            print(f"❌ Repeated completion differed: {first.status_code} {first.text} / {second.status_code} {second.text}")
+            all_passed = False
+
+        status = client.get(upload_url).json()
+        if status.get('complete') and status.get('received') == len(TEST_PNG_BYTES):
+            print("✅ Status reports the upload as complete")
+        else:
+            print(f"❌ Unexpected status after completion: {status}")
+            all_passed = False
+
+        response = client.get(f"{API_BASE}/upload/chunked/upload_00000000000000000000000000")
+        if response.status_code != 404:
+            print(f"❌ Expected 404 for an unknown upload, got {response.status_code}")
+            all_passed = False
+
+        # POSTing to a session URL must not start a new session
+        before = client.get(f"{API_BASE}/metrics").json().get('chunkedUploads', {}).get('initiated')
+        response = client.post(upload_url, json={'filename': 'x.png', 'contentType': 'image/png', 'size': 10})
+        after = client.get(f"{API_BASE}/metrics").json().get('chunkedUploads', {}).get('initiated')
+        if response.status_code == 405 and before == after:
+            print("✅ POST to a session URL rejected with 405")
+        else:
+            print(f"❌ Expected 405 without a new session for POST {upload_url}, got {response.status_code} ({before} -> {after} sessions)")
+            all_passed = False
+
+        # Session requests are read under the same cap as a submission
+        response = client.post(f"{API_BASE}/upload/chunked", content=b'{"filename": ', headers={'Content-Type': 'application/json'})
+        if response.status_code == 400 and response.json().get('error') == 'Invalid JSON':
+            print("✅ Malformed session request rejected")
+        else:
+            print(f"❌ Expected 400 'Invalid JSON' for a malformed session request, got {response.status_code}: {response.text[:200]}")
+            all_passed = False
+
+        response = client.post(f"{API_BASE}/upload/chunked", json={'filename': 'x' * MAX_SUBMISSION_BYTES, 'contentType': 'image/png', 'size': 10})
+        if response.status_code == 413:
+            print("✅ Oversized session request rejected with 413")
+        else:
+            print(f"❌ Expected 413 for an oversized session request, got {response.status_code}: {response.text[:200]}")
+            all_passed = False
+    except Exception as e:
+        print(f"❌ Chunked upload validation test failed: {str(e)}")
+        all_passed = False
+
     return all_passed
 
-def run_comprehensive_test():
-    """Run all tests and provide summary"""
-    print("🚀 Starting Comprehensive Backend API Testing")
-    print(f"Testing against: {API_BASE}")
-    print("=" * 60)
-    
-    test_results = []
-    
-    # Run all tests
-    test_results.append(("Health Endpoint", test_health_endpoint()))
-    test_results.append(("Submit Valid Data", test_submit_valid_data()))
-    test_results.append(("Submit Missing Fields", test_submit_missing_required_fields()))
-    test_results.append(("Word Count Validation", test_project_description_word_count()))
-    test_results.append(("File Upload Endpoint", test_file_upload_endpoint()))
-    test_results.append(("Get Submissions", test_get_submissions()))
-    test_results.append(("Invalid Endpoints", test_invalid_endpoints()))
-    
-    # Summary
-    print("\n" + "=" * 60)
-    print("🏁 TEST SUMMARY")
-    print("=" * 60)
-    
-    passed = 0
-    total = len(test_results)
-    
-    for test_name, result in test_results:
-        status = "✅ PASS" if result else "❌ FAIL"
-        print(f"{test_name:<25} {status}")
-        if result:
-            passed += 1
-    
-    print(f"\nOverall Result: {passed}/{total} tests passed")
-    
-    if passed == total:
-        print("🎉 All tests passed! Backend API is working correctly in demo mode.")
-        return True
-    else:
-        print("⚠️  Some tests failed. Please check the issues above.")
-        return False
+def upload_metrics(http=None):
+    """The server's upload dedupe counters, or {} when /api/metrics is unavailable"""
+    try:
+        response = (http or client).get(f"{API_BASE}/metrics")
+        return response.json().get('uploads', {}) if response.status_code == 200 else {}
+    except Exception:
+        return {}
 
-if __name__ == "__main__":
-    success = run_comprehensive_test()
+def test_upload_dedupe():
+    """Identical uploads share one content-addressed object and skip the storage write"""
+    print("\n=== Testing Upload Deduplication ===")
+    all_passed = True
+    logo = b''.join(synthetic_png_chunks(DEDUPE_LOGO_SIZE))
+
+    try:
+        before = upload_metrics()
+        responses = []
+        for attempt in range(DEDUPE_REPEATS + 1):
+            files = {'file': (f"logo-v{attempt}.png", io.BytesIO(logo), 'image/png')}
+            responses.append(client.post(f"{API_BASE}/upload", files=files, data={'folder': 'logos'}))
+        after = upload_metrics()
+
+        urls = {response.json().get('url') for response in responses if response.status_code == 200}
+        first_ms = responses[0].timing['total'] * 1000
+        repeat_ms = statistics.median(response.timing['total'] for response in responses[1:]) * 1000
+        print(f"First upload: {first_ms:.0f}ms, repeat uploads: {repeat_ms:.0f}ms median")
+        if len(urls) == 1 and all(response.status_code == 200 for response in responses):
+            print("✅ Re-uploading the same logo returned the same URL")
+        else:
+            print(f"❌ Expected one URL for identical uploads, got {urls} ({[response.status_code for response in responses]})")
+            all_passed = False
+
+        if before and after:
+            written = after['bytesWritten'] - before['bytesWritten']
+            received = after['bytesReceived'] - before['bytesReceived']
+            print(f"Bytes received: {received}, bytes written to storage: {written}")
+            if written != len(logo):
+                print(f"❌ Expected exactly one storage write of {len(logo)} bytes")
+                all_passed = False
+
+        files = {'file': ('other.png', io.BytesIO(b''.join(synthetic_png_chunks(DEDUPE_LOGO_SIZE))), 'image/png')}
+        other = client.post(f"{API_BASE}/upload", files=files, data={'folder': 'logos'})
+        if other.status_code == 200 and other.json().get('url') not in urls:
+            print("✅ Different content got its own URL")
+        else:
+            print(f"❌ Different content was not stored separately: {other.status_code} {other.text}")
+            all_passed = False
+    except Exception as e:
+        print(f"❌ Upload dedupe test failed: {str(e)}")
+        all_passed = False
+
+    return all_passed
+
+def upload_image(http, content, filename, folder, variants=True):
+    """POST one image to /api/upload, asking for its variants"""
+    files = {'file': (filename, io.BytesIO(content), 'image/png')}
+    data = {'folder': folder, 'variants': 'true'} if variants else {'folder': folder}
+    return http.post(f"{API_BASE}/upload", files=files, data=data)
+
+def test_image_variants():
+    """Uploads with variants=true return cached thumbnail and medium WebP URLs"""
+    print("\n=== Testing Image Variants ===")
+    all_passed = True
+    logo = b''.join(synthetic_png_chunks(GALLERY_LOGO_SIZE))
+
+    try:
+        response = upload_image(client, logo, 'variants.png', 'logos')
+        print(f"Status Code: {response.status_code}")
+        variants = response.json().get('variants') if response.status_code == 200 else None
+        if variants and variants.get('thumbnail', '').endswith('-thumbnail.webp') and variants.get('medium', '').endswith('-medium.webp'):
+            print(f"✅ Variants returned alongside {response.json()['url']}")
+        else:
+            print(f"❌ Expected thumbnail and medium variants, got {response.text}")
+            return False
+
+        again = upload_image(client, logo, 'variants-again.png', 'logos')
+        if again.status_code == 200 and again.json().get('variants') == variants:
+            print(f"✅ Re-upload reused the cached variants ({again.timing['total'] * 1000:.0f}ms)")
+        else:
+            print(f"❌ Re-upload returned different variants: {again.text}")
+            all_passed = False
+
+        plain = upload_image(client, logo, 'plain.png', 'logos', variants=False)
+        if plain.status_code == 200 and 'variants' not in plain.json():
+            print("✅ Variants are only returned when requested")
+        else:
+            print(f"❌ Unrequested variants in {plain.text}")
+            all_passed = False
+
+        # Objects are only fetchable when the server serves its storage (local_server.py --storage-dir)
+        if variants['thumbnail'].startswith(BASE_URL):
+            thumbnail = client.get(variants['thumbnail'])
+            if thumbnail.status_code == 200 and thumbnail.content[:4] == b'RIFF' and len(thumbnail.content) < len(logo):
+                print(f"✅ Thumbnail is {len(thumbnail.content)} bytes vs {len(logo)} for the original")
+            else:
+                print(f"❌ Thumbnail fetch returned {thumbnail.status_code}, {len(thumbnail.content)} bytes")
+                all_passed = False
+
+        team_name = f"Variant Team {random.getrandbits(32):08x}"
+        payload = dict(VALID_SUBMISSION, teamName=team_name, projectLogoUrl=response.json()['url'], projectLogoVariants=variants)
+        submitted = client.post(f"{API_BASE}/submit", json=payload)
+        rows = next(iter_submission_pages(filters={'teamName': team_name}), []) if submitted.status_code == 200 else []
+        if rows and rows[0].get('projectLogoVariants') == variants:
+            print("✅ Submissions keep their logo variants")
+        else:
+            print(f"❌ Submitted variants did not round-trip: {submitted.status_code} {rows}")
+            all_passed = False
+
+        # Only { thumbnail, medium } URLs may reach the JSONB columns
+        for bad in ({'thumbnail': variants['thumbnail']}, dict(variants, extra='x'), dict(variants, medium={'$ref': 1}), ['a', 'b']):
+            response = client.post(f"{API_BASE}/submit", json=dict(VALID_SUBMISSION, projectLogoVariants=bad))
+            if response.status_code != 400 or 'projectLogoVariants' not in response.json().get('error', ''):
+                print(f"❌ Expected 400 for projectLogoVariants={bad!r}, got {response.status_code}: {response.text[:200]}")
+                all_passed = False
+                break
+        else:
+            print("✅ Malformed variants rejected")
+    except Exception as e:
+        print(f"❌ Image variants test failed: {str(e)}")
+        all_passed = False
+
+    return all_passed
+
+def check_invalid_endpoint(endpoint):
+    """GET an unknown endpoint and expect a 404 'not found' error"""
+    try:
+        response = client.get(endpoint, timeout=10)
+        print(f"GET {endpoint}: Status {response.status_code}")
+        
+        if response.status_code == 404:
+            data = response.json()
+            if 'error' in data and 'not found' in data['error'].lower():
+                print(f"✅ Correctly returned 404 for {endpoint}")
+                return True
+            print(f"❌ Wrong error message for {endpoint}")
+            return False
+        
+        print(f"❌ Expected 404, got {response.status_code} for {endpoint}")
+        return False
+            
+    except Exception as e:
+        print(f"❌ Test failed for {endpoint}: {str(e)}")
+        return False
+
+def test_invalid_endpoints():
+    """Test invalid endpoints return 404"""
+    print("\n=== Testing Invalid Endpoints ===")
+    
+    invalid_endpoints = [
+        f"{API_BASE}/invalid",
+        f"{API_BASE}/nonexistent",
+        f"{API_BASE}/test"
+    ]
+    
+    return all(run_cases_concurrently(check_invalid_endpoint, invalid_endpoints))
+
+class ThreadLocalOutput:
+    """sys.stdout proxy that diverts prints from capturing threads into per-thread buffers"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (buffer or self.stream).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+@contextlib.contextmanager
+def thread_local_output():
+    """Install the ThreadLocalOutput proxy for the duration of a concurrent run"""
+    if isinstance(sys.stdout, ThreadLocalOutput):
+        yield
+        return
+    original = sys.stdout
+    sys.stdout = ThreadLocalOutput(original)
+    try:
+        yield
+    finally:
+        sys.stdout = original
+
+def run_captured(func, *args):
+    """Run func with its output captured: (result, output, seconds).
+
+    Must be called inside thread_local_output().
+    """
+    proxy = sys.stdout
+    previous = getattr(proxy.local, 'buffer', None)
+    proxy.local.buffer = io.StringIO()
+    start = time.perf_counter()
+    try:
+        result = func(*args)
+    except Exception as e:
+        print(f"❌ Unexpected error: {str(e)}")
+        result = False
+    finally:
+        output = proxy.local.buffer.getvalue()
+        proxy.local.buffer = previous
+    return result, output, time.perf_counter() - start
+
+def run_cases_concurrently(check, cases):
+    """Run independent test cases in parallel and print their output in case order"""
+    with thread_local_output(), ThreadPoolExecutor(max_workers=len(cases)) as pool:
+        outcomes = list(pool.map(lambda case: run_captured(check, case), cases))
+    results = []
+    for result, output, _ in outcomes:
+        print(output, end='')
+        results.append(result)
+    return results
+
+# Comprehensive test groups in report order, with the groups each one must wait for
+TEST_GROUPS = [
+    ("Health Endpoint", test_health_endpoint, ()),
+    ("Submit Valid Data", test_submit_valid_data, ()),
+    ("Submit Missing Fields", test_submit_missing_required_fields, ()),
+    ("Word Count Validation", test_project_description_word_count, ()),
+    ("Payload Limits", test_payload_limits, ()),
+    ("File Upload Endpoint", test_file_upload_endpoint, ()),
+    ("Chunked Upload", test_chunked_upload, ()),
+    # Counts storage writes, so no other upload may run alongside it
+    ("Upload Dedupe", test_upload_dedupe, ("File Upload Endpoint", "Chunked Upload")),
+    ("Image Variants", test_image_variants, ("Upload Dedupe",)),
+    # Expects to see the rows created by the successful submits
+    ("Get Submissions", test_get_submissions, ("Submit Valid Data", "Word Count Validation")),
+    ("Batch Submission", test_submit_batch, ()),
+    ("Concurrent Submission IDs", test_concurrent_submit_ids, ()),
+    ("Idempotent Replay", test_idempotent_replay, ()),
+    ("Submission Filters", test_submission_filters, ()),
+    ("Conditional GET", test_conditional_get, ()),
+    # Compares row counts across endpoints, so nothing may insert while it runs
+    ("Submissions Export", test_submissions_export, (
+        "Submit Valid Data", "Word Count Validation", "Image Variants", "Batch Submission",
+        "Concurrent Submission IDs", "Idempotent Replay", "Submission Filters", "Conditional GET",
+    )),
+    ("Invalid Endpoints", test_invalid_endpoints, ()),
+]
+
+def run_test_groups(groups, parallel=True):
+    """Run test groups, concurrently where their dependencies allow.
+
+    Each group's output is captured and printed in declaration order as soon
+    as it and every group before it have finished, so the log reads the same
+    as a sequential run. Returns (results in declaration order, seconds spent
+    per group).
+    """
+    names = [name for name, _, _ in groups]
+    outcomes = {}
+    printed = 0
+
+    def flush_in_order():
+        nonlocal printed
+        while printed < len(names) and names[printed] in outcomes:
+            print(outcomes[names[printed]][1], end='')
+            printed += 1
+
+    if not parallel:
+        with thread_local_output():
+            for name, func, _ in groups:
+                outcomes[name] = run_captured(func)
+                flush_in_order()
+    else:
+        pending = list(groups)
+        running = {}
+        with thread_local_output(), ThreadPoolExecutor(max_workers=len(groups)) as pool:
+            while pending or running:
+                for group in [group for group in pending if all(dep in outcomes for dep in group[2])]:
+                    pending.remove(group)
+                    running[pool.submit(run_captured, group[1])] = group[0]
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    outcomes[running.pop(future)] = future.result()
+                flush_in_order()
+
+    return [(name, outcomes[name][0]) for name in names], {name: outcomes[name][2] for name in names}
+
+def run_comprehensive_test(parallel=True):
+    """Run all tests and provide summary"""
+    print("🚀 Starting Comprehensive Backend API Testing")
+    print(f"Testing against: {API_BASE}")
+    print("=" * 60)
+    
+    # Run all tests
+    started = time.perf_counter()
+    test_results, durations = run_test_groups(TEST_GROUPS, parallel=parallel)
+    wall_clock = time.perf_counter() - started
+    
+    # Summary
+    print("\n" + "=" * 60)
+    print("🏁 TEST SUMMARY")
+    print("=" * 60)
+    
+    passed = 0
+    total = len(test_results)
+    
+    for test_name, result in test_results:
+        status = "✅ PASS" if result else "❌ FAIL"
+        print(f"{test_name:<25} {status}  {durations[test_name]:.2f}s")
+        if result:
+            passed += 1
+    
+    print(f"\nOverall Result: {passed}/{total} tests passed")
+    sequential = sum(durations.values())
+    print(f"Wall clock: {wall_clock:.2f}s (groups took {sequential:.2f}s back to back, saved {sequential - wall_clock:.2f}s)")
+    
+    if passed == total:
+        print("🎉 All tests passed! Backend API is working correctly in demo mode.")
+        return True
+    else:
+        print("⚠️  Some tests failed. Please check the issues above.")
+        return False
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def build_load_scenarios():
+    """Request shapes driven by load mode: (endpoint, payload, expected status)"""
+    scenarios = [("/submit", VALID_SUBMISSION, 200)]
+    for test_case in MISSING_FIELD_CASES:
+        scenarios.append(("/submit", test_case['data'], 400))
+    return scenarios
+
+def load_worker(http, worker_id, scenarios, deadline, results, lock):
+    """Closed-loop worker: send the next scenario as soon as the previous one returns"""
+    samples = []
+    index = worker_id
+    while time.perf_counter() < deadline:
+        endpoint, payload, expected = scenarios[index % len(scenarios)]
+        index += 1
+        start = time.perf_counter()
+        timing = None
+        try:
+            response = http.post(f"{API_BASE}{endpoint}", json=payload)
+            status = response.status_code
+            timing = response.timing
+        except Exception:
+            status = "ERR"
+        samples.append((endpoint, status, expected, time.perf_counter() - start, timing))
+    with lock:
+        results.extend(samples)
+
+def run_load_test(concurrency=10, duration=30):
+    """Drive /api/submit from a pool of workers and report throughput and latency percentiles"""
+    print("🚀 Starting Load Test")
+    print(f"Testing against: {API_BASE}")
+    print(f"Concurrency: {concurrency} workers, Duration: {duration}s")
+    print("=" * 60)
+
+    scenarios = build_load_scenarios()
+    results = []
+    lock = threading.Lock()
+    http = HttpClient(pool_size=concurrency)
+    started = time.perf_counter()
+    deadline = started + duration
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for worker_id in range(concurrency):
+            pool.submit(load_worker, http, worker_id, scenarios, deadline, results, lock)
+
+    elapsed = time.perf_counter() - started
+    http.close()
+    return report_load_results(results, elapsed)
+
+def print_timing_breakdown(timings):
+    """Print mean client-side phase timings per endpoint to separate network from handler time"""
+    print(f"\n{'Endpoint':<12} {'dns ms':>8} {'conn ms':>8} {'tls ms':>8} {'ttfb ms':>8} {'xfer ms':>8} {'reused':>7}")
+    for endpoint, endpoint_timings in sorted(timings.items()):
+        means = summarize_timings(endpoint_timings)
+        reused = sum(1 for timing in endpoint_timings if timing['reused']) / len(endpoint_timings)
+        print(
+            f"{endpoint:<12} {means['dns']:>8.2f} {means['connect']:>8.2f} {means['tls']:>8.2f} "
+            f"{means['ttfb']:>8.2f} {means['transfer']:>8.2f} {reused:>7.0%}"
+        )
+
+def print_server_phase_breakdown(timings):
+    """Print per-phase Server-Timing percentiles per endpoint, next to the client's ttfb.
+
+    "outside" is ttfb minus the server's total: network, queueing and framework time
+    the route's own phases don't see.
+    """
+    rows = []
+    for endpoint, endpoint_timings in sorted(timings.items()):
+        phases = defaultdict(list)
+        for timing in endpoint_timings:
+            for name, duration in timing.get('server', {}).items():
+                phases[name].append(duration)
+            if 'total' in timing.get('server', {}):
+                phases['outside'].append(max(0.0, timing['ttfb'] - timing['server']['total']))
+        for name, durations in phases.items():
+            durations.sort()
+            rows.append((endpoint, name, durations))
+    if not rows:
+        return
+
+    print(f"\nServer-Timing phases:\n{'Endpoint':<12} {'Phase':<12} {'Count':>7} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9} {'max ms':>9}")
+    for endpoint, name, durations in rows:
+        print(
+            f"{endpoint:<12} {name:<12} {len(durations):>7} {statistics.fmean(durations) * 1000:>9.2f} "
+            f"{percentile(durations, 50) * 1000:>9.2f} {percentile(durations, 95) * 1000:>9.2f} {durations[-1] * 1000:>9.2f}"
+        )
+
+def report_load_results(results, elapsed):
+    """Print per endpoint/status throughput and p50/p95/p99/max latency"""
+    groups = defaultdict(list)
+    timings = defaultdict(list)
+    unexpected = 0
+    for endpoint, status, expected, latency, timing in results:
+        groups[(endpoint, status)].append(latency)
+        if timing:
+            timings[endpoint].append(timing)
+        if status != expected:
+            unexpected += 1
+
+    print("\n" + "=" * 60)
+    print("📈 LOAD TEST SUMMARY")
+    print("=" * 60)
+    print(f"Total requests: {len(results)} in {elapsed:.2f}s ({len(results) / elapsed:.1f} req/s)")
+    print(f"\n{'Endpoint':<12} {'Status':<7} {'Count':>7} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+
+    for (endpoint, status), latencies in sorted(groups.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+        latencies.sort()
+        print(
+            f"{endpoint:<12} {str(status):<7} {len(latencies):>7} {len(latencies) / elapsed:>8.1f} "
+            f"{percentile(latencies, 50) * 1000:>9.1f} {percentile(latencies, 95) * 1000:>9.1f} "
+            f"{percentile(latencies, 99) * 1000:>9.1f} {latencies[-1] * 1000:>9.1f}"
+        )
+
+    print_timing_breakdown(timings)
+    print_server_phase_breakdown(timings)
+
+    if unexpected:
+        print(f"\n⚠️  {unexpected} responses had an unexpected status code")
+        return False
+
+    print("\n✅ All responses returned the expected status code")
+    return True
+
+def poll_worker(http, urls, interval, deadline, results, lock):
+    """One dashboard: poll every url each interval with conditional GETs until the deadline"""
+    validators = {}
+    next_poll = time.perf_counter()
+    while next_poll < deadline:
+        for url in urls:
+            try:
+                response, body = conditional_get(http, url, validators)
+            except Exception:
+                response, body = None, None
+            with lock:
+                results.append((response, len(body or b'')))
+        next_poll += interval
+        time.sleep(max(0.0, next_poll - time.perf_counter()))
+
+def run_poll_test(pollers=10, duration=30, interval=2.0, write_interval=5.0):
+    """Simulate dashboards polling with If-None-Match while submits trickle in"""
+    print("🚀 Starting Polling Test")
+    print(f"Testing against: {API_BASE}")
+    print(f"Dashboards: {pollers}, Poll interval: {interval}s, Write interval: {write_interval}s, Duration: {duration}s")
+    print("=" * 60)
+
+    urls = [f"{API_BASE}/submissions?limit={SUBMISSIONS_PAGE_SIZE}", f"{API_BASE}/health"]
+    http = HttpClient(pool_size=pollers + 1)
+    results = []
+    lock = threading.Lock()
+    before = client.get(f"{API_BASE}/metrics").json().get('responseCache', {})
+    started = time.perf_counter()
+    deadline = started + duration
+
+    def writer():
+        writes = 0
+        while time.perf_counter() + write_interval < deadline:
+            time.sleep(write_interval)
+            if http.post(f"{API_BASE}/submit", json=dict(VALID_SUBMISSION, teamName=f"Poll Team {writes}")).status_code == 200:
+                writes += 1
+        return writes
+
+    with ThreadPoolExecutor(max_workers=pollers + 1) as pool:
+        writes = pool.submit(writer)
+        for _ in range(pollers):
+            pool.submit(poll_worker, http, urls, interval, deadline, results, lock)
+    elapsed = time.perf_counter() - started
+    http.close()
+    after = client.get(f"{API_BASE}/metrics").json().get('responseCache', {})
+
+    latencies = defaultdict(list)
+    bytes_received = bytes_saved = failures = 0
+    for response, size in results:
+        if response is None or response.status_code not in (200, 304):
+            failures += 1
+            continue
+        latencies[response.status_code].append(response.timing['total'])
+        if response.status_code == 304:
+            bytes_saved += size
+        else:
+            bytes_received += len(response.content)
+
+    total = sum(len(values) for values in latencies.values())
+    print("\n" + "=" * 60)
+    print("📈 POLLING SUMMARY")
+    print("=" * 60)
+    print(f"Polls: {len(results)} in {elapsed:.2f}s, Writes: {writes.result()}")
+    print(f"304 ratio: {len(latencies[304]) / total if total else 0:.1%}")
+    hits = after.get('hits', 0) - before.get('hits', 0)
+    lookups = hits + after.get('misses', 0) - before.get('misses', 0)
+    if lookups:
+        print(f"Server cache hit ratio: {hits / lookups:.1%} ({hits}/{lookups})")
+    print(f"Bytes received: {bytes_received}, Bytes saved by 304s: {bytes_saved} "
+          f"({bytes_saved / (bytes_saved + bytes_received) if bytes_saved + bytes_received else 0:.1%})")
+    print(f"\n{'Status':<7} {'Count':>7} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for status in (200, 304):
+        values = sorted(latencies[status])
+        if values:
+            print(f"{status:<7} {len(values):>7} {percentile(values, 50) * 1000:>9.2f} "
+                  f"{percentile(values, 99) * 1000:>9.2f} {values[-1] * 1000:>9.2f}")
+
+    if failures:
+        print(f"\n⚠️  {failures} polls failed or returned an unexpected status")
+        return False
+
+    print("\n✅ Every poll returned 200 or 304")
+    return True
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of latencies recorded in microseconds.
+
+    Values are bucketed by power of two with a fixed number of linear
+    sub-buckets per power, which keeps relative error bounded (about 1% with
+    the default 128 sub-buckets) regardless of magnitude.
+    """
+
+    def __init__(self, sub_buckets=128):
+        self.sub_buckets = sub_buckets
+        self.sub_bucket_bits = sub_buckets.bit_length() - 1
+        self.counts = defaultdict(int)
+        self.total = 0
+        self.max_value = 0
+
+    def _index(self, value):
+        if value < self.sub_buckets:
+            return (0, value)
+        magnitude = value.bit_length() - 1 - self.sub_bucket_bits
+        return (magnitude, value >> magnitude)
+
+    def _value_of(self, index):
+        magnitude, sub_bucket = index
+        # Report the highest value that falls into the bucket
+        return ((sub_bucket + 1) << magnitude) - 1
+
+    def record(self, seconds):
+        value = max(0, int(seconds * 1_000_000))
+        self.counts[self._index(value)] += 1
+        self.total += 1
+        self.max_value = max(self.max_value, value)
+
+    def value_at_percentile(self, pct):
+        """Latency in microseconds at the given percentile"""
+        if not self.total:
+            return 0
+        target = max(1, math.ceil(pct / 100.0 * self.total))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._value_of(index), self.max_value)
+        return self.max_value
+
+    def print_percentile_distribution(self, ticks=(50, 75, 90, 95, 99, 99.9, 99.99, 100)):
+        print(f"{'Value(ms)':>12} {'Percentile':>12} {'TotalCount':>11} {'1/(1-Pct)':>11}")
+        for pct in ticks:
+            fraction = pct / 100.0
+            inverse = "inf" if fraction >= 1 else f"{1 / (1 - fraction):.2f}"
+            count = min(self.total, max(1, math.ceil(fraction * self.total))) if self.total else 0
+            print(f"{self.value_at_percentile(pct) / 1000:>12.3f} {fraction:>12.6f} {count:>11} {inverse:>11}")
+
+def parse_rate(rate):
+    """Parse an arrival rate such as '200', '200/s' or '6000/m' into requests per second"""
+    value, _, unit = str(rate).partition('/')
+    per_second = {'': 1, 's': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600}
+    if unit not in per_second:
+        raise argparse.ArgumentTypeError(f"Unknown rate unit '{unit}' (use /s, /m or /h)")
+    return float(value) / per_second[unit]
+
+def build_open_loop_requests():
+    """Request shapes for open-loop mode: (endpoint, method, kwargs, expected statuses)"""
+    return [
+        ("/submit", "POST", {'json': VALID_SUBMISSION}, (200,)),
+        ("/upload", "POST", {'files': {'file': ('test.png', TEST_PNG_BYTES, 'image/png')},
+                             'data': {'folder': 'load-test'}}, (200,)),
+        ("/health", "GET", {}, (200,)),
+    ]
+
+def open_loop_send(http, endpoint, method, kwargs, scheduled):
+    """Send one request and time it from its scheduled, not actual, send time"""
+    send_lag = time.perf_counter() - scheduled
+    timing = None
+    try:
+        response = http.request(method, f"{API_BASE}{endpoint}", **kwargs)
+        status = response.status_code
+        timing = response.timing
+    except Exception:
+        status = "ERR"
+    return endpoint, status, time.perf_counter() - scheduled, send_lag, timing
+
+def arrival_schedule(rate, duration, arrival, start):
+    """Yield absolute scheduled send times for a fixed or Poisson arrival process"""
+    elapsed = 0.0
+    while True:
+        elapsed += random.expovariate(rate) if arrival == 'poisson' else 1.0 / rate
+        if elapsed >= duration:
+            return
+        yield start + elapsed
+
+def run_open_loop_test(rate, duration=30, arrival='fixed', max_inflight=1000):
+    """Fire requests on a constant-arrival-rate schedule regardless of completions.
+
+    Latency is measured from each request's scheduled send time, so time spent
+    queued behind slow requests (client or server side) is counted instead of
+    silently omitted.
+    """
+    print("🚀 Starting Open-Loop Load Test")
+    print(f"Testing against: {API_BASE}")
+    print(f"Target rate: {rate:.1f} req/s ({arrival} arrivals), Duration: {duration}s")
+    print("=" * 60)
+
+    shapes = build_open_loop_requests()
+    futures = []
+    http = HttpClient(pool_size=max_inflight)
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=max_inflight) as pool:
+        for index, scheduled in enumerate(arrival_schedule(rate, duration, arrival, start)):
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            endpoint, method, kwargs, expected = shapes[index % len(shapes)]
+            futures.append((expected, pool.submit(open_loop_send, http, endpoint, method, kwargs, scheduled)))
+
+    elapsed = time.perf_counter() - start
+    http.close()
+    histograms = defaultdict(LatencyHistogram)
+    overall = LatencyHistogram()
+    timings = defaultdict(list)
+    max_send_lag = 0.0
+    unexpected = 0
+    for expected, future in futures:
+        endpoint, status, latency, send_lag, timing = future.result()
+        histograms[(endpoint, status)].record(latency)
+        if timing:
+            timings[endpoint].append(timing)
+        overall.record(latency)
+        max_send_lag = max(max_send_lag, send_lag)
+        if status not in expected:
+            unexpected += 1
+
+    print("\n" + "=" * 60)
+    print("📈 OPEN-LOOP SUMMARY")
+    print("=" * 60)
+    print(f"Scheduled: {len(futures)} requests, achieved {len(futures) / elapsed:.1f} req/s over {elapsed:.2f}s")
+    print(f"Max send lag behind schedule: {max_send_lag * 1000:.1f} ms")
+    print(f"\n{'Endpoint':<12} {'Status':<7} {'Count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'p99.9 ms':>9} {'max ms':>9}")
+    for (endpoint, status), histogram in sorted(histograms.items(), key=lambda item: (item[0][0], str(item[0][1]))):
+        print(
+            f"{endpoint:<12} {str(status):<7} {histogram.total:>7} "
+            + " ".join(f"{histogram.value_at_percentile(pct) / 1000:>9.1f}" for pct in (50, 95, 99, 99.9, 100))
+        )
+
+    print_timing_breakdown(timings)
+    print_server_phase_breakdown(timings)
+
+    print("\nLatency distribution (corrected for coordinated omission):")
+    overall.print_percentile_distribution()
+
+    if unexpected:
+        print(f"\n⚠️  {unexpected} responses had an unexpected status code")
+        return False
+
+    print("\n✅ All responses returned the expected status code")
+    return True
+
+def server_label():
+    """Which process server_memory() reports on, for printing next to its numbers"""
+    if LOCAL_SERVER_PROCESS and SERVER_PID == LOCAL_SERVER_PROCESS.pid:
+        return "local_server.py stand-in, not the Next.js route"
+    return f"PID {SERVER_PID}"
+
+def server_memory(pid):
+    """Current and peak RSS in bytes of a server process on this machine (Linux /proc only)"""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/status") as status:
+            fields = dict(line.split(':', 1) for line in status if ':' in line)
+    except OSError:
+        return None
+    return {key: int(fields[name].split()[0]) * 1024 for key, name in (('rss', 'VmRSS'), ('peak', 'VmHWM'))}
+
+def seed_submissions(count, concurrency=50):
+    """Create `count` valid submissions concurrently; returns how many succeeded"""
+    http = HttpClient(pool_size=concurrency)
+
+    def submit(index):
+        payload = dict(VALID_SUBMISSION, teamName=f"Seed Team {index}", teamLeadEmail=f"seed{index}@example.com")
+        try:
+            return http.post(f"{API_BASE}/submit", json=payload).status_code == 200
+        except Exception:
+            return False
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        created = sum(pool.map(submit, range(count)))
+    http.close()
+    return created
+
+def measure_consumer(name, consume):
+    """Run a consumer returning a row count; report rows/s and peak client heap"""
+    server_before = server_memory(SERVER_PID)
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows, bad_row = consume()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    server_after = server_memory(SERVER_PID)
+
+    print(f"{name:<22} {rows:>8} {elapsed:>9.3f} {rows / elapsed if elapsed else 0:>10.0f} {peak / 1024 / 1024:>12.2f}", end='')
+    if server_before and server_after:
+        print(f" {(server_after['rss'] - server_before['rss']) / 1024 / 1024:>+13.2f}", end='')
+    print()
+    return rows, bad_row
+
+def run_export_benchmark(seed=0):
+    """Compare streaming exports with the array endpoint on throughput and peak memory"""
+    print("🚀 Starting Export Benchmark")
+    print(f"Testing against: {API_BASE}")
+    print("=" * 60)
+
+    if seed:
+        print(f"Seeding {seed} submissions...")
+        print(f"Created {seed_submissions(seed)} submissions")
+
+    duplicate_keys = 0
+
+    def consume_array():
+        nonlocal duplicate_keys
+        response = client.get(f"{API_BASE}/submissions", timeout=DEFAULT_TIMEOUTS['/export'])
+        if response.status_code != 200:
+            raise RuntimeError(f"array endpoint failed with status {response.status_code}")
+        rows = response.json()
+        duplicate_keys = len(rows) - len({(row.get('createdAt'), row.get('id')) for row in rows})
+        return validate_export_rows(rows)
+
+    print(f"\n{'Consumer':<22} {'Rows':>8} {'Seconds':>9} {'Rows/s':>10} {'Peak MiB':>12}", end='')
+    print(f" {'Server ΔRSS MiB':>13}" if SERVER_PID else '')
+    counts = {}
+    all_passed = True
+    for name, consume in (
+        ("array /submissions", consume_array),
+        ("ndjson export", lambda: validate_export_rows(iter_export_rows('ndjson'))),
+        ("csv export", lambda: validate_export_rows(iter_export_rows('csv'))),
+    ):
+        counts[name], bad_row = measure_consumer(name, consume)
+        if bad_row is not None:
+            print(f"❌ {name} row missing required fields: {bad_row}")
+            all_passed = False
+
+    if len(set(counts.values())) != 1:
+        print(f"\n❌ Row counts differ between consumers: {counts}")
+        if duplicate_keys:
+            print(f"⚠️  {duplicate_keys} rows share a (createdAt, id) key, which keyset paging cannot tell apart")
+        return False
+
+    if all_passed:
+        print(f"\n✅ All consumers saw the same {next(iter(counts.values()))} rows with valid structure")
+    return all_passed
+
+def bulk_payloads(count):
+    """Distinct valid submissions, as from a partner hackathon's spreadsheet"""
+    return [
+        dict(VALID_SUBMISSION, teamName=f"Imported Team {index}", teamLeadEmail=f"import{index}@example.com")
+        for index in range(count)
+    ]
+
+def run_bulk_import_benchmark(count, batch_size=100, concurrency=10):
+    """Import `count` rows with single submits and with /submit/batch; compare rows/s"""
+    print("🚀 Starting Bulk Import Benchmark")
+    print(f"Testing against: {API_BASE}")
+    print(f"Rows: {count}, Batch size: {batch_size}, Concurrency: {concurrency}")
+    print("=" * 60)
+
+    payloads = bulk_payloads(count)
+    http = HttpClient(pool_size=concurrency)
+
+    def submit_single(payload):
+        try:
+            return 1 if http.post(f"{API_BASE}/submit", json=payload).status_code == 200 else 0
+        except Exception:
+            return 0
+
+    def submit_batch(batch):
+        try:
+            response = http.post(f"{API_BASE}/submit/batch", json=batch, timeout=120)
+            return response.json().get('inserted', 0) if response.status_code == 200 else 0
+        except Exception:
+            return 0
+
+    batches = [payloads[start:start + batch_size] for start in range(0, count, batch_size)]
+    outcomes = []
+    for mode, func, items in (("single /submit", submit_single, payloads), ("batch /submit/batch", submit_batch, batches)):
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            inserted = sum(pool.map(func, items))
+        outcomes.append((mode, len(items), inserted, time.perf_counter() - started))
+    http.close()
+
+    print(f"\n{'Mode':<22} {'Requests':>9} {'Inserted':>9} {'Seconds':>9} {'Rows/s':>9}")
+    for mode, requests_sent, inserted, elapsed in outcomes:
+        print(f"{mode:<22} {requests_sent:>9} {inserted:>9} {elapsed:>9.2f} {inserted / elapsed:>9.1f}")
+
+    (_, _, single_rows, single_time), (_, _, batch_rows, batch_time) = outcomes
+    if single_rows and batch_rows:
+        print(f"\nBatch speedup: {(batch_rows / batch_time) / (single_rows / single_time):.1f}x rows/s")
+
+    if single_rows != count or batch_rows != count:
+        print(f"\n⚠️  Expected {count} rows per mode, got {single_rows} single and {batch_rows} batch")
+        return False
+
+    print("\n✅ Every row was imported in both modes")
+    return True
+
+# Adversarial payload benchmark (--payload-bench): bodies of many one-letter words
+PAYLOAD_BENCH_SIZES = [1024, 10 * 1024, 100 * 1024, 1024 * 1024, 10 * 1024 * 1024, 50 * 1024 * 1024]
+
+def run_payload_benchmark(sizes=PAYLOAD_BENCH_SIZES):
+    """Send adversarial submit bodies from 1KB to 50MB; measure rejection latency and server CPU"""
+    print("🚀 Starting Adversarial Payload Benchmark")
+    print(f"Testing against: {API_BASE}")
+    print(f"Server CPU: {server_label() if SERVER_PID else 'not sampled (pass --server-pid or --local)'}")
+    print("=" * 60)
+
+    all_passed = True
+    print(f"\n{'Endpoint':<14} {'Framing':<8} {'Size':>9} {'Status':>6} {'ms':>9} {'MiB sent':>9} {'CPU ms':>8}")
+    for endpoint in ("/submit", "/submit/batch"):
+        limit = MAX_BATCH_BYTES if endpoint == "/submit/batch" else MAX_SUBMISSION_BYTES
+        for framing in ("length", "chunked"):
+            for size in sizes:
+                pieces, size, words = adversarial_submission(size, batch=endpoint == "/submit/batch")
+                before = process_sample(SERVER_PID)
+                try:
+                    result = stream_post(f"{API_BASE}{endpoint}", pieces, 'application/json',
+                                         size if framing == "length" else None, timeout=DEFAULT_TIMEOUTS['/export'])
+                except Exception as e:
+                    print(f"❌ {endpoint} {framing} {size} bytes failed: {e}")
+                    all_passed = False
+                    continue
+                # Let the server finish with the request before reading its CPU time
+                time.sleep(0.2)
+                after = process_sample(SERVER_PID)
+                cpu = f"{(after['cpu'] - before['cpu']) * 1000:>8.0f}" if before and after else f"{'n/a':>8}"
+                label = f"{size // 1024 // 1024}MB" if size >= 1024 * 1024 else f"{size // 1024}KB"
+                print(f"{endpoint:<14} {framing:<8} {label:>9} {result['status']:>6} {result['time_to_response'] * 1000:>9.1f} "
+                      f"{result['bytes_sent'] / 1024 / 1024:>9.2f} {cpu}")
+
+                # Over the limit: 413 unparsed. Under it: parsed and rejected for its words
+                if size > limit:
+                    expected = 413
+                else:
+                    expected = 200 if endpoint == "/submit/batch" else 400
+                if result['status'] != expected:
+                    print(f"❌ Expected {expected}, got {result['status']}: {result['body'][:200]!r}")
+                    all_passed = False
+                elif expected == 400 and f"Current: {words} words." not in result['body'].decode('utf-8', 'replace'):
+                    print(f"❌ Expected the exact word count {words}: {result['body'][:200]!r}")
+                    all_passed = False
+
+    print("\nℹ️  Rejection latency and CPU should stay flat once bodies pass the limit; CPU is in the server process")
+    if all_passed:
+        print("\n✅ Every adversarial body was rejected as expected")
+    return all_passed
+
+def run_chunked_upload_benchmark(size_mib, parallel_levels=(1, 2, 4, 8), drop_every=4):
+    """Compare single-request streaming uploads with resumable chunked uploads"""
+    print("🚀 Starting Chunked Upload Benchmark")
+    print(f"Testing against: {API_BASE}")
+    print(f"File: {size_mib} MiB, dropped connection on every {drop_every}th chunk when interrupted")
+    print("=" * 60)
+
+    size = int(size_mib * 1024 * 1024)
+    http = HttpClient(pool_size=max(parallel_levels))
+    all_passed = True
+
+    print(f"\n{'Mode':<28} {'Status':>6} {'Seconds':>8} {'MiB/s':>7} {'Sent':>6} {'Resumes':>8}")
+    started = time.perf_counter()
+    # Fresh bytes for every run, so no upload is deduplicated against an earlier one
+    single = stream_multipart_upload(f"{API_BASE}/upload", synthetic_png_chunks(size), fields={'folder': 'banners'})
+    elapsed = time.perf_counter() - started
+    print(f"{'single POST /upload':<28} {single['status']:>6} {elapsed:>8.2f} {size_mib / elapsed:>7.1f} {'1.00x':>6} {'-':>8}")
+
+    for parallel in parallel_levels:
+        for interrupted in (False, True):
+            content = b''.join(synthetic_png_chunks(size))
+            result = chunked_upload(http, content, parallel=parallel, drop_every=drop_every if interrupted else 0)
+            mode = f"chunked x{parallel}" + (" (interrupted)" if interrupted else "")
+            sent = f"{result['bytes_sent'] / len(content):.2f}x"
+            print(f"{mode:<28} {result['status']:>6} {result['elapsed']:>8.2f} {size_mib / result['elapsed']:>7.1f} {sent:>6} {result['resumes']:>8}")
+            if result['status'] != 200:
+                print(f"   ❌ {result['body']}")
+                all_passed = False
+    http.close()
+
+    # Restarting from byte zero after a drop resends everything sent so far
+    print(f"\nWithout resume, each dropped connection would cost up to {size_mib} MiB of resent data")
+    if all_passed:
+        print("✅ Every chunked upload completed")
+    return all_passed
+
+def run_dedupe_benchmark(count, repeats=DEDUPE_REPEATS, concurrency=10):
+    """Upload `count` distinct logos, then re-upload each `repeats` times; compare latency and bytes written"""
+    print("🚀 Starting Upload Dedupe Benchmark")
+    print(f"Testing against: {API_BASE}")
+    print(f"Logos: {count} x {DEDUPE_LOGO_SIZE // 1024} KiB, Repeats: {repeats}, Concurrency: {concurrency}")
+    print("=" * 60)
+
+    logos = [b''.join(synthetic_png_chunks(DEDUPE_LOGO_SIZE)) for _ in range(count)]
+    http = HttpClient(pool_size=concurrency)
+    urls = {}
+
+    def upload(index):
+        files = {'file': (f"team-{index}.png", io.BytesIO(logos[index]), 'image/png')}
+        try:
+            response = http.post(f"{API_BASE}/upload", files=files, data={'folder': 'logos'})
+        except Exception:
+            return None
+        if response.status_code != 200:
+            return None
+        return response.json()['url'], response.timing['total']
+
+    all_passed = True
+    phases = defaultdict(list)
+    bytes_by_phase = {}
+    for phase, indexes in (("first upload", range(count)), ("duplicate", [index for _ in range(repeats) for index in range(count)])):
+        before = upload_metrics(http)
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            for index, outcome in zip(indexes, pool.map(upload, indexes)):
+                if outcome is None:
+                    all_passed = False
+                    continue
+                url, latency = outcome
+                phases[phase].append(latency)
+                if urls.setdefault(index, url) != url:
+                    print(f"❌ Logo {index} came back under a different URL")
+                    all_passed = False
+        after = upload_metrics(http)
+        if before and after:
+            bytes_by_phase[phase] = (after['bytesReceived'] - before['bytesReceived'], after['bytesWritten'] - before['bytesWritten'])
+    http.close()
+
+    print(f"\n{'Phase':<14} {'Uploads':>8} {'p50 ms':>8} {'p95 ms':>8} {'Received MiB':>13} {'Written MiB':>12}")
+    for phase, latencies in phases.items():
+        latencies.sort()
+        received, written = bytes_by_phase.get(phase, (0, 0))
+        print(f"{phase:<14} {len(latencies):>8} {percentile(latencies, 50) * 1000:>8.1f} {percentile(latencies, 95) * 1000:>8.1f} "
+              f"{received / 1024 / 1024:>13.2f} {written / 1024 / 1024:>12.2f}")
+
+    if phases['first upload'] and phases['duplicate']:
+        speedup = percentile(sorted(phases['first upload']), 50) / max(percentile(sorted(phases['duplicate']), 50), 1e-9)
+        print(f"\nDuplicate uploads were {speedup:.1f}x faster at p50")
+    if bytes_by_phase.get('duplicate', (0, 0))[1]:
+        print("❌ Duplicate uploads wrote to storage")
+        all_passed = False
+    if all_passed:
+        print("✅ Every duplicate returned its original URL without a storage write")
+    return all_passed
+
+def seed_gallery_card(http, team_name):
+    """Upload a full-size logo and banner with variants and submit a card using them"""
+    card = {}
+    for kind, size in (('logo', GALLERY_LOGO_SIZE), ('banner', GALLERY_BANNER_SIZE)):
+        response = upload_image(http, b''.join(synthetic_png_chunks(size)), f"{kind}.png", f"{kind}s")
+        if response.status_code != 200:
+            return False
+        uploaded = response.json()
+        card[f"project{kind.title()}Url"] = uploaded['url']
+        card[f"project{kind.title()}Variants"] = uploaded.get('variants')
+    return http.post(f"{API_BASE}/submit", json=dict(VALID_SUBMISSION, teamName=team_name, **card)).status_code == 200
+
+def load_gallery(urls, concurrency):
+    """Fetch every image URL with a cold client; returns (bytes, seconds, failures)"""
+    http = HttpClient(pool_size=concurrency)
+    start = time.perf_counter()
+
+    def fetch(url):
+        try:
+            response = http.get(url, timeout=60)
+        except Exception:
+            return None
+        return len(response.content) if response.status_code == 200 else None
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        sizes = list(pool.map(fetch, urls))
+    elapsed = time.perf_counter() - start
+    http.close()
+    return sum(size for size in sizes if size), elapsed, sizes.count(None)
+
+def run_gallery_benchmark(cards, concurrency=10):
+    """Seed `cards` submissions with full-size images, then load the gallery with and without variants"""
+    print("🚀 Starting Gallery Image Variants Benchmark")
+    print(f"Testing against: {API_BASE}")
+    print(f"Cards: {cards}, logo {GALLERY_LOGO_SIZE // 1024} KiB, banner {GALLERY_BANNER_SIZE // 1024} KiB, Concurrency: {concurrency}")
+    print("=" * 60)
+
+    prefix = f"Gallery {random.getrandbits(32):08x}"
+    http = HttpClient(pool_size=concurrency)
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        seeded = list(pool.map(lambda index: seed_gallery_card(http, f"{prefix} {index:05d}"), range(cards)))
+    print(f"Seeded {seeded.count(True)}/{cards} cards")
+
+    start = time.perf_counter()
+    rows = [row for page in iter_submission_pages(limit=cards, http=http, filters={'teamName': prefix}) for row in page]
+    listing = time.perf_counter() - start
+    http.close()
+    print(f"Listed {len(rows)} cards in {listing * 1000:.0f}ms")
+
+    full_urls = [row[f"project{kind.title()}Url"] for row in rows for kind in GALLERY_CARD_VARIANTS]
+    variant_urls = [(row.get(f"project{kind.title()}Variants") or {}).get(variant)
+                    for row in rows for kind, variant in GALLERY_CARD_VARIANTS.items()]
+    if not rows or None in variant_urls:
+        print("❌ Cards are missing their images or variants")
+        return False
+    if not full_urls[0].startswith(BASE_URL):
+        # Demo storage URLs point at a host that does not exist
+        print(f"❌ Image URLs are not fetchable ({full_urls[0]}); use --local, which serves its storage")
+        return False
+
+    results = {}
+    for label, urls in (("full size", full_urls), ("variants", variant_urls)):
+        results[label] = load_gallery(urls, concurrency)
+
+    print(f"\n{'Images':<10} {'Requests':>9} {'MiB':>8} {'KiB/card':>9} {'Load s':>8} {'Failed':>7}")
+    for label, (total_bytes, elapsed, failures) in results.items():
+        print(f"{label:<10} {len(rows) * 2:>9} {total_bytes / 1024 / 1024:>8.2f} {total_bytes / 1024 / len(rows):>9.1f} {elapsed:>8.2f} {failures:>7}")
+
+    full_bytes, full_time, full_failures = results['full size']
+    variant_bytes, variant_time, variant_failures = results['variants']
+    print(f"\nVariants transferred {full_bytes / max(variant_bytes, 1):.1f}x fewer bytes and loaded {full_time / max(variant_time, 1e-9):.1f}x faster")
+    if LOCAL_SERVER_PROCESS:
+        print("ℹ️  local_server.py simulates variant rendering; byte counts model WebP sizes, not real encodes")
+    return not full_failures and not variant_failures and variant_bytes < full_bytes
+
+def fire_burst(count):
+    """Release `count` submits at the same instant; returns (sorted latencies, seconds, failures)"""
+    http = HttpClient(pool_size=count)
+    barrier = threading.Barrier(count + 1)
+
+    def submit(index):
+        payload = dict(VALID_SUBMISSION, teamName=f"Burst Team {index}", teamLeadEmail=f"burst{index}@example.com")
+        barrier.wait()
+        start = time.perf_counter()
+        try:
+            ok = http.post(f"{API_BASE}/submit", json=payload, timeout=120).status_code == 200
+        except Exception:
+            ok = False
+        return time.perf_counter() - start, ok
+
+    with ThreadPoolExecutor(max_workers=count) as pool:
+        futures = [pool.submit(submit, index) for index in range(count)]
+        barrier.wait()
+        started = time.perf_counter()
+        outcomes = [future.result() for future in futures]
+        elapsed = time.perf_counter() - started
+    http.close()
+    return sorted(latency for latency, _ in outcomes), elapsed, sum(1 for _, ok in outcomes if not ok)
+
+def run_burst_test(count, local_configs=None):
+    """Burst of concurrent /api/submit calls; with --local, compare group commit off and on"""
+    print("🚀 Starting Burst Submit Test")
+    print(f"Burst size: {count}")
+    print("=" * 60)
+
+    targets = [(None, API_BASE)]
+    if local_configs:
+        targets = []
+        for name, extra_args in local_configs:
+            _, base_url = start_local_server(extra_args=extra_args)
+            targets.append((name, f"{base_url}/api"))
+
+    original = BASE_URL
+    rows = []
+    all_passed = True
+    for name, api_base in targets:
+        use_base_url(api_base[:-len('/api')])
+        latencies, elapsed, failures = fire_burst(count)
+        metrics = client.get(f"{API_BASE}/metrics").json().get('submitCoalescer', {})
+        rows.append((name or API_BASE, latencies, elapsed, failures, metrics))
+        all_passed = all_passed and not failures
+    use_base_url(original)
+
+    print(f"\n{'Server':<24} {'req/s':>8} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'flushes':>8} {'mean flush':>11} {'mean wait ms':>13}")
+    for name, latencies, elapsed, failures, metrics in rows:
+        print(
+            f"{name:<24} {count / elapsed:>8.1f} {percentile(latencies, 50) * 1000:>9.1f} "
+            f"{percentile(latencies, 99) * 1000:>9.1f} {latencies[-1] * 1000:>9.1f} "
+            f"{metrics.get('flushes', 0):>8} {metrics.get('meanFlushSize', 0):>11.1f} {metrics.get('meanWaitMs', 0):>13.2f}"
+        )
+        if failures:
+            print(f"⚠️  {failures} submits failed against {name}")
+
+    if local_configs:
+        # Be explicit about what the comparison does and does not exercise
+        print("\nℹ️  Both servers are local_server.py. Their connection limit (--db-connections) exists only in the stand-in,")
+        print("   and its WriteCoalescer is a port, so lib/write-coalescer.js is not exercised here. To measure the")
+        print("   Next.js route, run --burst with --base-url against servers started with SUBMIT_COALESCE_MAX_WAIT_MS=0 and unset.")
+    else:
+        print("\nℹ️  Flush columns come from the server's /api/metrics (lib/write-coalescer.js); they are cumulative since it started")
+
+    if all_passed:
+        print("\n✅ Every burst submit succeeded")
+    return all_passed
+
+# A soak passes when, once the demo store is full, RSS and read latency stay within these
+# factors; the latency slack keeps sub-millisecond jitter from counting as growth
+SOAK_SAMPLES = 10
+SOAK_MAX_RSS_GROWTH = 1.25
+SOAK_MAX_LATENCY_GROWTH = 2.0
+SOAK_LATENCY_SLACK = 0.005
+
+def median_latency(url, repeats=5):
+    """Median seconds for a GET over `repeats` tries; raises if any try fails"""
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        response = client.get(url, timeout=DEFAULT_TIMEOUTS['/export'])
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {url} failed with status {response.status_code}")
+    return statistics.median(latencies)
+
+def run_store_soak(count, batch_size=1000, concurrency=4):
+    """Insert `count` rows via /submit/batch and sample memory and read latency as the demo store fills and evicts"""
+    print("🚀 Starting Demo Store Soak")
+    print(f"Testing against: {API_BASE}")
+    print(f"Rows: {count}, Batch size: {batch_size}, Samples: {SOAK_SAMPLES}")
+    print("=" * 60)
+
+    http = HttpClient(pool_size=concurrency)
+    step = max(batch_size, count // SOAK_SAMPLES)
+    payloads = bulk_payloads(batch_size)
+    samples = []
+    inserted = 0
+
+    def submit_batch(size):
+        response = http.post(f"{API_BASE}/submit/batch", json=payloads[:size], timeout=120)
+        return response.json().get('inserted', 0) if response.status_code == 200 else 0
+
+    print(f"\n{'Rows sent':>10} {'Stored':>8} {'Evicted':>9} {'RSS MiB':>9} {'array ms':>9} {'page ms':>9}")
+    while inserted < count:
+        target = min(count, inserted + step)
+        sizes = [min(batch_size, target - start) for start in range(inserted, target, batch_size)]
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            inserted += sum(pool.map(submit_batch, sizes))
+        if inserted < target:
+            print(f"❌ Only {inserted} of {target} rows were inserted")
+            http.close()
+            return False
+
+        store = client.get(f"{API_BASE}/metrics").json().get('demoStore', {})
+        memory = server_memory(SERVER_PID)
+        array_latency = median_latency(f"{API_BASE}/submissions")
+        page_latency = median_latency(f"{API_BASE}/submissions?limit={SUBMISSIONS_PAGE_SIZE}")
+        samples.append((inserted, store, memory, array_latency, page_latency))
+        rss = f"{memory['rss'] / 1024 / 1024:>9.1f}" if memory else f"{'n/a':>9}"
+        print(
+            f"{inserted:>10} {store.get('size', 0):>8} {store.get('evicted', 0):>9} {rss} "
+            f"{array_latency * 1000:>9.1f} {page_latency * 1000:>9.1f}"
+        )
+    http.close()
+
+    all_passed = True
+    capacity = samples[-1][1].get('capacity')
+    if capacity is None or samples[-1][1].get('size', 0) > capacity:
+        print(f"\n❌ Demo store is unbounded or over capacity: {samples[-1][1]}")
+        return False
+
+    # Compare the first sample taken with the store full against the last one
+    full = [sample for sample in samples if sample[1].get('evicted', 0) > 0]
+    if len(full) < 2:
+        print(f"\n⚠️  The store never filled past its {capacity}-row capacity; send more rows to check for flat growth")
+        return True
+
+    (_, _, first_memory, first_array, first_page), (_, _, last_memory, last_array, last_page) = full[0], full[-1]
+    if first_memory and last_memory:
+        growth = last_memory['rss'] / first_memory['rss']
+        print(f"\nRSS once full: {first_memory['rss'] / 1024 / 1024:.1f} -> {last_memory['rss'] / 1024 / 1024:.1f} MiB ({growth:.2f}x)")
+        if growth > SOAK_MAX_RSS_GROWTH:
+            print(f"❌ Server memory kept growing after the store filled ({growth:.2f}x > {SOAK_MAX_RSS_GROWTH}x)")
+            all_passed = False
+    for name, first, last in (("array /submissions", first_array, last_array), ("first page", first_page, last_page)):
+        growth = last / first if first else 0.0
+        print(f"{name} latency once full: {first * 1000:.1f} -> {last * 1000:.1f} ms ({growth:.2f}x)")
+        if last > first * SOAK_MAX_LATENCY_GROWTH + SOAK_LATENCY_SLACK:
+            print(f"❌ {name} latency kept growing after the store filled ({growth:.2f}x > {SOAK_MAX_LATENCY_GROWTH}x)")
+            all_passed = False
+
+    if all_passed:
+        print(f"\n✅ Memory and read latency stayed flat with the store capped at {capacity} rows")
+    return all_passed
+
+# Soak mode (--soak SECONDS): mixed traffic against one server while its process is
+# sampled every --soak-interval seconds. After the warm-up samples, a resource is
+# flagged when it keeps rising (Kendall tau >= SOAK_TREND_TAU) by more than its
+# tolerance; latency and event-loop delay are flagged when the last third of the
+# run is more than SOAK_DRIFT_FACTOR times the first.
+SOAK_INTERVAL = 5.0
+SOAK_WARMUP_FRACTION = 0.2
+SOAK_TREND_TAU = 0.7
+SOAK_RSS_TOLERANCE = 0.10
+SOAK_FD_TOLERANCE = 8
+SOAK_TMP_FILE_TOLERANCE = 2
+SOAK_DRIFT_FACTOR = 1.5
+SOAK_UPLOAD_SIZE = 8 * 1024
+# Demo store capacity of a --local soak server, so the store is full early in the run
+SOAK_STORE_CAPACITY = 1000
+DEFAULT_UPLOAD_TMP_DIR = os.getenv('UPLOAD_TMP_DIR') or os.path.join(tempfile.gettempdir(), 'hackathon-uploads')
+
+def process_sample(pid):
+    """RSS bytes, CPU seconds and open file descriptors of a process on this machine (Linux /proc only)"""
+    if pid is None:
+        return None
+    try:
+        with open(f"/proc/{pid}/stat") as stat:
+            # Fields after the parenthesised command name; utime and stime are the 14th and 15th
+            fields = stat.read().rsplit(')', 1)[1].split()
+        fds = len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        return None
+    memory = server_memory(pid)
+    return {
+        'rss': memory['rss'] if memory else None,
+        'cpu': (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK'),
+        'fds': fds,
+    }
+
+def count_temp_files(directory):
+    try:
+        return len(os.listdir(directory))
+    except OSError:
+        return 0
+
+def kendall_tau(values):
+    """Rank correlation of a series with time: 1 when it only ever rises, 0 when flat or unordered"""
+    concordant = discordant = 0
+    for i, earlier in enumerate(values):
+        for later in values[i + 1:]:
+            if later > earlier:
+                concordant += 1
+            elif later < earlier:
+                discordant += 1
+    pairs = len(values) * (len(values) - 1) / 2
+    return (concordant - discordant) / pairs if pairs else 0.0
+
+def soak_requests():
+    """(endpoint, send(http, index), expected status) in the order workers cycle through them"""
+    def submit(http, index):
+        return http.post(f"{API_BASE}/submit", json=dict(VALID_SUBMISSION, teamName=f"Soak Team {index}", teamLeadEmail=f"soak{index}@example.com"))
+
+    def invalid_submit(http, index):
+        return http.post(f"{API_BASE}/submit", json=MISSING_FIELD_CASES[index % len(MISSING_FIELD_CASES)]['data'])
+
+    def first_page(http, index):
+        return http.get(f"{API_BASE}/submissions?limit={SUBMISSIONS_PAGE_SIZE}")
+
+    def health(http, index):
+        return http.get(f"{API_BASE}/health")
+
+    def upload(http, index):
+        content = b''.join(synthetic_png_chunks(SOAK_UPLOAD_SIZE))
+        return http.post(f"{API_BASE}/upload", files={'file': (f"soak-{index}.png", io.BytesIO(content), 'image/png')}, data={'folder': 'logos'})
+
+    return [
+        ('/submit', submit, 200),
+        ('/submissions', first_page, 200),
+        ('/health', health, 200),
+        ('/submit 400', invalid_submit, 400),
+        ('/submissions', first_page, 200),
+        ('/upload', upload, 200),
+    ]
+
+def soak_worker(http, worker_id, requests, deadline, samples, lock):
+    """Closed-loop worker; appends (finished_at, endpoint, latency, ok) as each request completes"""
+    index = worker_id
+    while time.perf_counter() < deadline:
+        endpoint, send, expected = requests[index % len(requests)]
+        index += 1
+        start = time.perf_counter()
+        try:
+            ok = send(http, index).status_code == expected
+        except Exception:
+            ok = False
+        finished = time.perf_counter()
+        with lock:
+            samples.append((finished, endpoint, finished - start, ok))
+
+def third_medians(rows, key):
+    """Median of `key` over the first and last thirds of rows (None values skipped)"""
+    third = max(1, len(rows) // 3)
+    first = [row[key] for row in rows[:third] if row[key] is not None]
+    last = [row[key] for row in rows[-third:] if row[key] is not None]
+    return (statistics.median(first) if first else None), (statistics.median(last) if last else None)
+
+def run_soak_test(duration, concurrency=10, interval=SOAK_INTERVAL, upload_tmp_dir=DEFAULT_UPLOAD_TMP_DIR, output=None):
+    """Run mixed traffic for `duration` seconds, sampling the server process, and flag leaks and drift"""
+    print("🚀 Starting Soak Test")
+    print(f"Testing against: {API_BASE}")
+    print(f"Duration: {duration:.0f}s, Concurrency: {concurrency}, Sample interval: {interval:.0f}s")
+    print(f"Sampling: {server_label() if SERVER_PID else 'no server process (pass --server-pid or --local)'}")
+    print(f"Temp files in: {upload_tmp_dir}")
+    print("=" * 60)
+
+    requests = soak_requests()
+    http = HttpClient(pool_size=concurrency)
+    samples = []
+    lock = threading.Lock()
+    rows = []
+    tmp_files_before = count_temp_files(upload_tmp_dir)
+    started = time.perf_counter()
+    deadline = started + duration
+    previous = process_sample(SERVER_PID)
+    previous_at = started
+    taken = 0
+
+    print(f"\n{'t s':>6} {'req/s':>7} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'RSS MiB':>8} {'CPU %':>6} "
+          f"{'fds':>5} {'tmp':>5} {'lag p99':>8} {'lag max':>8} {'rows':>6}")
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        workers = [pool.submit(soak_worker, http, worker_id, requests, deadline, samples, lock) for worker_id in range(concurrency)]
+        while time.perf_counter() < deadline:
+            time.sleep(max(0.0, min(interval, deadline - time.perf_counter())))
+            now = time.perf_counter()
+            with lock:
+                window, taken = samples[taken:], len(samples)
+            latencies = sorted(latency for _, _, latency, _ in window)
+            current = process_sample(SERVER_PID)
+            try:
+                metrics = client.get(f"{API_BASE}/metrics").json()
+            except Exception:
+                metrics = {}
+            loop = metrics.get('eventLoop', {})
+            store = metrics.get('demoStore', {})
+            cpu = (current['cpu'] - previous['cpu']) / (now - previous_at) if current and previous else None
+            row = {
+                'elapsed': now - started,
+                'requests': len(window),
+                'throughput': len(window) / (now - previous_at),
+                'errors': sum(1 for *_, ok in window if not ok),
+                'p50_ms': percentile(latencies, 50) * 1000 if latencies else None,
+                'p95_ms': percentile(latencies, 95) * 1000 if latencies else None,
+                'rss': current['rss'] if current else None,
+                'cpu_percent': cpu * 100 if cpu is not None else None,
+                'fds': current['fds'] if current else None,
+                'tmp_files': count_temp_files(upload_tmp_dir),
+                'loop_p99_ms': loop.get('p99Ms'),
+                'loop_max_ms': loop.get('maxMs'),
+                'store_rows': store.get('size'),
+                'store_full': bool(store.get('capacity')) and store.get('size', 0) >= store['capacity'],
+                'window': window,
+            }
+            rows.append(row)
+            previous, previous_at = current, now
+
+            def cell(value, width, fmt):
+                return f"{value:>{width}{fmt}}" if value is not None else f"{'n/a':>{width}}"
+            print(
+                f"{row['elapsed']:>6.0f} {row['throughput']:>7.1f} {row['errors']:>6} {cell(row['p50_ms'], 8, '.1f')} {cell(row['p95_ms'], 8, '.1f')} "
+                f"{cell(row['rss'] / 1024 / 1024 if row['rss'] else None, 8, '.1f')} {cell(row['cpu_percent'], 6, '.0f')} "
+                f"{cell(row['fds'], 5, '')} {row['tmp_files']:>5} {cell(row['loop_p99_ms'], 8, '.1f')} {cell(row['loop_max_ms'], 8, '.1f')} "
+                f"{cell(row['store_rows'], 6, '')}"
+            )
+        for worker in workers:
+            worker.result()
+    http.close()
+    # Give requests that were cut off a moment to clean up their temp files
+    time.sleep(1.0)
+    tmp_files_after = count_temp_files(upload_tmp_dir)
+
+    if output:
+        columns = [key for key in rows[0] if key != 'window'] if rows else []
+        with open(output, 'w', newline='') as report:
+            writer = csv.DictWriter(report, fieldnames=columns, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"\nTime series written to {output}")
+
+    all_passed = True
+    errors = sum(row['errors'] for row in rows)
+    if errors:
+        print(f"\n❌ {errors} soak requests failed or returned an unexpected status")
+        all_passed = False
+
+    steady = rows[int(len(rows) * SOAK_WARMUP_FRACTION):]
+    if len(steady) < 3:
+        print("\n⚠️  Too few samples after warm-up to judge trends; soak longer or sample more often")
+        return all_passed
+
+    print("\nTrends after warm-up:")
+    full = [row for row in steady if row['store_full']]
+    rss_rows = full if len(full) >= 3 else steady
+    for name, key, values, tolerance in (
+        ("RSS", 'rss', [row['rss'] for row in rss_rows], lambda first: first * SOAK_RSS_TOLERANCE),
+        ("open fds", 'fds', [row['fds'] for row in steady], lambda first: SOAK_FD_TOLERANCE),
+        ("temp files", 'tmp_files', [row['tmp_files'] for row in steady], lambda first: SOAK_TMP_FILE_TOLERANCE),
+    ):
+        if any(value is None for value in values):
+            print(f"  {name}: not sampled")
+            continue
+        tau = kendall_tau(values)
+        growth = values[-1] - values[0]
+        shown = (lambda value: f"{value / 1024 / 1024:.1f} MiB") if key == 'rss' else str
+        print(f"  {name}: {shown(values[0])} -> {shown(values[-1])} (trend {tau:+.2f})")
+        if tau >= SOAK_TREND_TAU and growth > tolerance(values[0]):
+            if key == 'rss' and rss_rows is not full:
+                print(f"⚠️  RSS kept growing, but the demo store was still filling ({steady[-1]['store_rows']} rows); soak longer to tell a leak from the bounded store")
+            else:
+                print(f"❌ {name} grew monotonically through the soak")
+                all_passed = False
+    if tmp_files_after > tmp_files_before + SOAK_TMP_FILE_TOLERANCE:
+        print(f"❌ {tmp_files_after - tmp_files_before} temp files were left behind in {upload_tmp_dir}")
+        all_passed = False
+
+    third = max(1, len(steady) // 3)
+    for endpoint in sorted({endpoint for _, endpoint, _, _ in samples}):
+        first = [latency for row in steady[:third] for _, name, latency, ok in row['window'] if name == endpoint and ok]
+        last = [latency for row in steady[-third:] for _, name, latency, ok in row['window'] if name == endpoint and ok]
+        if not first or not last:
+            continue
+        first_ms, last_ms = statistics.median(first) * 1000, statistics.median(last) * 1000
+        print(f"  {endpoint} p50 latency: {first_ms:.1f} -> {last_ms:.1f} ms")
+        if last_ms > first_ms * SOAK_DRIFT_FACTOR + SOAK_LATENCY_SLACK * 1000:
+            print(f"❌ {endpoint} latency drifted up by {last_ms / first_ms:.2f}x")
+            all_passed = False
+    first_lag, last_lag = third_medians(steady, 'loop_p99_ms')
+    if first_lag is not None and last_lag is not None:
+        print(f"  event-loop delay p99: {first_lag:.1f} -> {last_lag:.1f} ms")
+        if last_lag > first_lag * SOAK_DRIFT_FACTOR + SOAK_LATENCY_SLACK * 1000:
+            print(f"❌ Event-loop delay drifted up by {last_lag / max(first_lag, 1e-9):.2f}x")
+            all_passed = False
+
+    if all_passed:
+        print("\n✅ No monotonic resource growth or latency drift during the soak")
+    return all_passed
+
+# Rows per seeding request and page size for filtered queries, as MAX_BATCH_SIZE / MAX_PAGE_SIZE in lib/supabase.js
+MAX_QUERY_BENCH_BATCH = 1000
+MAX_QUERY_PAGE_SIZE = 500
+QUERY_TITLE_WORDS = ['solar', 'health', 'river', 'vision', 'quantum', 'ledger', 'garden', 'transit']
+QUERY_BENCH_EMAILS = 500
+
+def query_payloads(start, count):
+    """Submissions with spread-out emails, team names and title words for the query benchmark"""
+    words = QUERY_TITLE_WORDS
+    return [
+        dict(
+            VALID_SUBMISSION,
+            teamName=f"Query Team {index}",
+            teamLeadEmail=f"query{index % QUERY_BENCH_EMAILS}@example.com",
+            projectTitle=f"{words[index % len(words)]} {words[index // len(words) % len(words)]} tracker",
+        )
+        for index in range(start, start + count)
+    ]
+
+def title_terms(text):
+    """Word tokens as tokenizeTitle in lib/validation.js produces them"""
+    return re.findall(r'[^\W_]+', text.lower()) if isinstance(text, str) else []
+
+def matches_query(row, query):
+    """Client-side equivalent of the /api/submissions filters, for the full-download baseline"""
+    if 'email' in query and row.get('teamLeadEmail') != query['email']:
+        return False
+    if 'teamName' in query and not str(row.get('teamName', '')).startswith(query['teamName']):
+        return False
+    if 'title' in query and not set(title_terms(query['title'])) <= set(title_terms(row.get('projectTitle'))):
+        return False
+    return query.get('from', '') <= row['createdAt'] and ('to' not in query or row['createdAt'] < query['to'])
+
+def run_query_benchmark(sizes, fresh_servers=False, repeats=5):
+    """Compare filtered /api/submissions queries with downloading everything and filtering client-side"""
+    print("🚀 Starting Query Benchmark")
+    print(f"Dataset sizes: {', '.join(str(size) for size in sizes)}")
+    print("=" * 60)
+
+    original = BASE_URL
+    seeded = 0
+    all_passed = True
+    print(f"\n{'Rows':>8} {'Filter':<18} {'Matches':>8} {'Filtered ms':>12} {'Full+filter ms':>15} {'Speedup':>8}")
+    for size in sizes:
+        if fresh_servers:
+            # A fresh server per size, sized so nothing is evicted and seeding costs no simulated delay
+            _, base_url = start_local_server(submit_delay=0, extra_args=['--demo-store-capacity', str(size)])
+            use_base_url(base_url)
+            seeded = 0
+
+        created_at = []
+        for start in range(seeded, size, MAX_QUERY_BENCH_BATCH):
+            batch = query_payloads(start, min(MAX_QUERY_BENCH_BATCH, size - start))
+            response = client.post(f"{API_BASE}/submit/batch", json=batch, timeout=120)
+            if response.status_code != 200:
+                print(f"❌ Seeding failed with status {response.status_code}: {response.text[:200]}")
+                use_base_url(original)
+                return False
+            created_at += [result['data']['createdAt'] for result in response.json()['results']]
+        seeded = size
+
+        # The middle tenth of the rows seeded for this size, by creation time
+        window = created_at[len(created_at) * 9 // 20:len(created_at) * 11 // 20] or created_at[-1:]
+        queries = [
+            ("email", {'email': f"query{QUERY_BENCH_EMAILS // 2}@example.com"}),
+            ("team name prefix", {'teamName': "Query Team 12"}),
+            ("title words", {'title': f"{QUERY_TITLE_WORDS[1]} {QUERY_TITLE_WORDS[2]}"}),
+            ("created_at range", {'from': window[0], 'to': window[-1]}),
+        ]
+
+        for name, query in queries:
+            filtered_times, full_times = [], []
+            for _ in range(repeats):
+                started = time.perf_counter()
+                filtered = [row['id'] for page in iter_submission_pages(MAX_QUERY_PAGE_SIZE, filters=query) for row in page]
+                filtered_times.append(time.perf_counter() - started)
+
+                started = time.perf_counter()
+                response = client.get(f"{API_BASE}/submissions", timeout=DEFAULT_TIMEOUTS['/export'])
+                rows = sorted((row for row in response.json() if matches_query(row, query)),
+                              key=lambda row: (row['createdAt'], row['id']), reverse=True)
+                full_times.append(time.perf_counter() - started)
+
+            filtered_ms = statistics.median(filtered_times) * 1000
+            full_ms = statistics.median(full_times) * 1000
+            print(f"{size:>8} {name:<18} {len(filtered):>8} {filtered_ms:>12.1f} {full_ms:>15.1f} {full_ms / filtered_ms:>7.1f}x")
+            if filtered != [row['id'] for row in rows]:
+                print(f"❌ {name} filter disagrees with client-side filtering ({len(filtered)} vs {len(rows)} rows)")
+                all_passed = False
+    use_base_url(original)
+
+    if all_passed:
+        print("\n✅ Every filtered query matched client-side filtering of the full download")
+    return all_passed
+
+# Benchmark suite (--bench): fixed scenarios whose results are written as JSON and
+# compared with a saved baseline. A metric regresses when it is worse than the
+# baseline by more than its threshold and a one-sided Mann-Whitney U test finds
+# the difference significant, so noise alone does not fail a run.
+#
+# No baseline is committed: timings only compare on the machine that recorded
+# them. CI records one on its own runner from the main branch
+# (`--local --bench --save-baseline`), keeps benchmark-baseline.json as a cached
+# artifact, and restores it before gating later runs with `--local --bench`.
+# Gating without a usable baseline fails rather than passing unchecked.
+BENCH_SCHEMA_VERSION = 1
+# Both at the repo root, wherever the harness is run from
+BENCH_RESULTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark-results.json')
+BENCH_BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark-baseline.json')
+BENCH_WARMUP = 2
+BENCH_SUBMIT_REPEATS = 20
+BENCH_BURST_SIZE = 50
+BENCH_BURST_ROUNDS = 5
+BENCH_LIST_ROWS = 1000
+BENCH_LIST_PAGE_SIZES = (10, 100, 500)
+BENCH_LIST_REPEATS = 20
+BENCH_SMALL_UPLOAD_SIZE = 16 * 1024
+BENCH_SMALL_UPLOAD_REPEATS = 10
+BENCH_LARGE_UPLOAD_SIZE = LARGE_UPLOAD_SIZE
+BENCH_LARGE_UPLOAD_REPEATS = 5
+BENCH_LATENCY_THRESHOLD = 0.20
+BENCH_THROUGHPUT_THRESHOLD = 0.20
+# Medians closer than this (ms) never count as a latency regression
+BENCH_LATENCY_SLACK_MS = 2.0
+BENCH_SIGNIFICANCE = 0.01
+# Environment fields that must match for a baseline comparison to mean much
+BENCH_COMPARABLE_ENVIRONMENT = ('server', 'python', 'platform', 'machine', 'cpu_count', 'submit_delay', 'upload_delay')
+
+def mann_whitney_greater(sample, reference):
+    """One-sided p-value that `sample` tends to be larger than `reference`.
+
+    Mann-Whitney U with the normal approximation, tie and continuity corrections.
+    """
+    n1, n2 = len(sample), len(reference)
+    if not n1 or not n2:
+        return 1.0
+    combined = sorted([(value, 0) for value in sample] + [(value, 1) for value in reference])
+    sample_rank_sum = 0.0
+    tie_term = 0
+    start = 0
+    while start < len(combined):
+        end = start
+        while end + 1 < len(combined) and combined[end + 1][0] == combined[start][0]:
+            end += 1
+        ties = end - start + 1
+        tie_term += ties ** 3 - ties
+        average_rank = (start + end) / 2 + 1
+        sample_rank_sum += average_rank * sum(1 for _, group in combined[start:end + 1] if group == 0)
+        start = end + 1
+
+    n = n1 + n2
+    u = sample_rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+def bench_metric(samples, unit):
+    """Samples plus the summary statistics stored for one metric"""
+    ordered = sorted(samples)
+    return {
+        'unit': unit,
+        'n': len(ordered),
+        'median': statistics.median(ordered) if ordered else None,
+        'p95': percentile(ordered, 95) if ordered else None,
+        'mean': statistics.fmean(ordered) if ordered else None,
+        'stdev': statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        'samples': [round(value, 3) for value in samples],
+    }
+
+def bench_environment(args):
+    """Where the results came from, so baselines are only compared like with like"""
+    def git(*command):
+        try:
+            return subprocess.run(['git', *command], capture_output=True, text=True, timeout=10,
+                                  cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    return {
+        'timestamp': datetime.now().astimezone().isoformat(timespec='seconds'),
+        'base_url': BASE_URL,
+        'server': 'local_server.py' if LOCAL_SERVER_PROCESS else BASE_URL,
+        'submit_delay': args.local_submit_delay if LOCAL_SERVER_PROCESS else None,
+        'upload_delay': args.local_upload_delay if LOCAL_SERVER_PROCESS else None,
+        'git_commit': git('rev-parse', 'HEAD'),
+        'git_dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'hostname': socket.gethostname(),
+    }
+
+def bench_requests(send, repeats):
+    """Latencies in ms of `repeats` calls to send() after BENCH_WARMUP unrecorded ones; send() returns a response"""
+    latencies, failures = [], 0
+    for index in range(BENCH_WARMUP + repeats):
+        try:
+            response = send(index)
+            ok = response.status_code == 200
+        except Exception:
+            ok = False
+        if index < BENCH_WARMUP:
+            continue
+        if ok:
+            latencies.append(response.timing['total'] * 1000)
+        else:
+            failures += 1
+    return latencies, failures
+
+def bench_submit_single(http):
+    def send(index):
+        payload = dict(VALID_SUBMISSION, teamName=f"Bench Team {index}", teamLeadEmail=f"bench{index}@example.com")
+        return http.post(f"{API_BASE}/submit", json=payload)
+
+    latencies, failures = bench_requests(send, BENCH_SUBMIT_REPEATS)
+    return {'latency': bench_metric(latencies, 'ms')}, failures
+
+def bench_submit_burst(http):
+    latencies, throughputs, failures = [], [], 0
+    for _ in range(BENCH_BURST_ROUNDS):
+        round_latencies, elapsed, round_failures = fire_burst(BENCH_BURST_SIZE)
+        latencies.extend(latency * 1000 for latency in round_latencies)
+        throughputs.append(BENCH_BURST_SIZE / elapsed)
+        failures += round_failures
+    return {'latency': bench_metric(latencies, 'ms'), 'throughput': bench_metric(throughputs, 'req/s')}, failures
+
+def bench_list_page(page_size):
+    def run(http):
+        # A distinct (always matching) from= per request misses the response cache, so every read reaches the store
+        def send(index):
+            since = f"2000-01-01T00:{index // 60 % 60:02d}:{index % 60:02d}.{page_size % 1000:03d}Z"
+            return http.get(f"{API_BASE}/submissions?{urllib.parse.urlencode({'limit': page_size, 'from': since})}")
+
+        latencies, failures = bench_requests(send, BENCH_LIST_REPEATS)
+        return {'latency': bench_metric(latencies, 'ms')}, failures
+    return run
+
+def bench_upload_small(http):
+    def send(index):
+        content = b''.join(synthetic_png_chunks(BENCH_SMALL_UPLOAD_SIZE))
+        return http.post(f"{API_BASE}/upload", files={'file': (f"bench-{index}.png", io.BytesIO(content), 'image/png')}, data={'folder': 'logos'})
+
+    latencies, failures = bench_requests(send, BENCH_SMALL_UPLOAD_REPEATS)
+    return {'latency': bench_metric(latencies, 'ms')}, failures
+
+def bench_upload_large(http):
+    latencies, throughputs, failures = [], [], 0
+    for index in range(BENCH_WARMUP + BENCH_LARGE_UPLOAD_REPEATS):
+        try:
+            result = stream_multipart_upload(f"{API_BASE}/upload?folder=banners", synthetic_png_chunks(BENCH_LARGE_UPLOAD_SIZE),
+                                             timeout=DEFAULT_TIMEOUTS['/upload'])
+            ok = result['status'] == 200
+        except Exception:
+            ok = False
+        if index < BENCH_WARMUP:
+            continue
+        if not ok:
+            failures += 1
+            continue
+        latencies.append(result['time_to_response'] * 1000)
+        throughputs.append(BENCH_LARGE_UPLOAD_SIZE / 1024 / 1024 / result['time_to_response'])
+    return {'latency': bench_metric(latencies, 'ms'), 'throughput': bench_metric(throughputs, 'MiB/s')}, failures
+
+def bench_scenarios():
+    """(name, run) pairs in the order they run; run(http) returns (metrics, failures)"""
+    return [
+        ('submit_single', bench_submit_single),
+        ('submit_burst', bench_submit_burst),
+        *((f"list_page_{page_size}", bench_list_page(page_size)) for page_size in BENCH_LIST_PAGE_SIZES),
+        ('upload_small', bench_upload_small),
+        ('upload_large', bench_upload_large),
+    ]
+
+def compare_metric(name, current, baseline):
+    """Verdict for one metric against its baseline: (regressed, change, p_value)"""
+    if not current['samples'] or not baseline or not baseline.get('samples'):
+        return False, None, None
+    higher_is_worse = current['unit'] == 'ms'
+    change = current['median'] / baseline['median'] - 1 if baseline['median'] else 0.0
+    if higher_is_worse:
+        p_value = mann_whitney_greater(current['samples'], baseline['samples'])
+        material = change > BENCH_LATENCY_THRESHOLD and current['median'] - baseline['median'] > BENCH_LATENCY_SLACK_MS
+    else:
+        p_value = mann_whitney_greater(baseline['samples'], current['samples'])
+        material = -change > BENCH_THROUGHPUT_THRESHOLD
+    return material and p_value < BENCH_SIGNIFICANCE, change, p_value
+
+def run_benchmark_suite(args):
+    """Run the fixed benchmark scenarios, save JSON results, and gate on the baseline"""
+    print("🚀 Starting Benchmark Suite")
+    print(f"Testing against: {API_BASE}")
+    print("=" * 60)
+
+    environment = bench_environment(args)
+    http = HttpClient(pool_size=4)
+    results = {}
+    failures = 0
+
+    seeded = 0
+    for name, run in bench_scenarios():
+        if name.startswith('list_page_') and not seeded:
+            # Listing is measured over a store of at least BENCH_LIST_ROWS rows
+            payloads = bulk_payloads(BENCH_LIST_ROWS)
+            for start in range(0, len(payloads), MAX_QUERY_BENCH_BATCH):
+                response = http.post(f"{API_BASE}/submit/batch", json=payloads[start:start + MAX_QUERY_BENCH_BATCH], timeout=DEFAULT_TIMEOUTS['/export'])
+                seeded += response.json().get('inserted', 0) if response.status_code == 200 else 0
+            print(f"Seeded {seeded} submissions for the listing scenarios")
+        print(f"Running {name}...")
+        metrics, scenario_failures = run(http)
+        results[name] = {'failures': scenario_failures, **metrics}
+        failures += scenario_failures
+    http.close()
+
+    document = {'schema': BENCH_SCHEMA_VERSION, 'environment': environment, 'scenarios': results}
+    with open(args.bench_output, 'w') as output:
+        json.dump(document, output, indent=2)
+    print(f"\nResults written to {args.bench_output}")
+
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as stored:
+            baseline = json.load(stored)
+        if baseline.get('schema') != BENCH_SCHEMA_VERSION:
+            print(f"❌ Baseline {args.baseline} has schema {baseline.get('schema')}, expected {BENCH_SCHEMA_VERSION}; not comparing")
+            baseline = None
+    elif not args.save_baseline:
+        print(f"❌ No baseline at {args.baseline}; run with --save-baseline to record one")
+
+    if baseline:
+        differing = [key for key in BENCH_COMPARABLE_ENVIRONMENT if baseline['environment'].get(key) != environment.get(key)]
+        if differing:
+            print(f"⚠️  Baseline environment differs in: {', '.join(differing)}")
+
+    regressions = []
+    print(f"\n{'Scenario':<16} {'Metric':<17} {'n':>4} {'median':>10} {'p95':>10} {'baseline':>10} {'change':>8} {'p':>8}")
+    for name, scenario in results.items():
+        for metric_name in ('latency', 'throughput'):
+            metric = scenario.get(metric_name)
+            if not metric:
+                continue
+            reference = (baseline or {}).get('scenarios', {}).get(name, {}).get(metric_name)
+            regressed, change, p_value = compare_metric(metric_name, metric, reference)
+            label = f"{metric_name} {metric['unit']}"
+            if metric['samples']:
+                print(
+                    f"{name:<16} {label:<17} {metric['n']:>4} {metric['median']:>10.1f} {metric['p95']:>10.1f} "
+                    + (f"{reference['median']:>10.1f} {change:>+8.0%} {p_value:>8.4f}" if change is not None else f"{'-':>10} {'-':>8} {'-':>8}")
+                    + ("  ❌ regression" if regressed else "")
+                )
+            if regressed:
+                regressions.append(f"{name} {metric_name}")
+
+    all_passed = True
+    if failures:
+        print(f"\n❌ {failures} benchmark requests failed")
+        all_passed = False
+    if args.save_baseline:
+        with open(args.baseline, 'w') as stored:
+            json.dump(document, stored, indent=2)
+        print(f"\n💾 Saved as the baseline in {args.baseline}")
+    elif not baseline:
+        print("\n❌ No usable baseline to gate on")
+        all_passed = False
+    elif regressions:
+        print(f"\n❌ Regressions against the baseline: {', '.join(regressions)}")
+        all_passed = False
+    else:
+        print("\n✅ No latency or throughput regression against the baseline")
+    return all_passed
+
+def start_local_server(submit_delay=None, upload_delay=None, extra_args=()):
+    """Launch local_server.py on a free port and return (process, base URL)"""
+    # Keep uploaded objects so their URLs (and image variants) can be fetched
+    storage_dir = tempfile.mkdtemp(prefix='hackathon-storage-')
+    atexit.register(shutil.rmtree, storage_dir, ignore_errors=True)
+    # Its own temp directory, so the soak test can count the files it leaves behind
+    upload_tmp_dir = tempfile.mkdtemp(prefix='hackathon-uploads-')
+    atexit.register(shutil.rmtree, upload_tmp_dir, ignore_errors=True)
+    command = [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'local_server.py'), '--port', '0', '--storage-dir', storage_dir]
+    command += list(extra_args)
+    if submit_delay is not None:
+        command += ['--submit-delay', str(submit_delay)]
+    if upload_delay is not None:
+        command += ['--upload-delay', str(upload_delay)]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True, env=dict(os.environ, UPLOAD_TMP_DIR=upload_tmp_dir))
+    process.upload_tmp_dir = upload_tmp_dir
+    line = process.stdout.readline().strip()
+    if not line.startswith('Listening on '):
+        process.kill()
+        raise RuntimeError(f"Local server failed to start: {line!r}")
+    atexit.register(process.terminate)
+    return process, line[len('Listening on '):]
+
+def use_base_url(base_url):
+    """Point every test and load mode at a different server"""
+    global BASE_URL, API_BASE
+    BASE_URL = base_url.rstrip('/')
+    API_BASE = f"{BASE_URL}/api"
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Backend API testing for the hackathon submission app")
+    parser.add_argument('--base-url', help="server to test (defaults to NEXT_PUBLIC_BASE_URL)")
+    parser.add_argument('--local', action='store_true', help="start local_server.py and test against it offline")
+    parser.add_argument('--local-submit-delay', type=float, help="demo submit delay for the local server, in seconds")
+    parser.add_argument('--local-upload-delay', type=float, help="demo upload delay for the local server, in seconds")
+    parser.add_argument('--server-pid', type=int, help="PID of the server under test (e.g. `next start`) to sample its memory; --local uses the stand-in")
+    parser.add_argument('--sequential', action='store_true', help="run the functional test groups one after another")
+    parser.add_argument('--page-size', type=int, default=SUBMISSIONS_PAGE_SIZE, help="page size used when walking /api/submissions")
+    parser.add_argument('--export', action='store_true', help="benchmark the streaming exports against the array endpoint")
+    parser.add_argument('--seed', type=int, default=0, help="submissions to create before a benchmark")
+    parser.add_argument('--bulk-import', type=int, metavar='ROWS', help="compare single and batch submits for this many rows")
+    parser.add_argument('--batch-size', type=int, default=100, help="rows per /submit/batch request")
+    parser.add_argument('--poll', action='store_true', help="simulate dashboards polling with conditional GETs (--concurrency dashboards for --duration)")
+    parser.add_argument('--poll-interval', type=float, default=2.0, help="seconds between polls per dashboard")
+    parser.add_argument('--write-interval', type=float, default=5.0, help="seconds between submits during the polling test")
+    parser.add_argument('--query-bench', type=lambda value: [int(size) for size in value.split(',')], metavar='ROWS[,ROWS...]',
+                        help="benchmark filtered queries against full download + filter at each dataset size, e.g. 10000,100000")
+    parser.add_argument('--store-soak', type=int, metavar='ROWS', help="insert ROWS via /submit/batch and check demo store memory and latency stay flat")
+    parser.add_argument('--chunked-upload', type=float, metavar='MIB', help="benchmark resumable chunked uploads of a MIB-sized image at 1-8 parallel chunks")
+    parser.add_argument('--gallery-bench', type=int, metavar='CARDS', help="seed CARDS submissions with full-size images, then compare gallery load with and without variants")
+    parser.add_argument('--dedupe-bench', type=int, metavar='LOGOS', help="upload LOGOS distinct logos, then re-upload each and compare latency and bytes written")
+    parser.add_argument('--burst', type=int, metavar='N', help="fire N simultaneous submits (compares group commit off/on with --local)")
+    parser.add_argument('--bench', action='store_true', help="run the benchmark suite, write JSON results and compare them with the baseline")
+    parser.add_argument('--bench-output', default=BENCH_RESULTS_PATH, help="where --bench writes its results")
+    parser.add_argument('--baseline', default=BENCH_BASELINE_PATH, help="baseline results --bench compares against (a missing one fails the run)")
+    parser.add_argument('--save-baseline', action='store_true', help="store this --bench run as the baseline instead of gating on it")
+    parser.add_argument('--soak', type=float, metavar='SECONDS', help="run mixed traffic for SECONDS while sampling the server's RSS, CPU, fds, temp files and event-loop delay")
+    parser.add_argument('--soak-interval', type=float, default=SOAK_INTERVAL, help="seconds between soak samples")
+    parser.add_argument('--soak-output', help="write the soak time series to this CSV file")
+    parser.add_argument('--upload-tmp-dir', default=DEFAULT_UPLOAD_TMP_DIR, help="the server's UPLOAD_TMP_DIR, where --soak counts temp files (--local uses its own)")
+    parser.add_argument('--payload-bench', action='store_true', help="send adversarial submit bodies from 1KB to 50MB and measure rejection latency and server CPU")
+    parser.add_argument('--load', action='store_true', help="run the concurrent load test instead of the functional tests")
+    parser.add_argument('--concurrency', type=int, default=10, help="number of concurrent load workers")
+    parser.add_argument('--duration', type=float, default=30, help="load test duration in seconds")
+    parser.add_argument('--rate', type=parse_rate, help="run an open-loop test at this arrival rate, e.g. 200/s")
+    parser.add_argument('--arrival', choices=['fixed', 'poisson'], default='fixed', help="open-loop arrival schedule")
+    parser.add_argument('--max-inflight', type=int, default=1000, help="maximum concurrent open-loop requests")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.local:
+        # A soak fills a smaller demo store early so its memory can be judged at steady state
+        extra_args = ['--demo-store-capacity', str(SOAK_STORE_CAPACITY)] if args.soak else ()
+        LOCAL_SERVER_PROCESS, local_url = start_local_server(args.local_submit_delay, args.local_upload_delay, extra_args)
+        SERVER_PID = LOCAL_SERVER_PROCESS.pid
+        use_base_url(local_url)
+    elif args.base_url:
+        use_base_url(args.base_url)
+    SUBMISSIONS_PAGE_SIZE = args.page_size
+    SERVER_PID = args.server_pid or SERVER_PID
+    if args.poll:
+        success = run_poll_test(args.concurrency, args.duration, args.poll_interval, args.write_interval)
+    elif args.query_bench:
+        success = run_query_benchmark(args.query_bench, fresh_servers=args.local)
+    elif args.store_soak:
+        success = run_store_soak(args.store_soak, args.batch_size, args.concurrency)
+    elif args.chunked_upload:
+        success = run_chunked_upload_benchmark(args.chunked_upload)
+    elif args.gallery_bench:
+        success = run_gallery_benchmark(args.gallery_bench, concurrency=args.concurrency)
+    elif args.dedupe_bench:
+        success = run_dedupe_benchmark(args.dedupe_bench, concurrency=args.concurrency)
+    elif args.soak:
+        upload_tmp_dir = LOCAL_SERVER_PROCESS.upload_tmp_dir if LOCAL_SERVER_PROCESS else args.upload_tmp_dir
+        success = run_soak_test(args.soak, args.concurrency, args.soak_interval, upload_tmp_dir, args.soak_output)
+    elif args.payload_bench:
+        success = run_payload_benchmark()
+    elif args.bench:
+        success = run_benchmark_suite(args)
+    elif args.burst:
+        # Both local servers share a 10-connection simulated database so coalescing has something to save
+        shared = ['--db-connections', '10']
+        if args.local_submit_delay is not None:
+            shared += ['--submit-delay', str(args.local_submit_delay)]
+        configs = [
+            ("group commit off", shared + ['--coalesce-wait-ms', '0']),
+            ("group commit on", shared),
+        ] if args.local else None
+        success = run_burst_test(args.burst, configs)
+    elif args.bulk_import:
+        success = run_bulk_import_benchmark(args.bulk_import, args.batch_size, args.concurrency)
+    elif args.export:
+        success = run_export_benchmark(args.seed)
+    elif args.rate:
+        success = run_open_loop_test(args.rate, args.duration, args.arrival, args.max_inflight)
+    elif args.load:
+        success = run_load_test(args.concurrency, args.duration)
+    else:
+        success = run_comprehensive_test(parallel=not args.sequential)
     exit(0 if success else 1)
\ No newline at end of file
@@ -0,0 +1,317 @@
+import { createHash } from 'node:crypto'
+import { createReadStream } from 'node:fs'
+import { mkdir, open, rm } from 'node:fs/promises'
+import { createTtlCache } from './idempotency.js'
+import { generateId } from './ids.js'
+import { timePhase } from './server-timing.js'
+import { MAX_UPLOAD_SIZE, SNIFF_BYTES, isImageSignature } from './multipart.js'
+import { UPLOAD_TMP_DIR, tempFilePath } from './spool.js'
+import { uploadLocalFile } from './supabase.js'
+
+// Resumable uploads: initiate a session, PUT chunks at byte offsets in any order
+// (each with a Content-Digest), query which ranges arrived, then complete. Chunks
+// are written into a per-session file under UPLOAD_TMP_DIR and the assembled
+// file is stored through uploadLocalFile().
+
+// Suggested chunk size, and the largest chunk a single PUT may carry
+export const UPLOAD_CHUNK_SIZE = 1024 * 1024
+export const MAX_UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024
+
+// Unfinished sessions are kept for 24 hours, at most 1000 per process; past
+// that, new sessions are refused rather than evicting ones still in progress
+export const UPLOAD_SESSION_TTL_MS = 24 * 60 * 60 * 1000
+export const MAX_UPLOAD_SESSIONS = 1000
+
+const UPLOAD_ID_PATTERN = /^upload_[0-9A-HJKMNP-TV-Z]{26}$/
+const SHA256_HEX_PATTERN = /^[0-9a-f]{64}$/i
+
+const sessions = createTtlCache({
+  maxEntries: MAX_UPLOAD_SESSIONS,
+  ttlMs: UPLOAD_SESSION_TTL_MS,
+  onEvict: (uploadId, session) => {
+    rm(session.filePath, { force: true }).catch(() => {})
+  }
+})
+
+// Completed sessions only keep their result for replays (their file is gone),
+// so the oldest of them may be evicted
+const completedSessions = createTtlCache({ maxEntries: MAX_UPLOAD_SESSIONS, ttlMs: UPLOAD_SESSION_TTL_MS })
+
+const metrics = { initiated: 0, rejected: 0, chunks: 0, chunkBytes: 0, checksumFailures: 0, completed: 0 }
+
+const notFound = () => ({ status: 404, body: { error: 'Upload not found or expired' } })
+
+const getSession = (uploadId) =>
+  UPLOAD_ID_PATTERN.test(uploadId ?? '') ? sessions.get(uploadId) ?? completedSessions.get(uploadId) : undefined
+
+// Merge [start, end) into a sorted list of disjoint ranges
+const addRange = (ranges, start, end) => {
+  const merged = []
+  let placed = false
+  for (const [rangeStart, rangeEnd] of ranges) {
+    if (rangeEnd < start) {
+      merged.push([rangeStart, rangeEnd])
+    } else if (rangeStart > end) {
+      if (!placed) {
+        merged.push([start, end])
+        placed = true
+      }
+      merged.push([rangeStart, rangeEnd])
+    } else {
+      start = Math.min(start, rangeStart)
+      end = Math.max(end, rangeEnd)
+    }
+  }
+  if (!placed) {
+    merged.push([start, end])
+  }
+  return merged
+}
+
+// Gaps in [0, size) not covered by ranges
+const missingRanges = (ranges, size) => {
+  const missing = []
+  let position = 0
+  for (const [start, end] of ranges) {
+    if (start > position) {
+      missing.push([position, start])
+    }
+    position = end
+  }
+  if (position < size) {
+    missing.push([position, size])
+  }
+  return missing
+}
+
+const receivedBytes = (ranges) => ranges.reduce((total, [start, end]) => total + end - start, 0)
+
+// Base64 sha-256 value of a Content-Digest header (RFC 9530), e.g. sha-256=:X48E9q...=:
+export const parseContentDigest = (header) => header?.match(/(?:^|,)\s*sha-256=:([A-Za-z0-9+/]+=*):/i)?.[1] ?? null
+
+// Read a request body into one Buffer, or null once it passes maxSize
+export const readLimited = async (stream, maxSize) => {
+  const chunks = []
+  let length = 0
+  for await (const chunk of stream ?? []) {
+    length += chunk.length
+    if (length > maxSize) {
+      return null
+    }
+    chunks.push(chunk)
+  }
+  return Buffer.concat(chunks, length)
+}
+
+const describe = (session) => ({
+  uploadId: session.uploadId,
+  filename: session.filename,
+  size: session.size,
+  received: receivedBytes(session.ranges),
+  ranges: session.ranges,
+  missing: missingRanges(session.ranges, session.size),
+  complete: Boolean(session.result),
+  url: session.result?.body.url
+})
+
+// Start a session for { filename, contentType, size, folder, sha256, variants };
+// sha256 (hex, optional) is checked against the assembled file on completion and
+// variants: true adds image variant URLs to the completion result
+export const initiateChunkedUpload = async (details) => {
+  const { filename, contentType, size, folder, sha256, variants } = details || {}
+
+  if (typeof filename !== 'string' || !filename) {
+    return { status: 400, body: { error: 'filename is required' } }
+  }
+  if (typeof contentType !== 'string' || !contentType.startsWith('image/')) {
+    return { status: 400, body: { error: 'Only image files are allowed' } }
+  }
+  if (!Number.isInteger(size) || size < 1) {
+    return { status: 400, body: { error: 'size must be a positive integer' } }
+  }
+  if (size > MAX_UPLOAD_SIZE) {
+    return { status: 400, body: { error: 'File size must be less than 15MB' } }
+  }
+  if (sha256 !== undefined && (typeof sha256 !== 'string' || !SHA256_HEX_PATTERN.test(sha256))) {
+    return { status: 400, body: { error: 'sha256 must be a hex SHA-256 digest' } }
+  }
+  if (variants !== undefined && typeof variants !== 'boolean') {
+    return { status: 400, body: { error: 'variants must be a boolean' } }
+  }
+
+  sessions.prune()
+  if (sessions.size >= MAX_UPLOAD_SESSIONS) {
+    metrics.rejected++
+    return { status: 503, body: { error: 'Too many uploads in progress, try again later' } }
+  }
+
+  // The session is registered before its file is created so concurrent initiates count against the limit
+  const uploadId = generateId('upload')
+  const filePath = tempFilePath(uploadId)
+  sessions.set(uploadId, {
+    uploadId,
+    filename,
+    contentType,
+    size,
+    folder: typeof folder === 'string' && folder ? folder : 'uploads',
+    sha256: sha256?.toLowerCase(),
+    variants: Boolean(variants),
+    filePath,
+    ranges: [],
+    completing: null,
+    result: null
+  })
+
+  try {
+    await mkdir(UPLOAD_TMP_DIR, { recursive: true })
+    const handle = await open(filePath, 'w')
+    await handle.truncate(size)
+    await handle.close()
+  } catch (error) {
+    sessions.delete(uploadId)
+    await rm(filePath, { force: true })
+    throw error
+  }
+  metrics.initiated++
+
+  return {
+    status: 201,
+    body: {
+      uploadId,
+      size,
+      chunkSize: UPLOAD_CHUNK_SIZE,
+      maxChunkSize: MAX_UPLOAD_CHUNK_SIZE,
+      expiresAt: new Date(Date.now() + UPLOAD_SESSION_TTL_MS).toISOString()
+    }
+  }
+}
+
+// Store chunk (a Buffer) at offset once its sha-256 matches digest (base64).
+// Re-sending a chunk overwrites it, so retries after a dropped connection are safe.
+export const writeChunk = async (uploadId, offset, chunk, digest) => {
+  const session = getSession(uploadId)
+  if (!session) {
+    return notFound()
+  }
+  if (session.result || session.completing) {
+    return { status: 409, body: { error: 'Upload is already complete' } }
+  }
+
+  if (!Number.isInteger(offset) || offset < 0) {
+    return { status: 400, body: { error: 'offset must be a non-negative integer' } }
+  }
+  if (chunk.length === 0 || offset + chunk.length > session.size) {
+    return { status: 400, body: { error: `Chunk must be non-empty and end within the ${session.size} byte file` } }
+  }
+  if (!digest) {
+    return { status: 400, body: { error: 'Content-Digest header with a sha-256 value is required' } }
+  }
+  if (createHash('sha256').update(chunk).digest('base64') !== digest) {
+    metrics.checksumFailures++
+    return { status: 400, body: { error: 'Chunk checksum mismatch' } }
+  }
+
+  const handle = await open(session.filePath, 'r+')
+  try {
+    await handle.write(chunk, 0, chunk.length, offset)
+  } finally {
+    await handle.close()
+  }
+
+  session.ranges = addRange(session.ranges, offset, offset + chunk.length)
+  // Activity extends the session's lifetime
+  sessions.set(uploadId, session)
+  metrics.chunks++
+  metrics.chunkBytes += chunk.length
+
+  return { status: 200, body: { uploadId, offset, length: chunk.length, received: receivedBytes(session.ranges), size: session.size } }
+}
+
+export const getChunkedUploadStatus = (uploadId) => {
+  const session = getSession(uploadId)
+  return session ? { status: 200, body: describe(session) } : notFound()
+}
+
+const hashFile = async (filePath) => {
+  const hash = createHash('sha256')
+  for await (const chunk of createReadStream(filePath)) {
+    hash.update(chunk)
+  }
+  return hash.digest('hex')
+}
+
+const readHead = async (filePath) => {
+  const handle = await open(filePath, 'r')
+  try {
+    const head = Buffer.alloc(SNIFF_BYTES)
+    const { bytesRead } = await handle.read(head, 0, SNIFF_BYTES, 0)
+    return head.subarray(0, bytesRead)
+  } finally {
+    await handle.close()
+  }
+}
+
+const assemble = async (session) => {
+  const missing = missingRanges(session.ranges, session.size)
+  if (missing.length > 0) {
+    return { status: 409, body: { error: 'Upload is missing chunks', missing } }
+  }
+
+  if (!isImageSignature(await readHead(session.filePath))) {
+    return { status: 400, body: { error: 'Only image files are allowed' } }
+  }
+  const sha256 = await timePhase('hash', () => hashFile(session.filePath))
+  if (session.sha256 && sha256 !== session.sha256) {
+    return { status: 400, body: { error: 'File checksum mismatch' } }
+  }
+
+  const result = await uploadLocalFile({
+    filePath: session.filePath,
+    sha256,
+    size: session.size,
+    name: session.filename,
+    type: session.contentType
+  }, session.folder, { variants: session.variants })
+
+  if (!result.success) {
+    return { status: 500, body: { error: result.error } }
+  }
+
+  return {
+    status: 200,
+    body: {
+      success: true,
+      url: result.url,
+      ...(session.variants && { variants: result.variants }),
+      message: 'File uploaded successfully'
+    }
+  }
+}
+
+// Verify every byte arrived, then send the assembled file to storage.
+// Completing again returns the same result; concurrent calls share one upload.
+export const completeChunkedUpload = async (uploadId) => {
+  const session = getSession(uploadId)
+  if (!session) {
+    return notFound()
+  }
+  if (session.result) {
+    return session.result
+  }
+
+  session.completing ??= assemble(session).finally(() => {
+    session.completing = null
+  })
+  const outcome = await session.completing
+
+  if (outcome.status === 200 && !session.result) {
+    session.result = outcome
+    metrics.completed++
+    sessions.delete(uploadId)
+    completedSessions.set(uploadId, session)
+    await rm(session.filePath, { force: true })
+  }
+  return outcome
+}
+
+export const getChunkedUploadMetrics = () => ({ ...metrics, activeSessions: sessions.size, completedSessions: completedSessions.size })
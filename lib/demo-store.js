@@ -0,0 +1,198 @@
+import { tokenizeTitle } from './validation.js'
+
+// Capacity-bounded in-memory submission store for demo mode. Rows are kept in
+// (createdAt, id) order; once full, each insert evicts the oldest row.
+export const DEMO_STORE_CAPACITY = Number(process.env.DEMO_STORE_CAPACITY ?? 10000)
+
+// Rows sort by createdAt then id, matching the keyset pagination order
+export const compareRows = (a, b) => {
+  if (a.createdAt !== b.createdAt) {
+    return a.createdAt < b.createdAt ? -1 : 1
+  }
+  return a.id < b.id ? -1 : a.id > b.id ? 1 : 0
+}
+
+// Index keys are always strings so the sorted team name keys compare and prefix-match safely
+const indexKey = (value) => String(value ?? '').toLowerCase()
+
+export const createDemoStore = ({ capacity = DEMO_STORE_CAPACITY } = {}) => {
+  // rows[head..] are live; evicted slots before head are dropped in one slice
+  // once they make up half the array, so eviction stays amortised O(1)
+  let rows = []
+  let head = 0
+  let evicted = 0
+  const byId = new Map()
+  // Secondary indexes: case-insensitive key -> Set of rows, in insertion order
+  const byEmail = new Map()
+  const byTeamName = new Map()
+  const byTitleTerm = new Map()
+  // Distinct team name keys in sorted order, for prefix range lookups
+  const teamNameKeys = []
+
+  const bisectKeys = (key) => {
+    let low = 0
+    let high = teamNameKeys.length
+    while (low < high) {
+      const mid = (low + high) >> 1
+      if (teamNameKeys[mid] < key) {
+        low = mid + 1
+      } else {
+        high = mid
+      }
+    }
+    return low
+  }
+
+  const addToIndex = (index, key, row) => {
+    if (!index.has(key)) {
+      index.set(key, new Set())
+    }
+    index.get(key).add(row)
+  }
+
+  const removeFromIndex = (index, key, row) => {
+    const entries = index.get(key)
+    if (entries) {
+      entries.delete(row)
+      if (entries.size === 0) {
+        index.delete(key)
+      }
+    }
+  }
+
+  // Binary search over live rows by createdAt: with right=true the first index
+  // after every row at `createdAt`, otherwise the first index at or after it
+  const bisectCreatedAt = (createdAt, right) => {
+    let low = head
+    let high = rows.length
+    while (low < high) {
+      const mid = (low + high) >> 1
+      if (rows[mid].createdAt < createdAt || (right && rows[mid].createdAt === createdAt)) {
+        low = mid + 1
+      } else {
+        high = mid
+      }
+    }
+    return low
+  }
+
+  const evictOldest = () => {
+    const row = rows[head]
+    rows[head] = undefined
+    head++
+    if (head * 2 >= rows.length) {
+      rows = rows.slice(head)
+      head = 0
+    }
+    byId.delete(row.id)
+    removeFromIndex(byEmail, indexKey(row.teamLeadEmail), row)
+    removeFromIndex(byTeamName, indexKey(row.teamName), row)
+    if (!byTeamName.has(indexKey(row.teamName))) {
+      teamNameKeys.splice(bisectKeys(indexKey(row.teamName)), 1)
+    }
+    new Set(tokenizeTitle(row.projectTitle)).forEach(term => removeFromIndex(byTitleTerm, term, row))
+    evicted++
+    return row
+  }
+
+  const insert = (row) => {
+    // Rows almost always arrive in order; fall back to a sorted splice if the clock stepped back
+    const last = rows[rows.length - 1]
+    if (rows.length === head || compareRows(last, row) <= 0) {
+      rows.push(row)
+    } else {
+      let position = bisectCreatedAt(row.createdAt, true)
+      while (position > head && compareRows(rows[position - 1], row) > 0) {
+        position--
+      }
+      rows.splice(position, 0, row)
+    }
+    byId.set(row.id, row)
+    addToIndex(byEmail, indexKey(row.teamLeadEmail), row)
+    if (!byTeamName.has(indexKey(row.teamName))) {
+      teamNameKeys.splice(bisectKeys(indexKey(row.teamName)), 0, indexKey(row.teamName))
+    }
+    addToIndex(byTeamName, indexKey(row.teamName), row)
+    new Set(tokenizeTitle(row.projectTitle)).forEach(term => addToIndex(byTitleTerm, term, row))
+
+    return byId.size > capacity ? evictOldest() : null
+  }
+
+  const matchesFilters = (row, { email, teamNamePrefix, titleTerms, from, to }) => {
+    if (email && row.teamLeadEmail !== email) {
+      return false
+    }
+    if (teamNamePrefix && !(typeof row.teamName === 'string' && row.teamName.startsWith(teamNamePrefix))) {
+      return false
+    }
+    if (titleTerms && !titleTerms.every(term => byTitleTerm.get(term)?.has(row))) {
+      return false
+    }
+    return (!from || row.createdAt >= from) && (!to || row.createdAt < to)
+  }
+
+  // Rows matching filters (see parseSubmissionFilters) strictly before the
+  // cursor, newest first, up to `count` of them. Starts from whichever index
+  // yields the fewest candidates: the createdAt range, one email, the team
+  // names under a prefix or the rarest title term.
+  const query = (filters = {}, cursor = null, count = Infinity) => {
+    let start = filters.from ? bisectCreatedAt(filters.from, false) : head
+    let end = filters.to ? bisectCreatedAt(filters.to, false) : rows.length
+    if (cursor) {
+      end = Math.min(end, bisectCreatedAt(cursor.createdAt, true))
+    }
+    start = Math.min(start, end)
+
+    let candidates = null
+    const consider = (entries) => {
+      const size = entries.reduce((total, set) => total + set.size, 0)
+      if (size < (candidates?.size ?? end - start)) {
+        candidates = { size, entries }
+      }
+    }
+
+    if (filters.email) {
+      consider([byEmail.get(indexKey(filters.email)) ?? new Set()])
+    }
+    if (filters.teamNamePrefix) {
+      const prefix = indexKey(filters.teamNamePrefix)
+      const entries = []
+      for (let i = bisectKeys(prefix); i < teamNameKeys.length && teamNameKeys[i].startsWith(prefix); i++) {
+        entries.push(byTeamName.get(teamNameKeys[i]))
+      }
+      consider(entries)
+    }
+    if (filters.titleTerms) {
+      filters.titleTerms.forEach(term => consider([byTitleTerm.get(term) ?? new Set()]))
+    }
+
+    const isCandidate = (row) => matchesFilters(row, filters) && (!cursor || compareRows(row, cursor) < 0)
+
+    if (candidates) {
+      const result = []
+      candidates.entries.forEach(entries => entries.forEach(row => {
+        if (isCandidate(row)) {
+          result.push(row)
+        }
+      }))
+      return result.sort(compareRows).reverse().slice(0, count)
+    }
+
+    const result = []
+    for (let i = end - 1; i >= start && result.length < count; i--) {
+      if (isCandidate(rows[i])) {
+        result.push(rows[i])
+      }
+    }
+    return result
+  }
+
+  return {
+    insert,
+    query,
+    get: (id) => byId.get(id),
+    toArray: () => rows.slice(head),
+    get size() { return byId.size },
+    getMetrics: () => ({ size: byId.size, capacity, evicted })
+  }
+}
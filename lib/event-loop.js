@@ -0,0 +1,27 @@
+import { monitorEventLoopDelay } from 'node:perf_hooks'
+
+// Event-loop delay for /api/metrics, over fixed windows so the numbers describe
+// recent load rather than the whole life of the process. The last complete
+// window is reported (the current one until the first completes).
+export const EVENT_LOOP_WINDOW_MS = 5000
+
+const histogram = monitorEventLoopDelay({ resolution: 10 })
+histogram.enable()
+
+// The histogram holds nanoseconds; an empty one reports NaN
+const toMs = (ns) => Number.isFinite(ns) ? ns / 1e6 : 0
+
+const summarize = () => ({
+  meanMs: toMs(histogram.mean),
+  p99Ms: toMs(histogram.percentile(99)),
+  maxMs: toMs(histogram.max)
+})
+
+let lastWindow = null
+
+setInterval(() => {
+  lastWindow = summarize()
+  histogram.reset()
+}, EVENT_LOOP_WINDOW_MS).unref()
+
+export const getEventLoopMetrics = () => ({ windowMs: EVENT_LOOP_WINDOW_MS, ...(lastWindow ?? summarize()) })
@@ -0,0 +1,93 @@
+import { getSubmissionsPage, decodeCursor } from './supabase.js'
+
+// Rows fetched per range query while exporting
+export const EXPORT_PAGE_SIZE = 500
+
+// CSV columns as [header, demo field, database column]
+const CSV_COLUMNS = [
+  ['id', 'id', 'id'],
+  ['teamName', 'teamName', 'team_name'],
+  ['teamLeadName', 'teamLeadName', 'team_lead_name'],
+  ['teamLeadEmail', 'teamLeadEmail', 'team_lead_email'],
+  ['teamLeadContact', 'teamLeadContact', 'team_lead_contact'],
+  ['projectTitle', 'projectTitle', 'project_title'],
+  ['projectDescription', 'projectDescription', 'project_description'],
+  ['gitLink', 'gitLink', 'git_link'],
+  ['projectUrl', 'projectUrl', 'project_url'],
+  ['projectLogoUrl', 'projectLogoUrl', 'project_logo_url'],
+  ['projectBannerUrl', 'projectBannerUrl', 'project_banner_url'],
+  ['videoDemoLink', 'videoDemoLink', 'video_demo_link'],
+  ['createdAt', 'createdAt', 'created_at']
+]
+
+export const EXPORT_FORMATS = {
+  ndjson: { contentType: 'application/x-ndjson', extension: 'ndjson' },
+  csv: { contentType: 'text/csv; charset=utf-8', extension: 'csv' }
+}
+
+// Spreadsheets run cells starting with these as formulas, so such cells get a ' prefix
+const FORMULA_PREFIX_PATTERN = /^[=+\-@\t\r]/
+
+const csvCell = (value) => {
+  if (value === undefined || value === null) {
+    return ''
+  }
+  const raw = String(value)
+  const text = FORMULA_PREFIX_PATTERN.test(raw) ? `'${raw}` : raw
+  return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text
+}
+
+const csvHeader = () => CSV_COLUMNS.map(([header]) => csvCell(header)).join(',') + '\r\n'
+
+const csvLine = (row) =>
+  CSV_COLUMNS.map(([, field, column]) => csvCell(row[field] ?? row[column])).join(',') + '\r\n'
+
+// Walk every submission page by page so only one page is ever held in memory
+export const streamSubmissionPages = async function* (pageSize = EXPORT_PAGE_SIZE) {
+  let cursor = null
+  do {
+    const page = await getSubmissionsPage({ limit: pageSize, cursor })
+    if (!page.success) {
+      throw new Error(page.error)
+    }
+    yield page.data
+    cursor = page.next ? decodeCursor(page.next) : null
+  } while (cursor)
+}
+
+// Pull-based stream: the next page is only fetched once the client has consumed the previous one
+export const createExportStream = (format = 'ndjson') => {
+  const pages = streamSubmissionPages()
+  const encoder = new TextEncoder()
+  let headerSent = format !== 'csv'
+
+  return new ReadableStream({
+    async pull(controller) {
+      if (!headerSent) {
+        headerSent = true
+        controller.enqueue(encoder.encode(csvHeader()))
+        return
+      }
+
+      try {
+        const { value, done } = await pages.next()
+        if (done) {
+          controller.close()
+          return
+        }
+        const lines = format === 'csv'
+          ? value.map(csvLine)
+          : value.map(row => JSON.stringify(row) + '\n')
+        if (lines.length > 0) {
+          controller.enqueue(encoder.encode(lines.join('')))
+        }
+      } catch (error) {
+        console.error('Submission export error:', error)
+        controller.error(error)
+      }
+    },
+    async cancel() {
+      await pages.return()
+    }
+  })
+}
@@ -0,0 +1,98 @@
+import { createHash } from 'node:crypto'
+
+// Replays are served for 24 hours, from at most 10k remembered keys per process
+export const IDEMPOTENCY_TTL_MS = 24 * 60 * 60 * 1000
+export const IDEMPOTENCY_MAX_ENTRIES = 10000
+export const MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+// Bounded LRU with per-entry expiry, backed by Map insertion order.
+// onEvict(key, value) runs for entries that expire or are pushed out, not for delete().
+export const createTtlCache = ({ maxEntries = IDEMPOTENCY_MAX_ENTRIES, ttlMs = IDEMPOTENCY_TTL_MS, onEvict } = {}) => {
+  const entries = new Map()
+
+  const evict = (key, entry) => {
+    entries.delete(key)
+    onEvict?.(key, entry.value)
+  }
+
+  const get = (key) => {
+    const entry = entries.get(key)
+    if (!entry) {
+      return undefined
+    }
+    if (entry.expiresAt <= Date.now()) {
+      evict(key, entry)
+      return undefined
+    }
+    // Refresh recency
+    entries.delete(key)
+    entries.set(key, entry)
+    return entry.value
+  }
+
+  const set = (key, value) => {
+    entries.delete(key)
+    entries.set(key, { value, expiresAt: Date.now() + ttlMs })
+    while (entries.size > maxEntries) {
+      const [oldestKey, oldest] = entries.entries().next().value
+      evict(oldestKey, oldest)
+    }
+  }
+
+  const remove = (key) => entries.delete(key)
+
+  // Drop every expired entry, not just the ones that get looked up again
+  const prune = () => {
+    const now = Date.now()
+    for (const [key, entry] of entries) {
+      if (entry.expiresAt <= now) {
+        evict(key, entry)
+      }
+    }
+  }
+
+  return { get, set, delete: remove, prune, get size() { return entries.size } }
+}
+
+// Per-process store; each server instance remembers the keys it has seen
+const idempotencyCache = createTtlCache()
+
+export const fingerprint = (text) => createHash('sha256').update(text).digest('hex')
+
+// Run handler at most once per (scope, Idempotency-Key). handler resolves to
+// { status, body }. Concurrent duplicates wait for the first request; later
+// ones replay its stored response. 5xx results are not remembered so the
+// client can retry them. Returns { status, body, replayed } or a 4xx
+// { status, body } when the key is invalid or reused with a different request.
+export const runIdempotent = async (scope, key, requestFingerprint, handler) => {
+  if (!key) {
+    return { ...(await handler()), replayed: false }
+  }
+
+  if (key.length > MAX_IDEMPOTENCY_KEY_LENGTH) {
+    return { status: 400, body: { error: `Idempotency-Key must be ${MAX_IDEMPOTENCY_KEY_LENGTH} characters or less` }, replayed: false }
+  }
+
+  const cacheKey = `${scope}:${key}`
+  const cached = idempotencyCache.get(cacheKey)
+  if (cached) {
+    if (requestFingerprint && cached.fingerprint !== requestFingerprint) {
+      return { status: 422, body: { error: 'Idempotency-Key was already used with a different request' }, replayed: false }
+    }
+    return { ...(await cached.result), replayed: true }
+  }
+
+  const result = handler()
+  idempotencyCache.set(cacheKey, { fingerprint: requestFingerprint, result })
+
+  try {
+    const outcome = await result
+    if (outcome.status >= 500) {
+      idempotencyCache.delete(cacheKey)
+    }
+    return { ...outcome, replayed: false }
+  } catch (error) {
+    idempotencyCache.delete(cacheKey)
+    throw error
+  }
+}
@@ -0,0 +1,60 @@
+// Crockford base32, as used by ULID
+const ENCODING = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+const RANDOM_BYTES = 10
+
+let lastTime = -1
+let lastRandom = new Uint8Array(RANDOM_BYTES)
+
+const encodeTime = (time) => {
+  let out = ''
+  for (let i = 0; i < 10; i++) {
+    out = ENCODING[time % 32] + out
+    time = Math.floor(time / 32)
+  }
+  return out
+}
+
+const encodeRandom = (bytes) => {
+  // 80 bits -> 16 base32 characters, 5 bits at a time
+  let out = ''
+  let buffer = 0
+  let bits = 0
+  for (const byte of bytes) {
+    buffer = (buffer << 8) | byte
+    bits += 8
+    while (bits >= 5) {
+      bits -= 5
+      out += ENCODING[(buffer >> bits) & 31]
+    }
+    buffer &= (1 << bits) - 1
+  }
+  return out
+}
+
+const incrementRandom = (bytes) => {
+  const next = Uint8Array.from(bytes)
+  for (let i = next.length - 1; i >= 0; i--) {
+    if (next[i] < 255) {
+      next[i] += 1
+      return next
+    }
+    next[i] = 0
+  }
+  throw new Error('ID random component overflowed within one millisecond')
+}
+
+// Monotonic ULID: 48-bit millisecond timestamp + 80 random bits. IDs generated
+// in the same millisecond (or after the clock steps back) increment the random
+// part, so they never collide and always sort in generation order.
+export const ulid = () => {
+  const now = Date.now()
+  if (now <= lastTime) {
+    lastRandom = incrementRandom(lastRandom)
+  } else {
+    lastTime = now
+    lastRandom = crypto.getRandomValues(new Uint8Array(RANDOM_BYTES))
+  }
+  return encodeTime(lastTime) + encodeRandom(lastRandom)
+}
+
+export const generateId = (prefix) => `${prefix}_${ulid()}`
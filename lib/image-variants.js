@@ -0,0 +1,51 @@
+// Size-bounded WebP variants of uploaded images, for galleries that should not
+// download full-size logos and banners for every card.
+//
+// Variants are rendered with sharp, which is NOT a declared dependency: install
+// it on the server (`npm install sharp`; next.config.js keeps it external) to
+// get pre-rendered files. Without it, lib/supabase.js falls back to Supabase's
+// on-the-fly image transformations, which the project's plan must include, and
+// demo mode only simulates the variants. loadSharp() logs once when the
+// fallback is in use.
+
+// Each variant fits inside its box, keeping the aspect ratio and never enlarging
+export const IMAGE_VARIANTS = {
+  thumbnail: { width: 160, height: 160 },
+  medium: { width: 800, height: 800 }
+}
+
+export const VARIANT_QUALITY = 80
+
+// Formats sharp decodes; SVG stays vector and ICO/BMP are kept as uploaded
+const RENDERABLE_TYPES = ['image/png', 'image/jpeg', 'image/webp', 'image/gif', 'image/avif', 'image/tiff']
+
+export const canRenderVariants = (type) => RENDERABLE_TYPES.includes(type)
+
+// logos/<sha256>.png -> logos/variants/<sha256>-thumbnail.webp
+export const variantPathFor = (objectPath, variant) => {
+  const slash = objectPath.lastIndexOf('/')
+  const base = objectPath.slice(slash + 1).replace(/\.[^.]*$/, '')
+  return `${objectPath.slice(0, slash + 1)}variants/${base}-${variant}.webp`
+}
+
+let sharpModule
+
+// The sharp module, or null when it is not installed
+export const loadSharp = () => {
+  sharpModule ??= import('sharp').then(module => module.default).catch(() => {
+    console.warn('sharp is not installed; image variants fall back to Supabase transformation URLs')
+    return null
+  })
+  return sharpModule
+}
+
+// Render one variant of the image at filePath to a WebP Buffer: EXIF
+// orientation applied, metadata stripped, bounded by the variant's box
+export const renderVariant = async (sharp, filePath, variant) => {
+  const { width, height } = IMAGE_VARIANTS[variant]
+  return sharp(filePath, { animated: false })
+    .rotate()
+    .resize({ width, height, fit: 'inside', withoutEnlargement: true })
+    .webp({ quality: VARIANT_QUALITY })
+    .toBuffer()
+}
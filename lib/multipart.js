@@ -0,0 +1,220 @@
+// Streaming multipart/form-data reader for /api/upload. Unlike
+// request.formData() it never holds a whole file: file parts are exposed as
+// ReadableStreams that are cut at the next boundary as bytes arrive.
+
+// Upload limits: file bytes, and what the rest of a multipart body may add on top
+export const MAX_UPLOAD_SIZE = 15 * 1024 * 1024
+export const MULTIPART_OVERHEAD_ALLOWANCE = 64 * 1024
+const MAX_PART_HEADER_BYTES = 16 * 1024
+const MAX_FIELD_BYTES = 64 * 1024
+
+// Bytes needed to recognise every signature in IMAGE_SIGNATURES
+export const SNIFF_BYTES = 512
+
+export class UploadTooLargeError extends Error {
+  constructor() {
+    super('File size must be less than 15MB')
+    this.name = 'UploadTooLargeError'
+  }
+}
+
+export const getMultipartBoundary = (contentType) => {
+  if (!contentType?.startsWith('multipart/form-data')) {
+    return null
+  }
+  return contentType.match(/boundary="?([^";]+)"?/)?.[1] ?? null
+}
+
+const startsWith = (bytes, signature, offset = 0) =>
+  bytes.length >= offset + signature.length && signature.every((byte, index) => bytes[offset + index] === byte)
+
+const ascii = (text) => [...text].map(char => char.charCodeAt(0))
+
+const IMAGE_SIGNATURES = [
+  (head) => startsWith(head, [0x89, 0x50, 0x4e, 0x47, 0x0d, 0x0a, 0x1a, 0x0a]), // PNG
+  (head) => startsWith(head, [0xff, 0xd8, 0xff]), // JPEG
+  (head) => startsWith(head, ascii('GIF87a')) || startsWith(head, ascii('GIF89a')),
+  (head) => startsWith(head, ascii('RIFF')) && startsWith(head, ascii('WEBP'), 8),
+  (head) => startsWith(head, ascii('BM')),
+  (head) => startsWith(head, [0x00, 0x00, 0x01, 0x00]), // ICO
+  (head) => startsWith(head, ascii('II*\0')) || startsWith(head, ascii('MM\0*')), // TIFF
+  (head) => startsWith(head, ascii('ftyp'), 4) &&
+    ['avif', 'avis', 'heic', 'heix', 'mif1', 'msf1'].some(brand => startsWith(head, ascii(brand), 8)),
+  (head) => {
+    const text = Buffer.from(head).toString('utf8').replace(/^\uFEFF/, '').trimStart()
+    return (text.startsWith('<svg') || text.startsWith('<?xml')) && text.includes('<svg')
+  }
+]
+
+// True when the first bytes of a file carry a known image signature
+export const isImageSignature = (head) => IMAGE_SIGNATURES.some(matches => matches(head))
+
+// Yields { name, value } for plain fields and { name, filename, contentType, body }
+// for files, in body order. A file's body stream must be read to the end (or
+// cancelled, which abandons the rest of the request) before the next part.
+export async function* readMultipart(stream, boundary) {
+  const reader = stream.getReader()
+  const delimiter = Buffer.from(`\r\n--${boundary}`)
+  // Prefixing CRLF lets the opening boundary match the same delimiter
+  let buffer = Buffer.from('\r\n')
+  let done = false
+
+  const fill = async () => {
+    if (done) {
+      throw new Error('Unexpected end of multipart body')
+    }
+    const { value, done: finished } = await reader.read()
+    if (finished) {
+      done = true
+    } else {
+      buffer = buffer.length ? Buffer.concat([buffer, value]) : Buffer.from(value)
+    }
+  }
+
+  // Skip the preamble up to the first boundary
+  let index
+  while ((index = buffer.indexOf(delimiter)) === -1) {
+    buffer = buffer.subarray(Math.max(0, buffer.length - delimiter.length + 1))
+    await fill()
+  }
+  buffer = buffer.subarray(index + delimiter.length)
+
+  while (true) {
+    while (buffer.length < 2) {
+      await fill()
+    }
+    if (buffer[0] === 0x2d && buffer[1] === 0x2d) {
+      // Closing "--"; the epilogue is ignored
+      reader.cancel().catch(() => {})
+      return
+    }
+
+    while ((index = buffer.indexOf('\r\n\r\n')) === -1) {
+      if (buffer.length > MAX_PART_HEADER_BYTES) {
+        throw new Error('Multipart part headers too large')
+      }
+      await fill()
+    }
+    const headers = {}
+    buffer.subarray(0, index).toString('utf8').split('\r\n').forEach(line => {
+      const separator = line.indexOf(':')
+      if (separator > 0) {
+        headers[line.slice(0, separator).trim().toLowerCase()] = line.slice(separator + 1).trim()
+      }
+    })
+    buffer = buffer.subarray(index + 4)
+
+    const disposition = headers['content-disposition'] ?? ''
+    const name = disposition.match(/\bname="([^"]*)"/)?.[1]
+    const filename = disposition.match(/\bfilename="([^"]*)"/)?.[1]
+
+    if (filename === undefined) {
+      while ((index = buffer.indexOf(delimiter)) === -1) {
+        if (buffer.length > MAX_FIELD_BYTES) {
+          throw new Error('Multipart field too large')
+        }
+        await fill()
+      }
+      const value = buffer.subarray(0, index).toString('utf8')
+      buffer = buffer.subarray(index + delimiter.length)
+      yield { name, value }
+      continue
+    }
+
+    let finished
+    const partDone = new Promise((resolve, reject) => { finished = { resolve, reject } })
+    // The consumer may abandon the generator while a part is pending
+    partDone.catch(() => {})
+    const body = new ReadableStream({
+      pull: async (controller) => {
+        try {
+          while (true) {
+            index = buffer.indexOf(delimiter)
+            if (index !== -1) {
+              if (index > 0) {
+                controller.enqueue(buffer.subarray(0, index))
+              }
+              buffer = buffer.subarray(index + delimiter.length)
+              controller.close()
+              finished.resolve()
+              return
+            }
+            // Everything except a possible partial delimiter at the end is file data
+            const safe = buffer.length - delimiter.length + 1
+            if (safe > 0) {
+              controller.enqueue(buffer.subarray(0, safe))
+              buffer = buffer.subarray(safe)
+              return
+            }
+            await fill()
+          }
+        } catch (error) {
+          controller.error(error)
+          finished.reject(error)
+        }
+      },
+      cancel: (reason) => {
+        reader.cancel(reason).catch(() => {})
+        finished.reject(reason ?? new Error('File part cancelled'))
+      }
+    })
+
+    yield { name, filename, contentType: headers['content-type'] ?? 'application/octet-stream', body }
+    await partDone
+  }
+}
+
+// Read a file part's first SNIFF_BYTES (or all of it, if shorter), then return
+// { head, stream, exceeded } where stream replays the head followed by the
+// remaining bytes and errors with UploadTooLargeError once more than maxSize
+// bytes pass; exceeded() reports whether that happened.
+export const sniffAndLimit = async (body, maxSize = MAX_UPLOAD_SIZE) => {
+  const reader = body.getReader()
+  const chunks = []
+  let length = 0
+  let ended = false
+  while (length < SNIFF_BYTES) {
+    const { value, done } = await reader.read()
+    if (done) {
+      ended = true
+      break
+    }
+    chunks.push(value)
+    length += value.length
+  }
+  const head = Buffer.concat(chunks, length)
+
+  let size = 0
+  let sentHead = false
+  const stream = new ReadableStream({
+    pull: async (controller) => {
+      while (true) {
+        let chunk
+        if (!sentHead) {
+          sentHead = true
+          chunk = head
+        } else {
+          const { value, done } = ended ? { done: true } : await reader.read()
+          if (done) {
+            controller.close()
+            return
+          }
+          chunk = value
+        }
+        size += chunk.length
+        if (size > maxSize) {
+          reader.cancel().catch(() => {})
+          controller.error(new UploadTooLargeError())
+          return
+        }
+        if (chunk.length > 0) {
+          controller.enqueue(chunk)
+          return
+        }
+      }
+    },
+    cancel: (reason) => reader.cancel(reason)
+  })
+
+  return { head: head.subarray(0, SNIFF_BYTES), stream, exceeded: () => size > maxSize }
+}
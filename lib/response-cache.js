@@ -0,0 +1,70 @@
+import { createHash } from 'node:crypto'
+import { createTtlCache } from './idempotency.js'
+
+// Cached GET bodies live for at most 2 seconds, bounding staleness from writes
+// made by other server instances; writes on this instance invalidate at once
+export const RESPONSE_CACHE_TTL_MS = Number(process.env.RESPONSE_CACHE_TTL_MS ?? 2000)
+export const RESPONSE_CACHE_MAX_ENTRIES = 256
+
+const responseCache = createTtlCache({ maxEntries: RESPONSE_CACHE_MAX_ENTRIES, ttlMs: RESPONSE_CACHE_TTL_MS })
+
+const metrics = { hits: 0, misses: 0, notModified: 0 }
+
+// Strong ETag over the serialized body, so identical bodies share a tag even
+// after the entry was invalidated and rebuilt
+export const etagFor = (text) => `"${createHash('sha1').update(text).digest('base64url')}"`
+
+// True when an If-None-Match header lists the ETag (weak comparison, as RFC 9110 requires for GET)
+export const matchesIfNoneMatch = (header, etag) => {
+  if (!header) {
+    return false
+  }
+  if (header.trim() === '*') {
+    return true
+  }
+  return header.split(',').some(tag => tag.trim().replace(/^W\//, '') === etag)
+}
+
+// Serve key from cache while its data version is current, otherwise run
+// produce() -> { status, body } once (concurrent misses share it). Resolves to
+// { status, text, etag, hit } for a 200 and { status, body, hit } otherwise;
+// only 200 results are kept.
+export const getCachedResponse = async (key, version, produce) => {
+  const cached = responseCache.get(key)
+  if (cached && cached.version === version) {
+    metrics.hits++
+    return { ...(await cached.result), hit: true }
+  }
+
+  metrics.misses++
+  const result = Promise.resolve().then(produce).then(({ status, body }) => {
+    if (status !== 200) {
+      return { status, body }
+    }
+    const text = JSON.stringify(body)
+    // Keep only the serialized text; the body objects can be collected
+    return { status, text, etag: etagFor(text) }
+  })
+  responseCache.set(key, { version, result })
+
+  try {
+    const outcome = await result
+    if (outcome.status !== 200) {
+      responseCache.delete(key)
+    }
+    return { ...outcome, hit: false }
+  } catch (error) {
+    responseCache.delete(key)
+    throw error
+  }
+}
+
+export const recordNotModified = () => {
+  metrics.notModified++
+}
+
+export const getResponseCacheMetrics = () => ({
+  ...metrics,
+  entries: responseCache.size,
+  hitRatio: metrics.hits + metrics.misses > 0 ? metrics.hits / (metrics.hits + metrics.misses) : 0
+})
@@ -0,0 +1,60 @@
+import { AsyncLocalStorage } from 'node:async_hooks'
+
+// Per-request phase timings. The API route runs each request inside
+// withServerTiming(); helpers wrap their slow steps in timePhase(), which does
+// nothing extra outside a request. The phases go out as a Server-Timing header
+// (SERVER_TIMING=off drops it) and, with SERVER_TIMING_LOG=1, as one JSON log line.
+export const SERVER_TIMING_ENABLED = process.env.SERVER_TIMING !== 'off'
+export const SERVER_TIMING_LOG = process.env.SERVER_TIMING_LOG === '1'
+
+const requestPhases = new AsyncLocalStorage()
+
+// Run fn() and record how long it took as phase `name` of the current request.
+// A phase recorded more than once (one per insert chunk, say) is summed.
+export const timePhase = async (name, fn) => {
+  const phases = requestPhases.getStore()
+  if (!phases) {
+    return fn()
+  }
+
+  const start = performance.now()
+  try {
+    return await fn()
+  } finally {
+    phases.set(name, (phases.get(name) ?? 0) + performance.now() - start)
+  }
+}
+
+// Run fn() outside of any request's timings, for work shared by several
+// requests (a group-commit flush) that would otherwise land on whichever one started it
+export const untimed = (fn) => requestPhases.exit(fn)
+
+// name;dur=12.3, ... in recording order, total last
+export const formatServerTiming = (phases) =>
+  [...phases].map(([name, dur]) => `${name};dur=${dur.toFixed(1)}`).join(', ')
+
+// Run handler() with phase timing and attach its phases to the response it returns
+export const withServerTiming = async (request, handler) => {
+  if (!SERVER_TIMING_ENABLED && !SERVER_TIMING_LOG) {
+    return handler()
+  }
+
+  const phases = new Map()
+  const start = performance.now()
+  const response = await requestPhases.run(phases, handler)
+  phases.set('total', performance.now() - start)
+
+  if (SERVER_TIMING_ENABLED) {
+    response.headers.set('Server-Timing', formatServerTiming(phases))
+  }
+  if (SERVER_TIMING_LOG) {
+    console.log(JSON.stringify({
+      event: 'server-timing',
+      method: request.method,
+      path: new URL(request.url).pathname,
+      status: response.status,
+      phases: Object.fromEntries([...phases].map(([name, dur]) => [name, Math.round(dur * 10) / 10]))
+    }))
+  }
+  return response
+}
@@ -0,0 +1,42 @@
+import { createHash } from 'node:crypto'
+import { createWriteStream } from 'node:fs'
+import { mkdir, rm } from 'node:fs/promises'
+import { tmpdir } from 'node:os'
+import path from 'node:path'
+import { Readable } from 'node:stream'
+import { pipeline } from 'node:stream/promises'
+import { generateId } from './ids.js'
+
+// Scratch space for uploads: resumable sessions and spooled request bodies
+export const UPLOAD_TMP_DIR = process.env.UPLOAD_TMP_DIR ?? path.join(tmpdir(), 'hackathon-uploads')
+
+export const tempFilePath = (name) => path.join(UPLOAD_TMP_DIR, name)
+
+// Write a web ReadableStream to a temporary file, hashing it on the way.
+// Resolves to { filePath, sha256, size }; the caller removes the file. A
+// stream error (e.g. the upload size limit) rejects and removes it.
+export const spoolToTempFile = async (stream) => {
+  await mkdir(UPLOAD_TMP_DIR, { recursive: true })
+  const filePath = tempFilePath(generateId('spool'))
+  const hash = createHash('sha256')
+  let size = 0
+
+  try {
+    await pipeline(
+      Readable.fromWeb(stream),
+      async function* (chunks) {
+        for await (const chunk of chunks) {
+          hash.update(chunk)
+          size += chunk.length
+          yield chunk
+        }
+      },
+      createWriteStream(filePath)
+    )
+  } catch (error) {
+    await rm(filePath, { force: true })
+    throw error
+  }
+
+  return { filePath, sha256: hash.digest('hex'), size }
+}
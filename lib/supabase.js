@@ -1,4 +1,14 @@
+import { createReadStream } from 'node:fs'
+import { rm } from 'node:fs/promises'
+import { Readable } from 'node:stream'
 import { createClient } from '@supabase/supabase-js'
+import { createWriteCoalescer } from './write-coalescer.js'
+import { timePhase, untimed } from './server-timing.js'
+import { generateId } from './ids.js'
+import { createDemoStore } from './demo-store.js'
+import { createTtlCache } from './idempotency.js'
+import { spoolToTempFile } from './spool.js'
+import { IMAGE_VARIANTS, VARIANT_QUALITY, canRenderVariants, loadSharp, renderVariant, variantPathFor } from './image-variants.js'
 
 const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL
 const supabaseAnonKey = process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY
@@ -14,48 +24,64 @@ if (!isDemoMode && supabaseUrl && supabaseAnonKey) {
 
 export const supabase = supabaseClient
 
-// Mock data for demo mode
-const mockSubmissions = []
+// Bounded, indexed store for demo mode (DEMO_STORE_CAPACITY rows, oldest evicted first)
+const demoStore = createDemoStore()
 
-export const submitHackathonForm = async (formData) => {
+export const getDemoStoreMetrics = () => demoStore.getMetrics()
+
+// Bumped after every successful write so cached GET responses are rebuilt
+let submissionsVersion = 0
+
+export const getSubmissionsVersion = () => submissionsVersion
+
+// Map form fields onto hackathon_submissions columns
+const toSubmissionRow = (formData) => ({
+  id: generateId('submission'),
+  team_name: formData.teamName,
+  team_lead_name: formData.teamLeadName,
+  team_lead_email: formData.teamLeadEmail,
+  team_lead_contact: formData.teamLeadContact,
+  project_title: formData.projectTitle,
+  project_description: formData.projectDescription,
+  git_link: formData.gitLink,
+  project_url: formData.projectUrl,
+  project_logo_url: formData.projectLogoUrl,
+  project_banner_url: formData.projectBannerUrl,
+  // Requires the variant columns from supabase-setup.sql
+  project_logo_variants: formData.projectLogoVariants ?? null,
+  project_banner_variants: formData.projectBannerVariants ?? null,
+  video_demo_link: formData.videoDemoLink,
+  created_at: new Date().toISOString()
+})
+
+// Insert a single submission with its own round trip
+const insertSubmission = async (formData) => {
   if (isDemoMode || !supabase) {
     // Demo mode - simulate API delay and return mock success
-    await new Promise(resolve => setTimeout(resolve, 1000))
+    await timePhase('demo-delay', () => new Promise(resolve => setTimeout(resolve, 1000)))
     const newSubmission = {
-      id: `demo_${Date.now()}`,
+      id: generateId('demo'),
       ...formData,
       createdAt: new Date().toISOString()
     }
-    mockSubmissions.push(newSubmission)
+    demoStore.insert(newSubmission)
+    submissionsVersion++
     console.log('Demo submission saved:', newSubmission)
     return { success: true, data: newSubmission }
   }
 
   try {
-    const { data, error } = await supabase
+    const { data, error } = await timePhase('db-insert', () => supabase
       .from('hackathon_submissions')
-      .insert([{
-        id: `submission_${Date.now()}`,
-        team_name: formData.teamName,
-        team_lead_name: formData.teamLeadName,
-        team_lead_email: formData.teamLeadEmail,
-        team_lead_contact: formData.teamLeadContact,
-        project_title: formData.projectTitle,
-        project_description: formData.projectDescription,
-        git_link: formData.gitLink,
-        project_url: formData.projectUrl,
-        project_logo_url: formData.projectLogoUrl,
-        project_banner_url: formData.projectBannerUrl,
-        video_demo_link: formData.videoDemoLink,
-        created_at: new Date().toISOString()
-      }])
+      .insert([toSubmissionRow(formData)])
       .select()
-      .single()
+      .single())
 
     if (error) {
       throw error
     }
 
+    submissionsVersion++
     return { success: true, data }
   } catch (error) {
     console.error('Supabase submission error:', error)
@@ -63,16 +89,103 @@ export const submitHackathonForm = async (formData) => {
   }
 }
 
+// Largest batch accepted by /api/submit/batch, and rows per multi-row INSERT
+export const MAX_BATCH_SIZE = 1000
+export const BATCH_INSERT_CHUNK_SIZE = 250
+
+// Insert many already-validated submissions with chunked multi-row inserts.
+// results[i] is { success, data } or { success, error } for formDataList[i].
+// A failed chunk is retried row by row, so one bad row only fails itself.
+export const submitHackathonForms = async (formDataList) => {
+  const results = []
+
+  for (let start = 0; start < formDataList.length; start += BATCH_INSERT_CHUNK_SIZE) {
+    const chunk = formDataList.slice(start, start + BATCH_INSERT_CHUNK_SIZE)
+
+    if (isDemoMode || !supabase) {
+      // Demo mode - one simulated round trip per chunk
+      await timePhase('demo-delay', () => new Promise(resolve => setTimeout(resolve, 1000)))
+      chunk.forEach((formData) => {
+        const newSubmission = {
+          id: generateId('demo'),
+          ...formData,
+          createdAt: new Date().toISOString()
+        }
+        demoStore.insert(newSubmission)
+        results.push({ success: true, data: newSubmission })
+      })
+      submissionsVersion++
+      console.log(`Demo batch saved: ${chunk.length} submissions`)
+      continue
+    }
+
+    try {
+      const { data, error } = await timePhase('db-insert', () => supabase
+        .from('hackathon_submissions')
+        .insert(chunk.map(toSubmissionRow))
+        .select())
+
+      if (error) {
+        throw error
+      }
+
+      // PostgREST returns inserted rows in request order
+      data.forEach(row => results.push({ success: true, data: row }))
+      submissionsVersion++
+    } catch (error) {
+      console.error('Supabase batch submission error, retrying rows one at a time:', error)
+      results.push(...await Promise.all(chunk.map(insertSubmission)))
+    }
+  }
+
+  return { success: results.every(result => result.success), results }
+}
+
+// Group commit for /api/submit: concurrent submits within the window share one
+// multi-row insert. Set SUBMIT_COALESCE_MAX_WAIT_MS=0 to insert each row on its own.
+const coalesceMaxWaitMs = Number(process.env.SUBMIT_COALESCE_MAX_WAIT_MS ?? 5)
+const coalesceMaxBatchSize = Number(process.env.SUBMIT_COALESCE_MAX_BATCH ?? 100)
+
+const insertCoalescedSubmissions = async (batch) => {
+  if (batch.length === 1) {
+    return [await insertSubmission(batch[0])]
+  }
+
+  // Rows of a failed multi-row insert are retried alone, so one bad row can't take the others down
+  const { results } = await submitHackathonForms(batch)
+  return results
+}
+
+// A flush serves many requests, so its phases aren't charged to the one that triggered it
+const submitCoalescer = createWriteCoalescer({
+  flush: (batch) => untimed(() => insertCoalescedSubmissions(batch)),
+  maxBatchSize: coalesceMaxBatchSize,
+  maxWaitMs: coalesceMaxWaitMs
+})
+
+export const submitHackathonForm = async (formData) => {
+  if (coalesceMaxWaitMs <= 0) {
+    return insertSubmission(formData)
+  }
+  // Time spent waiting for the flush plus the shared insert itself
+  return timePhase('coalesce', () => submitCoalescer.submit(formData))
+}
+
+export const getSubmitCoalescerMetrics = () => ({
+  enabled: coalesceMaxWaitMs > 0,
+  ...submitCoalescer.getMetrics()
+})
+
 export const getSubmissions = async () => {
   if (isDemoMode || !supabase) {
-    return { success: true, data: mockSubmissions }
+    return { success: true, data: await timePhase('demo-query', () => demoStore.toArray()) }
   }
 
   try {
-    const { data, error } = await supabase
+    const { data, error } = await timePhase('db-query', () => supabase
       .from('hackathon_submissions')
       .select('*')
-      .order('created_at', { ascending: false })
+      .order('created_at', { ascending: false }))
 
     if (error) {
       throw error
@@ -85,36 +198,278 @@ export const getSubmissions = async () => {
   }
 }
 
-// File upload utility for demo mode
-export const uploadFile = async (file, folder = 'uploads') => {
+// Keyset pagination over (created_at, id), newest first
+export const DEFAULT_PAGE_SIZE = 50
+export const MAX_PAGE_SIZE = 500
+
+export const encodeCursor = (row) => {
+  const createdAt = row.created_at ?? row.createdAt
+  return Buffer.from(JSON.stringify([createdAt, row.id])).toString('base64url')
+}
+
+// Cursor fields end up inside a PostgREST filter string, so only plain ISO
+// timestamps and id characters are accepted
+const CURSOR_TIMESTAMP_PATTERN = /^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{1,6})?(Z|[+-]\d{2}:\d{2})?$/
+const CURSOR_ID_PATTERN = /^[A-Za-z0-9_.-]{1,64}$/
+
+export const decodeCursor = (cursor) => {
+  try {
+    const [createdAt, id] = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'))
+    if (typeof createdAt !== 'string' || !CURSOR_TIMESTAMP_PATTERN.test(createdAt) || Number.isNaN(Date.parse(createdAt))) {
+      return null
+    }
+    if (typeof id !== 'string' || !CURSOR_ID_PATTERN.test(id)) {
+      return null
+    }
+    return { createdAt, id }
+  } catch {
+    return null
+  }
+}
+
+// Escape LIKE wildcards so a teamName prefix only matches literally
+const escapeLike = (value) => value.replace(/[\\%_]/g, '\\$&')
+
+// Each filter maps onto an index from supabase-setup.sql: team_lead_email
+// (btree), team_name (text_pattern_ops), project_title (GIN tsvector) and created_at
+const applySubmissionFilters = (query, { email, teamNamePrefix, titleTerms, from, to }) => {
+  if (email) {
+    query = query.eq('team_lead_email', email)
+  }
+  if (teamNamePrefix) {
+    query = query.like('team_name', `${escapeLike(teamNamePrefix)}%`)
+  }
+  if (titleTerms) {
+    query = query.textSearch('project_title', titleTerms.join(' '), { type: 'plain', config: 'simple' })
+  }
+  if (from) {
+    query = query.gte('created_at', from)
+  }
+  if (to) {
+    query = query.lt('created_at', to)
+  }
+  return query
+}
+
+// filters come from parseSubmissionFilters in lib/validation.js
+export const getSubmissionsPage = async ({ limit = DEFAULT_PAGE_SIZE, cursor = null, filters = {} } = {}) => {
   if (isDemoMode || !supabase) {
-    // Demo mode - simulate file upload with mock URL
-    await new Promise(resolve => setTimeout(resolve, 500))
-    const mockUrl = `https://demo-storage.supabase.co/${folder}/${Date.now()}_${file.name}`
-    console.log('Demo file upload:', mockUrl)
-    return { success: true, url: mockUrl }
+    const rows = await timePhase('demo-query', () => demoStore.query(filters, cursor, limit + 1))
+    const data = rows.slice(0, limit)
+    return { success: true, data, next: rows.length > limit ? encodeCursor(data[data.length - 1]) : null }
   }
 
   try {
-    const fileExt = file.name.split('.').pop()
-    const fileName = `${Math.random().toString(36).substring(2)}_${Date.now()}.${fileExt}`
-    const filePath = `${folder}/${fileName}`
+    let query = supabase
+      .from('hackathon_submissions')
+      .select('*')
+      .order('created_at', { ascending: false })
+      .order('id', { ascending: false })
+      .limit(limit + 1)
+
+    query = applySubmissionFilters(query, filters)
+
+    if (cursor) {
+      query = query.or(
+        `created_at.lt."${cursor.createdAt}",and(created_at.eq."${cursor.createdAt}",id.lt."${cursor.id}")`
+      )
+    }
 
-    const { data, error } = await supabase.storage
-      .from('hackathon-assets')
-      .upload(filePath, file)
+    const { data, error } = await timePhase('db-query', () => query)
 
     if (error) {
       throw error
     }
 
-    const { data: urlData } = supabase.storage
-      .from('hackathon-assets')
-      .getPublicUrl(filePath)
+    const rows = data || []
+    const page = rows.slice(0, limit)
+    return { success: true, data: page, next: rows.length > limit ? encodeCursor(page[page.length - 1]) : null }
+  } catch (error) {
+    console.error('Supabase fetch error:', error)
+    return { success: false, error: error.message }
+  }
+}
+
+// Uploads are content-addressed: <folder>/<sha256>.<ext>. Identical files map
+// to one object, so re-uploading a logo returns the existing URL without a
+// storage write. Object paths known to exist are cached in front of the
+// storage lookup; objects are never overwritten, so entries cannot go stale.
+export const UPLOAD_URL_CACHE_MAX_ENTRIES = 5000
+export const UPLOAD_URL_CACHE_TTL_MS = 60 * 60 * 1000
+
+const uploadUrlCache = createTtlCache({ maxEntries: UPLOAD_URL_CACHE_MAX_ENTRIES, ttlMs: UPLOAD_URL_CACHE_TTL_MS })
+
+// Writes in flight per object path, so concurrent identical uploads share one
+const pendingObjectWrites = new Map()
+
+// Object paths "stored" in demo mode
+const demoObjects = createTtlCache({ maxEntries: 100000, ttlMs: 7 * 24 * 60 * 60 * 1000 })
+
+const uploadMetrics = { uploads: 0, cacheHits: 0, storageHits: 0, sharedWrites: 0, writes: 0, bytesReceived: 0, bytesWritten: 0, variantsWritten: 0 }
+
+export const getUploadMetrics = () => ({ ...uploadMetrics, cachedUrls: uploadUrlCache.size })
+
+const objectPathFor = (name, sha256, folder) => {
+  const fileExt = name.includes('.') ? name.split('.').pop().toLowerCase() : ''
+  return `${folder}/${sha256}${/^[a-z0-9]{1,10}$/.test(fileExt) ? `.${fileExt}` : ''}`
+}
+
+const publicUrlFor = (objectPath) => {
+  if (isDemoMode || !supabase) {
+    return `https://demo-storage.supabase.co/${objectPath}`
+  }
+  return supabase.storage.from('hackathon-assets').getPublicUrl(objectPath).data.publicUrl
+}
+
+// Resolves to true when the object was written, false when it already existed.
+// body() is called only when a write is needed; it returns a Buffer or ReadableStream.
+const writeObject = async (objectPath, body, type) => {
+  if (isDemoMode || !supabase) {
+    if (demoObjects.get(objectPath)) {
+      return false
+    }
+    // Demo mode - read the content as storage would, then simulate the upload
+    const content = await body()
+    if (content instanceof ReadableStream) {
+      for await (const chunk of content) {} // eslint-disable-line no-unused-vars
+    }
+    await new Promise(resolve => setTimeout(resolve, 500))
+    demoObjects.set(objectPath, true)
+    console.log('Demo file upload:', publicUrlFor(objectPath))
+    return true
+  }
+
+  const bucket = supabase.storage.from('hackathon-assets')
+  const { data: exists, error: existsError } = await bucket.exists(objectPath)
+  if (existsError) {
+    throw existsError
+  }
+  if (exists) {
+    return false
+  }
+
+  // duplex: 'half' lets fetch send a ReadableStream request body
+  const { error } = await bucket.upload(objectPath, await body(), {
+    contentType: type,
+    upsert: false,
+    duplex: 'half'
+  })
+  if (error) {
+    // Another instance stored the same content first
+    if (String(error.statusCode) === '409' || /already exists|duplicate/i.test(error.message)) {
+      return false
+    }
+    throw error
+  }
+  return true
+}
+
+// Store an object unless it already exists. Resolves to { url, written, cached, shared }:
+// cached when the URL cache answered, shared when an identical write was in flight.
+const storeObject = async (objectPath, body, type) => {
+  const cachedUrl = uploadUrlCache.get(objectPath)
+  if (cachedUrl) {
+    return { url: cachedUrl, written: false, cached: true }
+  }
 
-    return { success: true, url: urlData.publicUrl }
+  let write = pendingObjectWrites.get(objectPath)
+  if (write) {
+    await write
+    return { url: publicUrlFor(objectPath), written: false, shared: true }
+  }
+
+  write = writeObject(objectPath, body, type).finally(() => pendingObjectWrites.delete(objectPath))
+  pendingObjectWrites.set(objectPath, write)
+  const written = await write
+  const url = publicUrlFor(objectPath)
+  uploadUrlCache.set(objectPath, url)
+  return { url, written }
+}
+
+// URLs of the IMAGE_VARIANTS of a stored image, or null when the type has none.
+// Variants are content-addressed like their original, so they are rendered once.
+const createImageVariants = async ({ filePath, objectPath, type }) => {
+  if (!canRenderVariants(type)) {
+    return null
+  }
+
+  const sharp = await loadSharp()
+  const entries = await Promise.all(Object.entries(IMAGE_VARIANTS).map(async ([variant, { width, height }]) => {
+    if (!sharp && !isDemoMode && supabase) {
+      // Without sharp, Supabase renders the variant on first request and caches it
+      const { data } = supabase.storage.from('hackathon-assets').getPublicUrl(objectPath, {
+        transform: { width, height, resize: 'contain', quality: VARIANT_QUALITY }
+      })
+      return [variant, data.publicUrl]
+    }
+
+    // In demo mode without sharp the variant is only simulated
+    const stored = await storeObject(variantPathFor(objectPath, variant), async () => sharp && renderVariant(sharp, filePath, variant), 'image/webp')
+    if (stored.written) {
+      uploadMetrics.variantsWritten++
+    }
+    return [variant, stored.url]
+  }))
+  return Object.fromEntries(entries)
+}
+
+// Store a file that is already on local disk (its sha256 and size known) under
+// its content address. With options.variants, also returns URLs of its
+// IMAGE_VARIANTS. Resolves to { success, url, deduplicated, variants? } or { success, error }.
+export const uploadLocalFile = async ({ filePath, sha256, size, name, type }, folder = 'uploads', options = {}) => {
+  const objectPath = objectPathFor(name, sha256, folder)
+  uploadMetrics.uploads++
+  uploadMetrics.bytesReceived += size
+
+  let result
+  try {
+    const stored = await timePhase('storage', () => storeObject(objectPath, () => Readable.toWeb(createReadStream(filePath)), type))
+    if (stored.cached) {
+      uploadMetrics.cacheHits++
+    } else if (stored.shared) {
+      uploadMetrics.sharedWrites++
+    } else if (stored.written) {
+      uploadMetrics.writes++
+      uploadMetrics.bytesWritten += size
+    } else {
+      uploadMetrics.storageHits++
+    }
+    result = { success: true, url: stored.url, deduplicated: !stored.written }
   } catch (error) {
     console.error('File upload error:', error)
     return { success: false, error: error.message }
   }
-}
\ No newline at end of file
+
+  if (options.variants) {
+    // A failed variant never fails the upload itself
+    try {
+      result.variants = await timePhase('variants', () => createImageVariants({ filePath, objectPath, type }))
+    } catch (error) {
+      console.error('Image variant error:', error)
+      result.variants = null
+    }
+  }
+  return result
+}
+
+// Upload a stream to the hackathon-assets bucket. file is { name, type, stream };
+// the stream is hashed while it is spooled to a temporary file (never held in
+// memory), then stored by uploadLocalFile.
+export const uploadStream = async ({ name, type, stream }, folder = 'uploads', options = {}) => {
+  let spooled
+  try {
+    spooled = await timePhase('spool', () => spoolToTempFile(stream))
+  } catch (error) {
+    return { success: false, error: error.message }
+  }
+
+  try {
+    return await uploadLocalFile({ ...spooled, name, type }, folder, options)
+  } finally {
+    await rm(spooled.filePath, { force: true })
+  }
+}
+
+// File upload utility for File/Blob values
+export const uploadFile = async (file, folder = 'uploads', options = {}) =>
+  uploadStream({ name: file.name, type: file.type, stream: file.stream() }, folder, options)
@@ -0,0 +1,134 @@
+import { IMAGE_VARIANTS } from './image-variants.js'
+
+export const REQUIRED_FIELDS = ['teamName', 'teamLeadName', 'teamLeadEmail', 'teamLeadContact', 'projectTitle', 'projectDescription']
+
+export const MAX_DESCRIPTION_WORDS = 100
+
+// Matches the CHECK on hackathon_submissions.project_description (char_length counts code points)
+export const MAX_DESCRIPTION_LENGTH = 1000
+
+// Longest accepted value of the other text fields, in UTF-16 units like String#length
+export const MAX_FIELD_LENGTHS = {
+  teamName: 200,
+  teamLeadName: 200,
+  teamLeadEmail: 254,
+  teamLeadContact: 50,
+  projectTitle: 200,
+  gitLink: 2048,
+  projectUrl: 2048,
+  projectLogoUrl: 2048,
+  projectBannerUrl: 2048,
+  videoDemoLink: 2048
+}
+
+// { thumbnail, medium } URLs from /api/upload?variants=true, stored as JSONB
+export const VARIANT_FIELDS = ['projectLogoVariants', 'projectBannerVariants']
+
+// Exactly one http(s) URL per IMAGE_VARIANTS entry, so nothing else the client sends is persisted
+const isVariantUrls = (value) =>
+  typeof value === 'object' && value !== null && !Array.isArray(value) &&
+  Object.keys(value).length === Object.keys(IMAGE_VARIANTS).length &&
+  Object.keys(IMAGE_VARIANTS).every(variant =>
+    typeof value[variant] === 'string' &&
+    value[variant].length <= MAX_FIELD_LENGTHS.projectLogoUrl &&
+    /^https?:\/\//.test(value[variant])
+  )
+
+// Request bodies over these sizes get a 413 before they are parsed. A submission
+// within the field limits is far smaller; a full batch averages 8KB per entry.
+export const MAX_SUBMISSION_BYTES = 64 * 1024
+export const MAX_BATCH_BYTES = 8 * 1024 * 1024
+
+// Same count as text.trim().split(/\s+/).length without building the array,
+// stopping once the count passes stopAfter
+export const countWords = (text, stopAfter = Infinity) => {
+  const words = /\S+/g
+  let count = 0
+  while (count <= stopAfter && words.exec(text)) {
+    count++
+  }
+  // split() of an all-whitespace string still yields one (empty) word
+  return Math.max(count, 1)
+}
+
+// Returns the error message for an invalid submission, or null when it is valid
+export const validateSubmission = (body) => {
+  const { teamName, teamLeadName, teamLeadEmail, teamLeadContact, projectTitle, projectDescription } = body || {}
+
+  if (!teamName || !teamLeadName || !teamLeadEmail || !teamLeadContact || !projectTitle || !projectDescription) {
+    return `Missing required fields: ${REQUIRED_FIELDS.join(', ')}`
+  }
+
+  // Everything below (and the demo store's indexes) relies on these being strings
+  const notString = REQUIRED_FIELDS.find(field => typeof body[field] !== 'string')
+  if (notString) {
+    return `${notString} must be a string`
+  }
+
+  const tooLong = Object.keys(MAX_FIELD_LENGTHS).find(field => typeof body[field] === 'string' && body[field].length > MAX_FIELD_LENGTHS[field])
+  if (tooLong) {
+    return `${tooLong} must be ${MAX_FIELD_LENGTHS[tooLong]} characters or less`
+  }
+
+  const badVariants = VARIANT_FIELDS.find(field => body[field] != null && !isVariantUrls(body[field]))
+  if (badVariants) {
+    return `${badVariants} must be an object of thumbnail and medium URLs`
+  }
+
+  // Validate project description word count (max 100 words). Counting stops at
+  // 101; only a description already rejected is counted in full for the message.
+  if (countWords(projectDescription, MAX_DESCRIPTION_WORDS) > MAX_DESCRIPTION_WORDS) {
+    return `Project description must be ${MAX_DESCRIPTION_WORDS} words or less. Current: ${countWords(projectDescription)} words.`
+  }
+
+  // A string has at least as many UTF-16 units as code points, so only long ones need counting
+  if (projectDescription.length > MAX_DESCRIPTION_LENGTH && [...projectDescription].length > MAX_DESCRIPTION_LENGTH) {
+    return `Project description must be ${MAX_DESCRIPTION_LENGTH} characters or less.`
+  }
+
+  return null
+}
+
+// Query parameters accepted by GET /api/submissions for indexed filtering
+export const SUBMISSION_FILTER_PARAMS = ['email', 'teamName', 'title', 'from', 'to']
+
+// Lowercased word tokens, close to what to_tsvector('simple', ...) produces
+export const tokenizeTitle = (text) => typeof text === 'string' ? text.toLowerCase().match(/[\p{L}\p{N}]+/gu) ?? [] : []
+
+const parseTimestamp = (value) => {
+  const time = Date.parse(value)
+  return Number.isNaN(time) ? null : new Date(time).toISOString()
+}
+
+// Parse filter query parameters into { filters } or { error }.
+// email is an exact match, teamName a case-sensitive prefix, title needs every
+// word to appear in the project title, and from <= createdAt < to.
+export const parseSubmissionFilters = (searchParams) => {
+  const filters = {}
+
+  if (searchParams.get('email')) {
+    filters.email = searchParams.get('email')
+  }
+
+  if (searchParams.get('teamName')) {
+    filters.teamNamePrefix = searchParams.get('teamName')
+  }
+
+  if (searchParams.get('title')) {
+    filters.titleTerms = [...new Set(tokenizeTitle(searchParams.get('title')))]
+    if (filters.titleTerms.length === 0) {
+      return { error: 'title must contain at least one word' }
+    }
+  }
+
+  for (const bound of ['from', 'to']) {
+    if (searchParams.get(bound)) {
+      filters[bound] = parseTimestamp(searchParams.get(bound))
+      if (!filters[bound]) {
+        return { error: `${bound} must be an ISO 8601 timestamp` }
+      }
+    }
+  }
+
+  return { filters }
+}
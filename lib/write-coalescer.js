@@ -0,0 +1,68 @@
+// Group commit: concurrent writes arriving within maxWaitMs (or until maxBatchSize
+// is reached) are flushed together. flush(items) must resolve to one result per
+// item, in order; each caller's promise resolves with its own result.
+export const createWriteCoalescer = ({ flush, maxBatchSize = 100, maxWaitMs = 5 }) => {
+  let pending = []
+  let timer = null
+
+  const metrics = {
+    flushes: 0,
+    items: 0,
+    maxFlushSize: 0,
+    totalWaitMs: 0,
+    maxWaitMs: 0,
+    // Flush counts keyed by power-of-two size bucket (1, 2, 4, ...)
+    flushSizes: {}
+  }
+
+  const drain = async () => {
+    clearTimeout(timer)
+    timer = null
+    const batch = pending
+    pending = []
+
+    const flushedAt = performance.now()
+    metrics.flushes += 1
+    metrics.items += batch.length
+    metrics.maxFlushSize = Math.max(metrics.maxFlushSize, batch.length)
+    const bucket = 2 ** Math.floor(Math.log2(batch.length))
+    metrics.flushSizes[bucket] = (metrics.flushSizes[bucket] || 0) + 1
+    for (const entry of batch) {
+      const waited = flushedAt - entry.enqueuedAt
+      metrics.totalWaitMs += waited
+      metrics.maxWaitMs = Math.max(metrics.maxWaitMs, waited)
+    }
+
+    let results
+    try {
+      results = await flush(batch.map(entry => entry.item))
+    } catch (error) {
+      results = batch.map(() => ({ success: false, error: error.message }))
+    }
+    batch.forEach((entry, index) => entry.resolve(results[index]))
+  }
+
+  const submit = (item) => new Promise(resolve => {
+    pending.push({ item, resolve, enqueuedAt: performance.now() })
+    if (pending.length >= maxBatchSize) {
+      drain()
+    } else if (!timer) {
+      timer = setTimeout(drain, maxWaitMs)
+    }
+  })
+
+  const getMetrics = () => ({
+    maxBatchSize,
+    maxWaitMs,
+    pending: pending.length,
+    flushes: metrics.flushes,
+    items: metrics.items,
+    meanFlushSize: metrics.flushes ? metrics.items / metrics.flushes : 0,
+    maxFlushSize: metrics.maxFlushSize,
+    flushSizes: { ...metrics.flushSizes },
+    meanWaitMs: metrics.items ? metrics.totalWaitMs / metrics.items : 0,
+    maxObservedWaitMs: metrics.maxWaitMs
+  })
+
+  return { submit, getMetrics }
+}
@@ -0,0 +1,1986 @@
+#!/usr/bin/env python3
+"""
+Local stand-in server for the Hackathon Form Submission API
+Mirrors the demo-mode semantics of app/api/[[...path]]/route.js and lib/supabase.js
+so backend_test.py can run its functional and load suites without network access
+"""
+
+import argparse
+import asyncio
+import base64
+import bisect
+import contextlib
+import contextvars
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import tempfile
+import time
+import urllib.parse
+from collections import OrderedDict
+from datetime import datetime, timezone
+from http import HTTPStatus
+
+# Demo delays from lib/supabase.js (seconds)
+SUBMIT_DELAY = 1.0
+UPLOAD_DELAY = 0.5
+
+# Upload limits from lib/multipart.js
+MAX_UPLOAD_SIZE = 15 * 1024 * 1024
+MULTIPART_OVERHEAD_ALLOWANCE = 64 * 1024
+MAX_PART_HEADER_BYTES = 16 * 1024
+MAX_FIELD_BYTES = 64 * 1024
+SNIFF_BYTES = 512
+UPLOAD_TOO_LARGE_ERROR = 'File size must be less than 15MB'
+
+# Resumable upload limits from lib/chunked-upload.js
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+MAX_UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024
+UPLOAD_SESSION_TTL = 24 * 60 * 60
+MAX_UPLOAD_SESSIONS = 1000
+UPLOAD_TMP_DIR = os.getenv('UPLOAD_TMP_DIR') or os.path.join(tempfile.gettempdir(), 'hackathon-uploads')
+
+# Demo storage: URLs point at the fake Supabase host unless --storage-dir keeps
+# the objects, in which case this server serves them itself under /demo-storage/
+DEMO_STORAGE_URL = 'https://demo-storage.supabase.co'
+STORAGE_DIR = None
+
+# Request bodies are read in pieces of at most this size
+BODY_READ_SIZE = 64 * 1024
+# After answering before the body was read, discard at most this much of it
+# (or for this long) so the client sees the response instead of a reset
+LINGER_MAX_BYTES = 32 * 1024 * 1024
+LINGER_TIMEOUT = 2.0
+
+MAX_DESCRIPTION_LENGTH = 1000
+MAX_DESCRIPTION_WORDS = 100
+
+# Limits from lib/validation.js: other text fields (in UTF-16 units), variant URL fields and request bodies
+MAX_FIELD_LENGTHS = {
+    'teamName': 200,
+    'teamLeadName': 200,
+    'teamLeadEmail': 254,
+    'teamLeadContact': 50,
+    'projectTitle': 200,
+    'gitLink': 2048,
+    'projectUrl': 2048,
+    'projectLogoUrl': 2048,
+    'projectBannerUrl': 2048,
+    'videoDemoLink': 2048,
+}
+VARIANT_FIELDS = ['projectLogoVariants', 'projectBannerVariants']
+MAX_SUBMISSION_BYTES = 64 * 1024
+MAX_BATCH_BYTES = 8 * 1024 * 1024
+
+REQUIRED_FIELDS = ['teamName', 'teamLeadName', 'teamLeadEmail', 'teamLeadContact', 'projectTitle', 'projectDescription']
+MISSING_FIELDS_ERROR = 'Missing required fields: teamName, teamLeadName, teamLeadEmail, teamLeadContact, projectTitle, projectDescription'
+
+# JavaScript's \s and String.prototype.trim() whitespace set, which differs from Python's
+JS_WHITESPACE = '\t\n\v\f\r \u00a0\u1680\u2000-\u200a\u2028\u2029\u202f\u205f\u3000\ufeff'
+JS_WORD_RE = re.compile(f'[^{JS_WHITESPACE}]+')
+
+CORS_HEADERS = {
+    'Access-Control-Allow-Origin': '*',
+    'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
+    'Access-Control-Allow-Headers': 'Content-Type, Authorization, Idempotency-Key, If-None-Match, Content-Digest',
+}
+
+MAX_HEADER_BYTES = 64 * 1024
+
+# Batch submission limits from lib/supabase.js
+MAX_BATCH_SIZE = 1000
+BATCH_INSERT_CHUNK_SIZE = 250
+
+# Group commit settings for /api/submit (SUBMIT_COALESCE_* in lib/supabase.js)
+COALESCE_MAX_WAIT_MS = float(os.getenv('SUBMIT_COALESCE_MAX_WAIT_MS', 5))
+COALESCE_MAX_BATCH = int(os.getenv('SUBMIT_COALESCE_MAX_BATCH', 100))
+
+# Concurrent simulated insert round trips (0 = unlimited); models the connection
+# and PostgREST rate limits a burst of single-row inserts runs into
+DB_CONNECTIONS = 0
+db_semaphore = None
+
+# Server-Timing from lib/server-timing.js
+SERVER_TIMING_ENABLED = os.getenv('SERVER_TIMING') != 'off'
+SERVER_TIMING_LOG = os.getenv('SERVER_TIMING_LOG') == '1'
+
+# Idempotency-Key limits from lib/idempotency.js
+IDEMPOTENCY_TTL = 24 * 60 * 60
+IDEMPOTENCY_MAX_ENTRIES = 10000
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+
+# Keyset pagination limits from lib/supabase.js
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# GET response cache settings from lib/response-cache.js
+RESPONSE_CACHE_TTL = float(os.getenv('RESPONSE_CACHE_TTL_MS', '2000')) / 1000
+RESPONSE_CACHE_MAX_ENTRIES = 256
+
+# Filter query parameters accepted by GET /api/submissions, from lib/validation.js
+SUBMISSION_FILTER_PARAMS = ['email', 'teamName', 'title', 'from', 'to']
+
+# Rows fetched per page while exporting, and the formats /api/submissions/export serves
+EXPORT_PAGE_SIZE = 500
+EXPORT_FORMATS = {
+    'ndjson': {'content_type': 'application/x-ndjson', 'extension': 'ndjson'},
+    'csv': {'content_type': 'text/csv; charset=utf-8', 'extension': 'csv'},
+}
+
+# CSV columns as (header, demo field, database column), as in lib/export.js
+CSV_COLUMNS = [
+    ('id', 'id', 'id'),
+    ('teamName', 'teamName', 'team_name'),
+    ('teamLeadName', 'teamLeadName', 'team_lead_name'),
+    ('teamLeadEmail', 'teamLeadEmail', 'team_lead_email'),
+    ('teamLeadContact', 'teamLeadContact', 'team_lead_contact'),
+    ('projectTitle', 'projectTitle', 'project_title'),
+    ('projectDescription', 'projectDescription', 'project_description'),
+    ('gitLink', 'gitLink', 'git_link'),
+    ('projectUrl', 'projectUrl', 'project_url'),
+    ('projectLogoUrl', 'projectLogoUrl', 'project_logo_url'),
+    ('projectBannerUrl', 'projectBannerUrl', 'project_banner_url'),
+    ('videoDemoLink', 'videoDemoLink', 'video_demo_link'),
+    ('createdAt', 'createdAt', 'created_at'),
+]
+
+# Capacity of the demo store, as DEMO_STORE_CAPACITY in lib/demo-store.js
+DEMO_STORE_CAPACITY = int(os.getenv('DEMO_STORE_CAPACITY', '10000'))
+
+class Request:
+    """A parsed HTTP request"""
+
+    def __init__(self, method, target, headers, body):
+        self.method = method
+        self.path, _, self.query = target.partition('?')
+        self.headers = headers
+        self.body = body
+        # BodyStream for requests handled before their body is read (uploads)
+        self.stream = None
+
+class Response:
+    """An HTTP response ready to be written to the wire.
+
+    `body` is either bytes or an async iterator of bytes, which is sent with
+    chunked transfer encoding.
+    """
+
+    def __init__(self, status=200, body=b'', headers=None):
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+
+def js_json(value):
+    """Equivalent of JSON.stringify for plain data"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+def json_response(payload, status=200):
+    """Equivalent of NextResponse.json: compact JSON, UTF-8"""
+    return Response(status, js_json(payload).encode('utf-8'), {'Content-Type': 'application/json'})
+
+# Phases of the request being handled: {name: milliseconds}, or None outside a request
+request_phases = contextvars.ContextVar('request_phases', default=None)
+
+@contextlib.contextmanager
+def time_phase(name):
+    """Equivalent of timePhase: record the time spent in the block as phase `name` (summed if repeated)"""
+    phases = request_phases.get()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if phases is not None:
+            phases[name] = phases.get(name, 0) + (time.perf_counter() - start) * 1000
+
+async def untimed(fn):
+    """Equivalent of untimed: await fn() outside of any request's timings"""
+    token = request_phases.set(None)
+    try:
+        return await fn()
+    finally:
+        request_phases.reset(token)
+
+def format_server_timing(phases):
+    return ', '.join(f"{name};dur={duration:.1f}" for name, duration in phases.items())
+
+async def with_server_timing(method, path, handler):
+    """Equivalent of withServerTiming: await handler() and attach its phases to the Response"""
+    if not SERVER_TIMING_ENABLED and not SERVER_TIMING_LOG:
+        return await handler()
+
+    phases = {}
+    token = request_phases.set(phases)
+    start = time.perf_counter()
+    try:
+        response = await handler()
+    finally:
+        request_phases.reset(token)
+    phases['total'] = (time.perf_counter() - start) * 1000
+
+    if SERVER_TIMING_ENABLED:
+        response.headers['Server-Timing'] = format_server_timing(phases)
+    if SERVER_TIMING_LOG:
+        print(js_json({
+            'event': 'server-timing',
+            'method': method,
+            'path': path,
+            'status': response.status,
+            'phases': {name: round(duration, 1) for name, duration in phases.items()},
+        }), flush=True)
+    return response
+
+class MonotonicUlid:
+    """Equivalent of ulid() in lib/ids.js: 48-bit ms time + 80 random bits, monotonic within a millisecond"""
+
+    def __init__(self):
+        self.last_time = -1
+        self.last_random = 0
+
+    def __call__(self):
+        now = int(time.time() * 1000)
+        if now <= self.last_time:
+            self.last_random += 1
+            if self.last_random >= 1 << 80:
+                raise OverflowError('ID random component overflowed within one millisecond')
+        else:
+            self.last_time = now
+            self.last_random = int.from_bytes(os.urandom(10), 'big')
+        value = (self.last_time << 80) | self.last_random
+        return ''.join(ULID_ENCODING[(value >> shift) & 31] for shift in range(125, -1, -5))
+
+ULID_ENCODING = '0123456789ABCDEFGHJKMNPQRSTVWXYZ'
+ulid = MonotonicUlid()
+
+def generate_id(prefix):
+    return f"{prefix}_{ulid()}"
+
+class TtlCache:
+    """Equivalent of createTtlCache: bounded LRU with per-entry expiry.
+
+    on_evict(key, value) runs for entries that expire or are pushed out, not for delete().
+    """
+
+    def __init__(self, max_entries=IDEMPOTENCY_MAX_ENTRIES, ttl=IDEMPOTENCY_TTL, on_evict=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self.entries = OrderedDict()
+
+    def evict(self, key):
+        value, _ = self.entries.pop(key)
+        if self.on_evict:
+            self.on_evict(key, value)
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] <= time.monotonic():
+            self.evict(key)
+            return None
+        self.entries.move_to_end(key)
+        return entry[0]
+
+    def set(self, key, value):
+        self.entries[key] = (value, time.monotonic() + self.ttl)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.evict(next(iter(self.entries)))
+
+    def delete(self, key):
+        self.entries.pop(key, None)
+
+    def prune(self):
+        now = time.monotonic()
+        for key in [key for key, (_, expires_at) in self.entries.items() if expires_at <= now]:
+            self.evict(key)
+
+idempotency_cache = TtlCache()
+
+async def run_idempotent(scope, key, request_fingerprint, handler):
+    """Equivalent of runIdempotent, with handler returning a Response"""
+    if not key:
+        return await handler()
+
+    if len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+        return json_response({'error': f"Idempotency-Key must be {MAX_IDEMPOTENCY_KEY_LENGTH} characters or less"}, 400)
+
+    cache_key = f"{scope}:{key}"
+    cached = idempotency_cache.get(cache_key)
+    if cached:
+        stored_fingerprint, task = cached
+        if request_fingerprint and stored_fingerprint != request_fingerprint:
+            return json_response({'error': 'Idempotency-Key was already used with a different request'}, 422)
+        original = await asyncio.shield(task)
+        return Response(original.status, original.body, {**original.headers, 'Idempotent-Replayed': 'true'})
+
+    task = asyncio.ensure_future(handler())
+    idempotency_cache.set(cache_key, (request_fingerprint, task))
+    try:
+        response = await asyncio.shield(task)
+    except Exception:
+        idempotency_cache.delete(cache_key)
+        raise
+    if response.status >= 500:
+        idempotency_cache.delete(cache_key)
+    return response
+
+def row_key(row):
+    """Sort key of a stored row, as compareRows in lib/demo-store.js"""
+    return (row['createdAt'], row['id'])
+
+def index_key(value):
+    """Equivalent of indexKey: always a string, so the sorted team name keys stay comparable"""
+    return ('' if value is None else value if isinstance(value, str) else js_json(value)).lower()
+
+def tokenize_title(text):
+    """Equivalent of tokenizeTitle in lib/validation.js"""
+    return re.findall(r'[^\W_]+', text.lower()) if isinstance(text, str) else []
+
+class DemoStore:
+    """Equivalent of createDemoStore: bounded, (createdAt, id)-ordered, oldest evicted first.
+
+    Secondary indexes map a case-insensitive email, team name or title term to
+    the rows carrying it (dicts used as insertion-ordered sets keyed by id).
+    """
+
+    def __init__(self, capacity=None):
+        self.capacity = DEMO_STORE_CAPACITY if capacity is None else capacity
+        # rows[head:] are live; evicted slots are dropped in one slice once they make up half the list
+        self.rows = []
+        self.head = 0
+        self.evicted = 0
+        self.by_id = {}
+        self.by_email = {}
+        self.by_team_name = {}
+        self.by_title_term = {}
+        # Distinct team name keys in sorted order, for prefix range lookups
+        self.team_name_keys = []
+
+    def bisect_created_at(self, created_at, right):
+        if right:
+            return bisect.bisect_right(self.rows, created_at, self.head, key=lambda row: row['createdAt'])
+        return bisect.bisect_left(self.rows, created_at, self.head, key=lambda row: row['createdAt'])
+
+    @staticmethod
+    def remove_from_index(index, key, row):
+        entries = index.get(key)
+        if entries is not None:
+            entries.pop(row['id'], None)
+            if not entries:
+                del index[key]
+
+    def evict_oldest(self):
+        row = self.rows[self.head]
+        self.rows[self.head] = None
+        self.head += 1
+        if self.head * 2 >= len(self.rows):
+            del self.rows[:self.head]
+            self.head = 0
+        del self.by_id[row['id']]
+        self.remove_from_index(self.by_email, index_key(row.get('teamLeadEmail')), row)
+        team_key = index_key(row.get('teamName'))
+        self.remove_from_index(self.by_team_name, team_key, row)
+        if team_key not in self.by_team_name:
+            del self.team_name_keys[bisect.bisect_left(self.team_name_keys, team_key)]
+        for term in set(tokenize_title(row.get('projectTitle'))):
+            self.remove_from_index(self.by_title_term, term, row)
+        self.evicted += 1
+        return row
+
+    def insert(self, row):
+        # Rows almost always arrive in order; fall back to a sorted insert if the clock stepped back
+        if len(self.rows) == self.head or row_key(self.rows[-1]) <= row_key(row):
+            self.rows.append(row)
+        else:
+            self.rows.insert(bisect.bisect_right(self.rows, row_key(row), self.head, key=row_key), row)
+        self.by_id[row['id']] = row
+        self.by_email.setdefault(index_key(row.get('teamLeadEmail')), {})[row['id']] = row
+        team_key = index_key(row.get('teamName'))
+        if team_key not in self.by_team_name:
+            bisect.insort(self.team_name_keys, team_key)
+        self.by_team_name.setdefault(team_key, {})[row['id']] = row
+        for term in set(tokenize_title(row.get('projectTitle'))):
+            self.by_title_term.setdefault(term, {})[row['id']] = row
+        return self.evict_oldest() if len(self.by_id) > self.capacity else None
+
+    def get(self, row_id):
+        return self.by_id.get(row_id)
+
+    def matches_filters(self, row, filters):
+        if filters.get('email') and row.get('teamLeadEmail') != filters['email']:
+            return False
+        prefix = filters.get('teamNamePrefix')
+        if prefix and not (isinstance(row.get('teamName'), str) and row['teamName'].startswith(prefix)):
+            return False
+        if filters.get('titleTerms') and not all(row['id'] in self.by_title_term.get(term, {}) for term in filters['titleTerms']):
+            return False
+        return (not filters.get('from') or row['createdAt'] >= filters['from']) and (not filters.get('to') or row['createdAt'] < filters['to'])
+
+    def query(self, filters=None, cursor=None, count=None):
+        """Equivalent of query: matching rows before the cursor, newest first, up to `count`.
+
+        Starts from whichever index yields the fewest candidates.
+        """
+        filters = filters or {}
+        start = self.bisect_created_at(filters['from'], False) if filters.get('from') else self.head
+        end = self.bisect_created_at(filters['to'], False) if filters.get('to') else len(self.rows)
+        if cursor:
+            end = min(end, self.bisect_created_at(cursor['createdAt'], True))
+        start = min(start, end)
+
+        candidates = None
+        candidate_size = end - start
+
+        def consider(entries):
+            nonlocal candidates, candidate_size
+            size = sum(len(rows) for rows in entries)
+            if size < candidate_size:
+                candidates, candidate_size = entries, size
+
+        if filters.get('email'):
+            consider([self.by_email.get(index_key(filters['email']), {})])
+        if filters.get('teamNamePrefix'):
+            prefix = index_key(filters['teamNamePrefix'])
+            entries = []
+            for key in self.team_name_keys[bisect.bisect_left(self.team_name_keys, prefix):]:
+                if not key.startswith(prefix):
+                    break
+                entries.append(self.by_team_name[key])
+            consider(entries)
+        for term in filters.get('titleTerms') or []:
+            consider([self.by_title_term.get(term, {})])
+
+        cursor_key = (cursor['createdAt'], cursor['id']) if cursor else None
+
+        def is_candidate(row):
+            return self.matches_filters(row, filters) and (not cursor_key or row_key(row) < cursor_key)
+
+        if candidates is not None:
+            result = sorted((row for rows in candidates for row in rows.values() if is_candidate(row)), key=row_key, reverse=True)
+            return result if count is None else result[:count]
+
+        result = []
+        for index in range(end - 1, start - 1, -1):
+            if count is not None and len(result) >= count:
+                break
+            if is_candidate(self.rows[index]):
+                result.append(self.rows[index])
+        return result
+
+    def to_list(self):
+        return self.rows[self.head:]
+
+    def __len__(self):
+        return len(self.by_id)
+
+    def get_metrics(self):
+        return {'size': len(self.by_id), 'capacity': self.capacity, 'evicted': self.evicted}
+
+demo_store = DemoStore()
+
+# Bumped after every successful write so cached GET responses are rebuilt
+submissions_version = 0
+
+def bump_submissions_version():
+    global submissions_version
+    submissions_version += 1
+
+response_cache = TtlCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL)
+response_cache_metrics = {'hits': 0, 'misses': 0, 'notModified': 0}
+
+def etag_for(body):
+    """Equivalent of etagFor: quoted base64url SHA-1 of the serialized body"""
+    return '"' + base64.urlsafe_b64encode(hashlib.sha1(body).digest()).decode('ascii').rstrip('=') + '"'
+
+def matches_if_none_match(header, etag):
+    """Equivalent of matchesIfNoneMatch (weak comparison)"""
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    return any(re.sub(r'^W/', '', tag.strip()) == etag for tag in header.split(','))
+
+async def get_cached_response(key, version, produce):
+    """Equivalent of getCachedResponse, with produce returning a Response; returns (Response, hit)"""
+    cached = response_cache.get(key)
+    if cached and cached[0] == version:
+        response_cache_metrics['hits'] += 1
+        return await asyncio.shield(cached[1]), True
+
+    response_cache_metrics['misses'] += 1
+    async def produce_tagged():
+        response = await produce()
+        if response.status == 200:
+            response.headers['ETag'] = etag_for(response.body)
+        return response
+
+    task = asyncio.ensure_future(produce_tagged())
+    response_cache.set(key, (version, task))
+    try:
+        response = await asyncio.shield(task)
+    except Exception:
+        response_cache.delete(key)
+        raise
+    if response.status != 200:
+        response_cache.delete(key)
+    return response, False
+
+def get_response_cache_metrics():
+    lookups = response_cache_metrics['hits'] + response_cache_metrics['misses']
+    return {
+        **response_cache_metrics,
+        'entries': len(response_cache.entries),
+        'hitRatio': response_cache_metrics['hits'] / lookups if lookups else 0,
+    }
+
+async def cached_json_response(request, key, version, produce):
+    """Equivalent of cachedJsonResponse in the route: 304 when If-None-Match still matches"""
+    with time_phase('cache'):
+        response, hit = await get_cached_response(key, version, produce)
+    if response.status != 200:
+        return response
+
+    etag = response.headers['ETag']
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache', 'X-Cache': 'HIT' if hit else 'MISS'}
+    if matches_if_none_match(request.headers.get('if-none-match'), etag):
+        response_cache_metrics['notModified'] += 1
+        return Response(304, b'', headers)
+    return Response(200, response.body, {**headers, 'Content-Type': 'application/json'})
+
+def cache_key_for(request, params):
+    """Equivalent of cacheKeyFor: path plus query parameters in a stable order"""
+    return request.path + '?' + urllib.parse.urlencode(sorted((key, value) for key, values in params.items() for value in values))
+
+def iso_now():
+    """Equivalent of new Date().toISOString()"""
+    return datetime.now(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+def is_falsy(value):
+    """JavaScript truthiness for JSON values"""
+    return value is None or value is False or value == '' or (isinstance(value, (int, float)) and value == 0)
+
+def is_js_integer(value):
+    """Equivalent of Number.isInteger for JSON values"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and float(value).is_integer()
+
+def count_words(text, stop_after=None):
+    """Equivalent of countWords: text.trim().split(/\\s+/).length, stopping once past stop_after"""
+    count = 0
+    for _ in JS_WORD_RE.finditer(text):
+        count += 1
+        if stop_after is not None and count > stop_after:
+            break
+    # split() of an all-whitespace string still yields one (empty) word
+    return max(count, 1)
+
+def js_length(text):
+    """String#length: UTF-16 units, so characters outside the BMP count twice"""
+    return len(text.encode('utf-16-le')) // 2
+
+class UploadTooLargeError(Exception):
+    def __init__(self):
+        super().__init__(UPLOAD_TOO_LARGE_ERROR)
+
+def get_multipart_boundary(content_type):
+    if not content_type or not content_type.startswith('multipart/form-data'):
+        return None
+    match = re.search(r'boundary="?([^";]+)"?', content_type)
+    return match.group(1) if match else None
+
+IMAGE_BRANDS = (b'avif', b'avis', b'heic', b'heix', b'mif1', b'msf1')
+
+def is_image_signature(head):
+    """Equivalent of isImageSignature: the first bytes carry a known image signature"""
+    if head.startswith((b'\x89PNG\r\n\x1a\n', b'\xff\xd8\xff', b'GIF87a', b'GIF89a', b'BM', b'\x00\x00\x01\x00', b'II*\x00', b'MM\x00*')):
+        return True
+    if head.startswith(b'RIFF') and head[8:12] == b'WEBP':
+        return True
+    if head[4:8] == b'ftyp' and head[8:12] in IMAGE_BRANDS:
+        return True
+    text = head.decode('utf-8', errors='replace').lstrip('\ufeff').lstrip()
+    return (text.startswith('<svg') or text.startswith('<?xml')) and '<svg' in text
+
+class MultipartReader:
+    """Streaming equivalent of readMultipart in lib/multipart.js.
+
+    parts() yields {'name', 'value'} for fields and {'name', 'filename',
+    'content_type', 'body'} for files, where body is an async iterator cut at
+    the next boundary. Whatever a consumer leaves of a file body is skipped
+    before the next part.
+    """
+
+    def __init__(self, stream, boundary):
+        self.stream = stream
+        self.delimiter = b'\r\n--' + boundary.encode('latin-1')
+        # Prefixing CRLF lets the opening boundary match the same delimiter
+        self.buffer = b'\r\n'
+
+    async def fill(self):
+        chunk = await self.stream.read()
+        if not chunk:
+            raise ValueError('Unexpected end of multipart body')
+        self.buffer += chunk
+
+    async def file_body(self):
+        delimiter = self.delimiter
+        while True:
+            index = self.buffer.find(delimiter)
+            if index != -1:
+                if index > 0:
+                    yield self.buffer[:index]
+                self.buffer = self.buffer[index + len(delimiter):]
+                return
+            # Everything except a possible partial delimiter at the end is file data
+            safe = len(self.buffer) - len(delimiter) + 1
+            if safe > 0:
+                chunk, self.buffer = self.buffer[:safe], self.buffer[safe:]
+                yield chunk
+            else:
+                await self.fill()
+
+    async def parts(self):
+        delimiter = self.delimiter
+        # Skip the preamble up to the first boundary
+        while (index := self.buffer.find(delimiter)) == -1:
+            self.buffer = self.buffer[max(0, len(self.buffer) - len(delimiter) + 1):]
+            await self.fill()
+        self.buffer = self.buffer[index + len(delimiter):]
+
+        while True:
+            while len(self.buffer) < 2:
+                await self.fill()
+            if self.buffer.startswith(b'--'):
+                # Closing "--"; the epilogue is ignored
+                return
+
+            while (index := self.buffer.find(b'\r\n\r\n')) == -1:
+                if len(self.buffer) > MAX_PART_HEADER_BYTES:
+                    raise ValueError('Multipart part headers too large')
+                await self.fill()
+            part_headers = {}
+            for line in self.buffer[:index].decode('utf-8', errors='replace').split('\r\n'):
+                key, sep, value = line.partition(':')
+                if sep:
+                    part_headers[key.strip().lower()] = value.strip()
+            self.buffer = self.buffer[index + 4:]
+
+            disposition = part_headers.get('content-disposition', '')
+            name = re.search(r'\bname="([^"]*)"', disposition)
+            name = name.group(1) if name else None
+            filename = re.search(r'\bfilename="([^"]*)"', disposition)
+
+            if not filename:
+                while (index := self.buffer.find(delimiter)) == -1:
+                    if len(self.buffer) > MAX_FIELD_BYTES:
+                        raise ValueError('Multipart field too large')
+                    await self.fill()
+                value = self.buffer[:index].decode('utf-8', errors='replace')
+                self.buffer = self.buffer[index + len(delimiter):]
+                yield {'name': name, 'value': value}
+                continue
+
+            body = self.file_body()
+            yield {
+                'name': name,
+                'filename': filename.group(1),
+                'content_type': part_headers.get('content-type', 'application/octet-stream'),
+                'body': body,
+            }
+            async for _ in body:
+                pass
+
+async def sniff_and_limit(body, max_size=MAX_UPLOAD_SIZE):
+    """Equivalent of sniffAndLimit: returns (head, stream, exceeded)"""
+    chunks = []
+    length = 0
+    async for chunk in body:
+        chunks.append(chunk)
+        length += len(chunk)
+        if length >= SNIFF_BYTES:
+            break
+    head = b''.join(chunks)
+    size = 0
+
+    async def stream():
+        nonlocal size
+        size += len(head)
+        if size > max_size:
+            raise UploadTooLargeError()
+        if head:
+            yield head
+        if length < SNIFF_BYTES:
+            return
+        async for chunk in body:
+            size += len(chunk)
+            if size > max_size:
+                raise UploadTooLargeError()
+            yield chunk
+
+    return head[:SNIFF_BYTES], stream(), lambda: size > max_size
+
+async def database_round_trip():
+    """Simulated insert round trip, limited to DB_CONNECTIONS concurrent trips when set"""
+    global db_semaphore
+    with time_phase('demo-delay'):
+        if DB_CONNECTIONS <= 0:
+            await asyncio.sleep(SUBMIT_DELAY)
+            return
+        if db_semaphore is None:
+            db_semaphore = asyncio.Semaphore(DB_CONNECTIONS)
+        async with db_semaphore:
+            await asyncio.sleep(SUBMIT_DELAY)
+
+async def insert_submission(form_data):
+    """Demo branch of insertSubmission: one round trip per row"""
+    await database_round_trip()
+    new_submission = {
+        'id': generate_id('demo'),
+        **form_data,
+        'createdAt': iso_now(),
+    }
+    demo_store.insert(new_submission)
+    bump_submissions_version()
+    return {'success': True, 'data': new_submission}
+
+async def submit_hackathon_forms(form_data_list):
+    """Demo branch of submitHackathonForms: one simulated round trip per insert chunk"""
+    results = []
+    for start in range(0, len(form_data_list), BATCH_INSERT_CHUNK_SIZE):
+        await database_round_trip()
+        for form_data in form_data_list[start:start + BATCH_INSERT_CHUNK_SIZE]:
+            new_submission = {
+                'id': generate_id('demo'),
+                **form_data,
+                'createdAt': iso_now(),
+            }
+            demo_store.insert(new_submission)
+            results.append({'success': True, 'data': new_submission})
+        bump_submissions_version()
+    return {'success': all(result['success'] for result in results), 'results': results}
+
+class WriteCoalescer:
+    """Equivalent of createWriteCoalescer in lib/write-coalescer.js"""
+
+    def __init__(self, flush, max_batch_size=100, max_wait_ms=5):
+        self.flush = flush
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.pending = []
+        self.timer = None
+        self.flushes = 0
+        self.items = 0
+        self.max_flush_size = 0
+        self.total_wait_ms = 0.0
+        self.max_observed_wait_ms = 0.0
+        self.flush_sizes = {}
+
+    def drain(self):
+        """Take the pending batch now (like the synchronous prefix of the JS drain) and flush it"""
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+        batch, self.pending = self.pending, []
+        if not batch:
+            return
+
+        flushed_at = time.perf_counter()
+        self.flushes += 1
+        self.items += len(batch)
+        self.max_flush_size = max(self.max_flush_size, len(batch))
+        bucket = str(1 << (len(batch).bit_length() - 1))
+        self.flush_sizes[bucket] = self.flush_sizes.get(bucket, 0) + 1
+        for _, _, enqueued_at in batch:
+            waited = (flushed_at - enqueued_at) * 1000
+            self.total_wait_ms += waited
+            self.max_observed_wait_ms = max(self.max_observed_wait_ms, waited)
+
+        asyncio.ensure_future(self._flush(batch))
+
+    async def _flush(self, batch):
+        try:
+            results = await self.flush([item for item, _, _ in batch])
+        except Exception as e:
+            results = [{'success': False, 'error': str(e)} for _ in batch]
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+
+    def submit(self, item):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((item, future, time.perf_counter()))
+        if len(self.pending) >= self.max_batch_size:
+            self.drain()
+        elif not self.timer:
+            self.timer = loop.call_later(self.max_wait_ms / 1000, self.drain)
+        return future
+
+    def get_metrics(self):
+        return {
+            'maxBatchSize': self.max_batch_size,
+            'maxWaitMs': self.max_wait_ms,
+            'pending': len(self.pending),
+            'flushes': self.flushes,
+            'items': self.items,
+            'meanFlushSize': self.items / self.flushes if self.flushes else 0,
+            'maxFlushSize': self.max_flush_size,
+            'flushSizes': dict(self.flush_sizes),
+            'meanWaitMs': self.total_wait_ms / self.items if self.items else 0,
+            'maxObservedWaitMs': self.max_observed_wait_ms,
+        }
+
+async def insert_coalesced_submissions(batch):
+    if len(batch) == 1:
+        return [await insert_submission(batch[0])]
+    inserted = await submit_hackathon_forms(batch)
+    # One bad row fails its whole multi-row insert; retry failed rows alone
+    return [
+        result if result['success'] else await insert_submission(batch[index])
+        for index, result in enumerate(inserted['results'])
+    ]
+
+async def flush_coalesced_submissions(batch):
+    # A flush serves many requests, so its phases aren't charged to the one that triggered it
+    return await untimed(lambda: insert_coalesced_submissions(batch))
+
+submit_coalescer = WriteCoalescer(flush_coalesced_submissions, COALESCE_MAX_BATCH, COALESCE_MAX_WAIT_MS)
+
+async def submit_hackathon_form(form_data):
+    """Demo branch of submitHackathonForm, through the group-commit coalescer"""
+    if COALESCE_MAX_WAIT_MS <= 0:
+        return await insert_submission(form_data)
+    # Time spent waiting for the flush plus the shared insert itself
+    with time_phase('coalesce'):
+        return await submit_coalescer.submit(form_data)
+
+def get_submit_coalescer_metrics():
+    return {'enabled': COALESCE_MAX_WAIT_MS > 0, **submit_coalescer.get_metrics()}
+
+async def get_submissions():
+    """Demo branch of getSubmissions"""
+    with time_phase('demo-query'):
+        return {'success': True, 'data': demo_store.to_list()}
+
+# Cursor fields are interpolated into a PostgREST filter by lib/supabase.js
+CURSOR_TIMESTAMP_RE = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{1,6})?(Z|[+-]\d{2}:\d{2})?')
+CURSOR_ID_RE = re.compile(r'[A-Za-z0-9_.-]{1,64}')
+
+def encode_cursor(row):
+    """Equivalent of encodeCursor: base64url of the compact JSON [createdAt, id]"""
+    raw = json.dumps([row.get('created_at', row.get('createdAt')), row['id']], separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """Equivalent of decodeCursor; returns None for anything malformed"""
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except Exception:
+        return None
+    if not isinstance(created_at, str) or not CURSOR_TIMESTAMP_RE.fullmatch(created_at):
+        return None
+    if not isinstance(row_id, str) or not CURSOR_ID_RE.fullmatch(row_id):
+        return None
+    try:
+        datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return {'createdAt': created_at, 'id': row_id}
+
+async def get_submissions_page(limit=DEFAULT_PAGE_SIZE, cursor=None, filters=None):
+    """Demo branch of getSubmissionsPage: newest first, keyset on (createdAt, id)"""
+    with time_phase('demo-query'):
+        rows = demo_store.query(filters, cursor, limit + 1)
+    data = rows[:limit]
+    return {'success': True, 'data': data, 'next': encode_cursor(data[-1]) if len(rows) > limit else None}
+
+FORMULA_PREFIX_RE = re.compile(r'[=+\-@\t\r]')
+
+def csv_cell(value):
+    if value is None:
+        return ''
+    text = value if isinstance(value, str) else js_json(value)
+    if FORMULA_PREFIX_RE.match(text):
+        # Spreadsheets would run it as a formula
+        text = "'" + text
+    return '"' + text.replace('"', '""') + '"' if re.search(r'[",\r\n]', text) else text
+
+def csv_line(row):
+    return ','.join(csv_cell(row.get(field, row.get(column))) for _, field, column in CSV_COLUMNS) + '\r\n'
+
+async def export_stream(export_format):
+    """Equivalent of createExportStream: one encoded chunk per page of rows"""
+    if export_format == 'csv':
+        yield (','.join(csv_cell(header) for header, _, _ in CSV_COLUMNS) + '\r\n').encode('utf-8')
+    cursor = None
+    while True:
+        page = await get_submissions_page(EXPORT_PAGE_SIZE, cursor)
+        if page['data']:
+            if export_format == 'csv':
+                yield ''.join(csv_line(row) for row in page['data']).encode('utf-8')
+            else:
+                yield ''.join(js_json(row) + '\n' for row in page['data']).encode('utf-8')
+        if not page['next']:
+            return
+        cursor = decode_cursor(page['next'])
+
+# Content-addressed upload dedupe from lib/supabase.js
+UPLOAD_URL_CACHE_MAX_ENTRIES = 5000
+UPLOAD_URL_CACHE_TTL = 60 * 60
+
+upload_url_cache = TtlCache(UPLOAD_URL_CACHE_MAX_ENTRIES, UPLOAD_URL_CACHE_TTL)
+pending_object_writes = {}
+demo_objects = TtlCache(100000, 7 * 24 * 60 * 60)
+upload_metrics = {'uploads': 0, 'cacheHits': 0, 'storageHits': 0, 'sharedWrites': 0, 'writes': 0, 'bytesReceived': 0, 'bytesWritten': 0, 'variantsWritten': 0}
+
+def get_upload_metrics():
+    return dict(upload_metrics, cachedUrls=len(upload_url_cache.entries))
+
+def object_path_for(name, sha256, folder):
+    file_ext = name.rsplit('.', 1)[-1].lower() if '.' in name else ''
+    return f"{folder}/{sha256}" + (f".{file_ext}" if re.fullmatch(r'[a-z0-9]{1,10}', file_ext) else '')
+
+def copy_file(source, target):
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(source, 'rb') as reader, open(target, 'wb') as writer:
+        while block := reader.read(BODY_READ_SIZE):
+            writer.write(block)
+
+def save_bytes(target, content):
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    with open(target, 'wb') as writer:
+        writer.write(content)
+
+async def write_object(object_path, body):
+    """Demo branch of writeObject: True when written, False when it already existed.
+
+    body() is called only when a write is needed and returns a file path or bytes.
+    With --storage-dir the object is also kept on disk so /demo-storage/ can serve it.
+    """
+    if demo_objects.get(object_path):
+        return False
+    content = await body()
+    if isinstance(content, str):
+        async for _ in file_chunks(content):
+            pass
+    await asyncio.sleep(UPLOAD_DELAY)
+    if STORAGE_DIR:
+        target = os.path.join(STORAGE_DIR, object_path)
+        if isinstance(content, str):
+            await asyncio.to_thread(copy_file, content, target)
+        else:
+            await asyncio.to_thread(save_bytes, target, content)
+    demo_objects.set(object_path, True)
+    return True
+
+def public_url_for(object_path):
+    return f"{DEMO_STORAGE_URL}/{object_path}"
+
+async def store_object(object_path, body):
+    """Equivalent of storeObject: returns {url, written, cached?, shared?}"""
+    cached_url = upload_url_cache.get(object_path)
+    if cached_url:
+        return {'url': cached_url, 'written': False, 'cached': True}
+
+    pending = pending_object_writes.get(object_path)
+    if pending is not None:
+        await asyncio.shield(pending)
+        return {'url': public_url_for(object_path), 'written': False, 'shared': True}
+
+    pending = asyncio.ensure_future(write_object(object_path, body))
+    pending_object_writes[object_path] = pending
+    try:
+        written = await asyncio.shield(pending)
+    finally:
+        pending_object_writes.pop(object_path, None)
+    url = public_url_for(object_path)
+    upload_url_cache.set(object_path, url)
+    return {'url': url, 'written': written}
+
+# Image variants from lib/image-variants.js
+IMAGE_VARIANTS = {'thumbnail': (160, 160), 'medium': (800, 800)}
+RENDERABLE_TYPES = ['image/png', 'image/jpeg', 'image/webp', 'image/gif', 'image/avif', 'image/tiff']
+# Bytes per pixel of a quality-80 WebP, for sizing simulated variants
+SIMULATED_WEBP_BYTES_PER_PIXEL = 0.25
+
+def variant_path_for(object_path, variant):
+    folder, slash, name = object_path.rpartition('/')
+    return f"{folder}{slash}variants/{re.sub(r'[.][^.]*$', '', name)}-{variant}.webp"
+
+def simulated_variant(size, variant):
+    """Stand-in for sharp: a WebP-tagged placeholder sized like a variant of a `size` byte image.
+
+    No image library is used, so the bytes are not a decodable picture; they only
+    give the gallery benchmark realistic transfer sizes.
+    """
+    width, height = IMAGE_VARIANTS[variant]
+    length = max(64, min(size, int(width * height * SIMULATED_WEBP_BYTES_PER_PIXEL)))
+    header = b'RIFF' + (length - 8).to_bytes(4, 'little') + b'WEBPVP8 '
+    return header + bytes(length - len(header))
+
+async def create_image_variants(file):
+    """Equivalent of createImageVariants in demo mode, with simulated rendering"""
+    if file['type'] not in RENDERABLE_TYPES:
+        return None
+
+    async def store(variant):
+        async def body():
+            return simulated_variant(file['size'], variant)
+        stored = await store_object(variant_path_for(file['object_path'], variant), body)
+        if stored['written']:
+            upload_metrics['variantsWritten'] += 1
+        return variant, stored['url']
+
+    return dict(await asyncio.gather(*(store(variant) for variant in IMAGE_VARIANTS)))
+
+async def upload_local_file(file, folder='uploads', variants=False):
+    """Equivalent of uploadLocalFile: store a file on disk under its content address"""
+    object_path = object_path_for(file['name'], file['sha256'], folder)
+    upload_metrics['uploads'] += 1
+    upload_metrics['bytesReceived'] += file['size']
+
+    async def body():
+        return file['file_path']
+
+    try:
+        with time_phase('storage'):
+            stored = await store_object(object_path, body)
+        if stored.get('cached'):
+            upload_metrics['cacheHits'] += 1
+        elif stored.get('shared'):
+            upload_metrics['sharedWrites'] += 1
+        elif stored['written']:
+            upload_metrics['writes'] += 1
+            upload_metrics['bytesWritten'] += file['size']
+        else:
+            upload_metrics['storageHits'] += 1
+        result = {'success': True, 'url': stored['url'], 'deduplicated': not stored['written']}
+    except Exception as error:
+        return {'success': False, 'error': str(error)}
+
+    if variants:
+        # A failed variant never fails the upload itself
+        try:
+            with time_phase('variants'):
+                result['variants'] = await create_image_variants(dict(file, object_path=object_path))
+        except Exception:
+            result['variants'] = None
+    return result
+
+def append_to(file, chunk):
+    file.write(chunk)
+
+async def spool_to_temp_file(stream):
+    """Equivalent of spoolToTempFile: write a stream to a temporary file, hashing it on the way"""
+    os.makedirs(UPLOAD_TMP_DIR, exist_ok=True)
+    file_path = os.path.join(UPLOAD_TMP_DIR, generate_id('spool'))
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(file_path, 'wb') as file:
+            async for chunk in stream:
+                digest.update(chunk)
+                size += len(chunk)
+                await asyncio.to_thread(append_to, file, chunk)
+    except BaseException:
+        remove_file(file_path)
+        raise
+    return {'file_path': file_path, 'sha256': digest.hexdigest(), 'size': size}
+
+async def upload_stream(file, folder='uploads', variants=False):
+    """Equivalent of uploadStream: hash while spooling, then store by content address"""
+    try:
+        with time_phase('spool'):
+            spooled = await spool_to_temp_file(file['stream'])
+    except Exception as error:
+        return {'success': False, 'error': str(error)}
+    try:
+        return await upload_local_file(dict(spooled, name=file['name'], type=file['type']), folder, variants)
+    finally:
+        remove_file(spooled['file_path'])
+
+UPLOAD_ID_RE = re.compile(r'^upload_[0-9A-HJKMNP-TV-Z]{26}$')
+SHA256_HEX_RE = re.compile(r'^[0-9a-fA-F]{64}$')
+CONTENT_DIGEST_RE = re.compile(r'(?:^|,)\s*sha-256=:([A-Za-z0-9+/]+=*):', re.IGNORECASE)
+
+def remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+upload_sessions = TtlCache(MAX_UPLOAD_SESSIONS, UPLOAD_SESSION_TTL, lambda upload_id, session: remove_file(session['file_path']))
+# Completed sessions only keep their result (their file is gone), so the oldest may be evicted
+completed_upload_sessions = TtlCache(MAX_UPLOAD_SESSIONS, UPLOAD_SESSION_TTL)
+chunked_upload_metrics = {'initiated': 0, 'rejected': 0, 'chunks': 0, 'chunkBytes': 0, 'checksumFailures': 0, 'completed': 0}
+
+def upload_not_found():
+    return 404, {'error': 'Upload not found or expired'}
+
+def get_upload_session(upload_id):
+    if not upload_id or not UPLOAD_ID_RE.match(upload_id):
+        return None
+    return upload_sessions.get(upload_id) or completed_upload_sessions.get(upload_id)
+
+def add_range(ranges, start, end):
+    """Merge [start, end) into a sorted list of disjoint ranges"""
+    merged = []
+    placed = False
+    for range_start, range_end in ranges:
+        if range_end < start:
+            merged.append([range_start, range_end])
+        elif range_start > end:
+            if not placed:
+                merged.append([start, end])
+                placed = True
+            merged.append([range_start, range_end])
+        else:
+            start, end = min(start, range_start), max(end, range_end)
+    if not placed:
+        merged.append([start, end])
+    return merged
+
+def missing_ranges(ranges, size):
+    missing = []
+    position = 0
+    for start, end in ranges:
+        if start > position:
+            missing.append([position, start])
+        position = end
+    if position < size:
+        missing.append([position, size])
+    return missing
+
+def received_bytes(ranges):
+    return sum(end - start for start, end in ranges)
+
+def parse_content_digest(header):
+    match = CONTENT_DIGEST_RE.search(header or '')
+    return match.group(1) if match else None
+
+def describe_upload(session):
+    result = session['result']
+    description = {
+        'uploadId': session['uploadId'],
+        'filename': session['filename'],
+        'size': session['size'],
+        'received': received_bytes(session['ranges']),
+        'ranges': session['ranges'],
+        'missing': missing_ranges(session['ranges'], session['size']),
+        'complete': bool(result),
+    }
+    if result:
+        description['url'] = result[1]['url']
+    return description
+
+def create_sparse_file(path, size):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as file:
+        file.truncate(size)
+
+def write_at(path, offset, chunk):
+    with open(path, 'r+b') as file:
+        file.seek(offset)
+        file.write(chunk)
+
+def read_head(path):
+    with open(path, 'rb') as file:
+        return file.read(SNIFF_BYTES)
+
+def hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        while block := file.read(BODY_READ_SIZE):
+            digest.update(block)
+    return digest.hexdigest()
+
+async def file_chunks(path):
+    with open(path, 'rb') as file:
+        while block := await asyncio.to_thread(file.read, BODY_READ_SIZE):
+            yield block
+
+async def initiate_chunked_upload(details):
+    """Equivalent of initiateChunkedUpload; returns (status, body)"""
+    details = details if isinstance(details, dict) else {}
+    filename, content_type, size = details.get('filename'), details.get('contentType'), details.get('size')
+    folder, sha256, variants = details.get('folder'), details.get('sha256'), details.get('variants')
+
+    if not isinstance(filename, str) or not filename:
+        return 400, {'error': 'filename is required'}
+    if not isinstance(content_type, str) or not content_type.startswith('image/'):
+        return 400, {'error': 'Only image files are allowed'}
+    if not is_js_integer(size) or size < 1:
+        return 400, {'error': 'size must be a positive integer'}
+    if size > MAX_UPLOAD_SIZE:
+        return 400, {'error': UPLOAD_TOO_LARGE_ERROR}
+    if 'sha256' in details and (not isinstance(sha256, str) or not SHA256_HEX_RE.match(sha256)):
+        return 400, {'error': 'sha256 must be a hex SHA-256 digest'}
+    if 'variants' in details and not isinstance(variants, bool):
+        return 400, {'error': 'variants must be a boolean'}
+
+    upload_sessions.prune()
+    if len(upload_sessions.entries) >= MAX_UPLOAD_SESSIONS:
+        chunked_upload_metrics['rejected'] += 1
+        return 503, {'error': 'Too many uploads in progress, try again later'}
+
+    # Registered before the file exists so concurrent initiates count against the limit
+    upload_id = generate_id('upload')
+    file_path = os.path.join(UPLOAD_TMP_DIR, upload_id)
+    size = int(size)
+    upload_sessions.set(upload_id, {
+        'uploadId': upload_id,
+        'filename': filename,
+        'contentType': content_type,
+        'size': size,
+        'folder': folder if isinstance(folder, str) and folder else 'uploads',
+        'sha256': sha256.lower() if sha256 else None,
+        'variants': bool(variants),
+        'file_path': file_path,
+        'ranges': [],
+        'completing': None,
+        'result': None,
+    })
+    try:
+        await asyncio.to_thread(create_sparse_file, file_path, size)
+    except BaseException:
+        upload_sessions.delete(upload_id)
+        remove_file(file_path)
+        raise
+    chunked_upload_metrics['initiated'] += 1
+
+    return 201, {
+        'uploadId': upload_id,
+        'size': size,
+        'chunkSize': UPLOAD_CHUNK_SIZE,
+        'maxChunkSize': MAX_UPLOAD_CHUNK_SIZE,
+        'expiresAt': datetime.fromtimestamp(time.time() + UPLOAD_SESSION_TTL, timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+    }
+
+async def write_chunk(upload_id, offset, chunk, digest):
+    """Equivalent of writeChunk; returns (status, body)"""
+    session = get_upload_session(upload_id)
+    if not session:
+        return upload_not_found()
+    if session['result'] or session['completing']:
+        return 409, {'error': 'Upload is already complete'}
+
+    if offset is None or offset < 0:
+        return 400, {'error': 'offset must be a non-negative integer'}
+    if not chunk or offset + len(chunk) > session['size']:
+        return 400, {'error': f"Chunk must be non-empty and end within the {session['size']} byte file"}
+    if not digest:
+        return 400, {'error': 'Content-Digest header with a sha-256 value is required'}
+    if base64.b64encode(hashlib.sha256(chunk).digest()).decode('ascii') != digest:
+        chunked_upload_metrics['checksumFailures'] += 1
+        return 400, {'error': 'Chunk checksum mismatch'}
+
+    await asyncio.to_thread(write_at, session['file_path'], offset, chunk)
+
+    session['ranges'] = add_range(session['ranges'], offset, offset + len(chunk))
+    # Activity extends the session's lifetime
+    upload_sessions.set(upload_id, session)
+    chunked_upload_metrics['chunks'] += 1
+    chunked_upload_metrics['chunkBytes'] += len(chunk)
+
+    return 200, {'uploadId': upload_id, 'offset': offset, 'length': len(chunk), 'received': received_bytes(session['ranges']), 'size': session['size']}
+
+def get_chunked_upload_status(upload_id):
+    session = get_upload_session(upload_id)
+    return (200, describe_upload(session)) if session else upload_not_found()
+
+async def assemble_upload(session):
+    missing = missing_ranges(session['ranges'], session['size'])
+    if missing:
+        return 409, {'error': 'Upload is missing chunks', 'missing': missing}
+
+    if not is_image_signature(await asyncio.to_thread(read_head, session['file_path'])):
+        return 400, {'error': 'Only image files are allowed'}
+    with time_phase('hash'):
+        sha256 = await asyncio.to_thread(hash_file, session['file_path'])
+    if session['sha256'] and sha256 != session['sha256']:
+        return 400, {'error': 'File checksum mismatch'}
+
+    result = await upload_local_file({
+        'file_path': session['file_path'],
+        'sha256': sha256,
+        'size': session['size'],
+        'name': session['filename'],
+        'type': session['contentType'],
+    }, session['folder'], session['variants'])
+
+    if not result['success']:
+        return 500, {'error': result['error']}
+
+    return 200, {
+        'success': True,
+        'url': result['url'],
+        **({'variants': result['variants']} if session['variants'] else {}),
+        'message': 'File uploaded successfully',
+    }
+
+async def complete_chunked_upload(upload_id):
+    """Equivalent of completeChunkedUpload; concurrent calls share one assembly"""
+    session = get_upload_session(upload_id)
+    if not session:
+        return upload_not_found()
+    if session['result']:
+        return session['result']
+
+    if not session['completing']:
+        session['completing'] = asyncio.ensure_future(assemble_upload(session))
+        session['completing'].add_done_callback(lambda _: session.update(completing=None))
+    outcome = await asyncio.shield(session['completing'])
+
+    if outcome[0] == 200 and not session['result']:
+        session['result'] = outcome
+        chunked_upload_metrics['completed'] += 1
+        upload_sessions.delete(upload_id)
+        completed_upload_sessions.set(upload_id, session)
+        await asyncio.to_thread(remove_file, session['file_path'])
+    return outcome
+
+def get_chunked_upload_metrics():
+    return dict(chunked_upload_metrics, activeSessions=len(upload_sessions.entries), completedSessions=len(completed_upload_sessions.entries))
+
+def chunked_upload_id(pathname):
+    """Session id from /api/upload/chunked/<uploadId>[/complete]"""
+    _, sep, rest = pathname.partition('/upload/chunked/')
+    return rest.split('/')[0] if sep else None
+
+async def handle_get(request, mode):
+    pathname = request.path
+    params = urllib.parse.parse_qs(request.query, keep_blank_values=True)
+
+    # Bulk export streams every submission as NDJSON (default) or CSV
+    if '/submissions/export' in pathname:
+        requested = params.get('format', [None])[0]
+        wants_csv = requested == 'csv' or (requested is None and 'text/csv' in request.headers.get('accept', ''))
+        export_format = 'csv' if wants_csv else (requested if requested is not None else 'ndjson')
+
+        if export_format not in EXPORT_FORMATS:
+            return json_response({'error': 'format must be one of: ndjson, csv'}, 400)
+
+        return Response(200, export_stream(export_format), {
+            'Content-Type': EXPORT_FORMATS[export_format]['content_type'],
+            'Content-Disposition': f'attachment; filename="submissions.{EXPORT_FORMATS[export_format]["extension"]}"',
+            'Cache-Control': 'no-store',
+        })
+
+    if '/submissions' in pathname:
+        # Cursor pagination and filtering are opt-in so existing clients keep getting a plain array
+        if 'limit' in params or 'cursor' in params or any(param in params for param in SUBMISSION_FILTER_PARAMS):
+            raw_limit = params.get('limit', [str(DEFAULT_PAGE_SIZE)])[0]
+            limit = int(raw_limit) if re.fullmatch(r'\d+', raw_limit.strip()) else None
+            if limit is None or limit < 1 or limit > MAX_PAGE_SIZE:
+                return json_response({'error': f"limit must be an integer between 1 and {MAX_PAGE_SIZE}"}, 400)
+
+            raw_cursor = params.get('cursor', [''])[0]
+            cursor = decode_cursor(raw_cursor) if raw_cursor else None
+            if raw_cursor and not cursor:
+                return json_response({'error': 'Invalid cursor'}, 400)
+
+            filters, error = parse_submission_filters(params)
+            if error:
+                return json_response({'error': error}, 400)
+
+            async def produce_page():
+                page = await get_submissions_page(limit, cursor, filters)
+
+                if not page['success']:
+                    return json_response({'error': page['error']}, 500)
+
+                return json_response({'data': page['data'], 'next': page['next']})
+
+            return await cached_json_response(request, cache_key_for(request, params), submissions_version, produce_page)
+
+        async def produce_all():
+            result = await get_submissions()
+
+            if not result['success']:
+                return json_response({'error': result['error']}, 500)
+
+            return json_response(result['data'])
+
+        return await cached_json_response(request, cache_key_for(request, params), submissions_version, produce_all)
+
+    # Resumable upload status: which byte ranges have arrived
+    if '/upload/chunked/' in pathname:
+        status, body = get_chunked_upload_status(chunked_upload_id(pathname))
+        return json_response(body, status)
+
+    # Server metrics (group commit flushes, demo store occupancy, GET response cache, upload dedupe, resumable uploads)
+    if '/metrics' in pathname:
+        return json_response({
+            'submitCoalescer': get_submit_coalescer_metrics(),
+            'demoStore': demo_store.get_metrics(),
+            'responseCache': get_response_cache_metrics(),
+            'uploads': get_upload_metrics(),
+            'chunkedUploads': get_chunked_upload_metrics(),
+            'eventLoop': event_loop_monitor.get_metrics(),
+        })
+
+    # Health check endpoint; the cached timestamp is at most one TTL old
+    if '/health' in pathname:
+        async def produce_health():
+            return json_response({
+                'status': 'ok',
+                'timestamp': iso_now(),
+                'mode': mode,
+            })
+
+        return await cached_json_response(request, cache_key_for(request, params), 0, produce_health)
+
+    return json_response({'error': 'Endpoint not found'}, 404)
+
+def parse_timestamp(value):
+    """ISO 8601 timestamp normalised like new Date(value).toISOString(), or None"""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+
+def parse_submission_filters(params):
+    """Equivalent of parseSubmissionFilters: (filters, None) or (None, error)"""
+    def get(name):
+        return params.get(name, [''])[0]
+
+    filters = {}
+    if get('email'):
+        filters['email'] = get('email')
+    if get('teamName'):
+        filters['teamNamePrefix'] = get('teamName')
+    if get('title'):
+        filters['titleTerms'] = list(dict.fromkeys(tokenize_title(get('title'))))
+        if not filters['titleTerms']:
+            return None, 'title must contain at least one word'
+    for bound in ('from', 'to'):
+        if get(bound):
+            filters[bound] = parse_timestamp(get(bound))
+            if not filters[bound]:
+                return None, f"{bound} must be an ISO 8601 timestamp"
+    return filters, None
+
+def is_variant_urls(value):
+    """Equivalent of isVariantUrls: exactly one http(s) URL per IMAGE_VARIANTS entry"""
+    return (isinstance(value, dict) and value.keys() == IMAGE_VARIANTS.keys()
+            and all(isinstance(url, str) and js_length(url) <= MAX_FIELD_LENGTHS['projectLogoUrl'] and re.match(r'https?://', url) for url in value.values()))
+
+def validate_submission(body):
+    """Equivalent of validateSubmission: the error message, or None when valid"""
+    # Validate required fields
+    if not isinstance(body, dict) or any(is_falsy(body.get(field)) for field in REQUIRED_FIELDS):
+        return MISSING_FIELDS_ERROR
+
+    not_string = next((field for field in REQUIRED_FIELDS if not isinstance(body[field], str)), None)
+    if not_string:
+        return f"{not_string} must be a string"
+
+    too_long = next((field for field, limit in MAX_FIELD_LENGTHS.items() if isinstance(body.get(field), str) and js_length(body[field]) > limit), None)
+    if too_long:
+        return f"{too_long} must be {MAX_FIELD_LENGTHS[too_long]} characters or less"
+
+    bad_variants = next((field for field in VARIANT_FIELDS if body.get(field) is not None and not is_variant_urls(body[field])), None)
+    if bad_variants:
+        return f"{bad_variants} must be an object of thumbnail and medium URLs"
+
+    # Validate project description word count (max 100 words); only a rejected one is counted in full
+    description = body['projectDescription']
+    if count_words(description, MAX_DESCRIPTION_WORDS) > MAX_DESCRIPTION_WORDS:
+        return f"Project description must be {MAX_DESCRIPTION_WORDS} words or less. Current: {count_words(description)} words."
+
+    # Matches the CHECK on project_description; Python's len counts code points like char_length
+    if len(description) > MAX_DESCRIPTION_LENGTH:
+        return f"Project description must be {MAX_DESCRIPTION_LENGTH} characters or less."
+
+    return None
+
+async def read_body_limited(request, max_bytes):
+    """Equivalent of readBodyLimited: the body, or None when over max_bytes (declared or as it streams in)"""
+    if int(request.headers.get('content-length') or 0) > max_bytes:
+        return None
+    with time_phase('read-body'):
+        return await request.stream.read_limited(max_bytes)
+
+# parse_json's result for a malformed body; None is a valid JSON null
+INVALID_JSON = object()
+
+def parse_json(raw_body):
+    """Equivalent of parseJson: the parsed body, or INVALID_JSON when it is not valid JSON"""
+    try:
+        return json.loads(raw_body)
+    except ValueError:
+        return INVALID_JSON
+
+def payload_too_large(max_bytes):
+    size = f"{max_bytes // 1024 // 1024}MB" if max_bytes >= 1024 * 1024 else f"{max_bytes // 1024}KB"
+    return json_response({'error': f"Request body must be {size} or less"}, 413)
+
+async def handle_submit_batch(request):
+    request.body = await read_body_limited(request, MAX_BATCH_BYTES)
+    if request.body is None:
+        return payload_too_large(MAX_BATCH_BYTES)
+
+    with time_phase('parse'):
+        body = parse_json(request.body)
+    if body is INVALID_JSON:
+        return json_response({'error': 'Invalid JSON'}, 400)
+    submissions = body if isinstance(body, list) else body.get('submissions') if isinstance(body, dict) else None
+
+    if not isinstance(submissions, list) or not submissions:
+        return json_response({'error': 'Request body must be a non-empty array of submissions'}, 400)
+
+    if len(submissions) > MAX_BATCH_SIZE:
+        return json_response({'error': f"Batch size must be {MAX_BATCH_SIZE} submissions or less"}, 400)
+
+    # Validate every entry up front; only the valid ones are inserted
+    results = [None] * len(submissions)
+    valid = []
+    valid_indexes = []
+    with time_phase('validate'):
+        for index, submission in enumerate(submissions):
+            error = validate_submission(submission)
+            if error:
+                results[index] = {'index': index, 'success': False, 'error': error}
+            else:
+                valid.append(submission)
+                valid_indexes.append(index)
+
+    if valid:
+        inserted = await submit_hackathon_forms(valid)
+        for position, result in enumerate(inserted['results']):
+            results[valid_indexes[position]] = {'index': valid_indexes[position], **result}
+
+    inserted_count = sum(1 for result in results if result['success'])
+    return json_response({
+        'success': inserted_count == len(submissions),
+        'inserted': inserted_count,
+        'failed': len(submissions) - inserted_count,
+        'results': results,
+    })
+
+async def handle_submit(request):
+    request.body = await read_body_limited(request, MAX_SUBMISSION_BYTES)
+    if request.body is None:
+        return payload_too_large(MAX_SUBMISSION_BYTES)
+
+    key = request.headers.get('idempotency-key')
+    return await run_idempotent('submit', key, key and hashlib.sha256(request.body).hexdigest(), lambda: process_submit(request))
+
+async def process_submit(request):
+    with time_phase('parse'):
+        body = parse_json(request.body)
+    if body is INVALID_JSON:
+        return json_response({'error': 'Invalid JSON'}, 400)
+
+    with time_phase('validate'):
+        validation_error = validate_submission(body)
+    if validation_error:
+        return json_response({'error': validation_error}, 400)
+
+    result = await submit_hackathon_form(body)
+
+    if not result['success']:
+        return json_response({'error': result['error']}, 500)
+
+    return json_response({
+        'success': True,
+        'message': 'Hackathon submission successful! 🎉',
+        'data': result['data'],
+    })
+
+async def handle_upload(request):
+    try:
+        return await receive_upload(request)
+    except Exception:
+        return json_response({'error': 'File upload failed'}, 500)
+
+def is_enabled(value):
+    return value in ('true', '1')
+
+async def receive_upload(request):
+    """Equivalent of receiveUpload: stream the file part into storage without buffering it.
+
+    An Idempotency-Key is bound to the file's sha256; a replay with another file gets a 422.
+    """
+    boundary = get_multipart_boundary(request.headers.get('content-type'))
+    if not boundary or not request.stream.has_body:
+        return json_response({'error': 'No file provided'}, 400)
+
+    # A declared length over the limit is rejected before reading any of the body
+    if int(request.headers.get('content-length') or 0) > MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD_ALLOWANCE:
+        return json_response({'error': UPLOAD_TOO_LARGE_ERROR}, 400)
+
+    query = urllib.parse.parse_qs(request.query)
+    folder = query.get('folder', [''])[0] or 'uploads'
+    variants = is_enabled(query.get('variants', [''])[0])
+    async for part in MultipartReader(request.stream, boundary).parts():
+        if 'body' not in part:
+            if part['name'] == 'folder' and part['value']:
+                folder = part['value']
+            elif part['name'] == 'variants':
+                variants = is_enabled(part['value'])
+            continue
+
+        if part['name'] != 'file':
+            # Other file parts are skipped by the reader
+            continue
+
+        # Validate file type for images: the declared type, then the magic bytes
+        if not part['content_type'].startswith('image/'):
+            return json_response({'error': 'Only image files are allowed'}, 400)
+
+        head, stream, exceeded = await sniff_and_limit(part['body'], MAX_UPLOAD_SIZE)
+        if not is_image_signature(head):
+            return json_response({'error': 'Only image files are allowed'}, 400)
+
+        # Validate file size (max 15MB) while the bytes are hashed into a temporary file
+        try:
+            with time_phase('spool'):
+                spooled = await spool_to_temp_file(stream)
+        except UploadTooLargeError:
+            return json_response({'error': UPLOAD_TOO_LARGE_ERROR}, 400)
+
+        async def store():
+            result = await upload_local_file(dict(spooled, name=part['filename'], type=part['content_type']), folder, variants)
+            if not result['success']:
+                return json_response({'error': result['error']}, 500)
+            return json_response({
+                'success': True,
+                'url': result['url'],
+                **({'variants': result['variants']} if variants else {}),
+                'message': 'File uploaded successfully',
+            })
+
+        # The Idempotency-Key is bound to the file's sha256 and the upload options
+        key = request.headers.get('idempotency-key')
+        try:
+            return await run_idempotent('upload', key, key and hashlib.sha256(js_json([spooled['sha256'], folder, variants]).encode('utf-8')).hexdigest(), store)
+        finally:
+            remove_file(spooled['file_path'])
+
+    return json_response({'error': 'No file provided'}, 400)
+
+async def handle_post(request):
+    pathname = request.path
+
+    if '/submit/batch' in pathname:
+        return await handle_submit_batch(request)
+
+    if '/submit' in pathname:
+        return await handle_submit(request)
+
+    if '/upload/chunked' in pathname:
+        return await handle_chunked_upload(request)
+
+    if '/upload' in pathname:
+        return await handle_upload(request)
+
+    return json_response({'error': 'Endpoint not found'}, 404)
+
+async def handle_chunked_upload(request):
+    if request.path.endswith('/complete'):
+        status, body = await complete_chunked_upload(chunked_upload_id(request.path))
+        return json_response(body, status)
+    if chunked_upload_id(request.path):
+        # A session URL takes GET (status) and PUT (chunks); only /complete is POSTed
+        return Response(405, js_json({'error': 'Method not allowed'}).encode('utf-8'), {'Content-Type': 'application/json', 'Allow': 'GET, PUT'})
+
+    # Initiating a resumable upload; a retried request with the same Idempotency-Key reuses the session
+    request.body = await read_body_limited(request, MAX_SUBMISSION_BYTES)
+    if request.body is None:
+        return payload_too_large(MAX_SUBMISSION_BYTES)
+    details = parse_json(request.body)
+    if details is INVALID_JSON:
+        return json_response({'error': 'Invalid JSON'}, 400)
+    key = request.headers.get('idempotency-key')
+
+    async def initiate():
+        status, body = await initiate_chunked_upload(details)
+        return json_response(body, status)
+
+    return await run_idempotent('upload-chunked', key, key and hashlib.sha256(request.body).hexdigest(), initiate)
+
+async def handle_put(request):
+    """PUT /api/upload/chunked/<uploadId>?offset=N stores one chunk of a resumable upload"""
+    if '/upload/chunked/' in request.path:
+        too_large = {'error': f"Chunk size must be {MAX_UPLOAD_CHUNK_SIZE // 1024 // 1024}MB or less"}
+        if int(request.headers.get('content-length') or 0) > MAX_UPLOAD_CHUNK_SIZE:
+            return json_response(too_large, 400)
+        with time_phase('read-body'):
+            chunk = await request.stream.read_limited(MAX_UPLOAD_CHUNK_SIZE)
+        if chunk is None:
+            return json_response(too_large, 400)
+
+        raw_offset = urllib.parse.parse_qs(request.query).get('offset', [''])[0]
+        offset = int(raw_offset) if re.fullmatch(r'\d+', raw_offset.strip()) else None
+        digest = parse_content_digest(request.headers.get('content-digest'))
+        with time_phase('chunk-write'):
+            status, body = await write_chunk(chunked_upload_id(request.path), offset, chunk, digest)
+        return json_response(body, status)
+
+    return json_response({'error': 'Endpoint not found'}, 404)
+
+def serve_stored_object(request):
+    """GET /demo-storage/<path>: an object kept by --storage-dir, cached like a CDN would"""
+    object_path = urllib.parse.unquote(request.path[len('/demo-storage/'):])
+    target = os.path.realpath(os.path.join(STORAGE_DIR, object_path))
+    if not target.startswith(os.path.realpath(STORAGE_DIR) + os.sep) or not os.path.isfile(target):
+        return json_response({'error': 'Object not found'}, 404)
+    with open(target, 'rb') as file:
+        content = file.read()
+    content_type = mimetypes.guess_type(target)[0] or 'application/octet-stream'
+    return Response(200, content, {'Content-Type': content_type, 'Cache-Control': 'public, max-age=31536000, immutable'})
+
+async def handle_api(request, mode):
+    try:
+        if request.method in ('GET', 'HEAD'):
+            return await handle_get(request, mode)
+        if request.method == 'POST':
+            return await handle_post(request)
+        return await handle_put(request)
+    except Exception:
+        return json_response({'error': 'Internal server error'}, 500)
+
+async def dispatch(request, mode):
+    """Route a request the way the Next.js catch-all route does"""
+    if STORAGE_DIR and request.path.startswith('/demo-storage/') and request.method in ('GET', 'HEAD'):
+        return serve_stored_object(request)
+    if not request.path.startswith('/api'):
+        return json_response({'error': 'Endpoint not found'}, 404)
+    if request.method in ('GET', 'HEAD', 'POST', 'PUT'):
+        return await handle_api(request, mode)
+    if request.method == 'OPTIONS':
+        return Response(200, b'', dict(CORS_HEADERS))
+    return Response(405, b'', {'Allow': 'GET, HEAD, OPTIONS, POST, PUT'})
+
+class BodyStream:
+    """A Content-Length or chunked request body, read incrementally.
+
+    read() returns the next piece, or b'' once the body has ended.
+    """
+
+    def __init__(self, reader, headers):
+        self.reader = reader
+        self.chunked = 'chunked' in headers.get('transfer-encoding', '').lower()
+        self.remaining = 0 if self.chunked else int(headers.get('content-length', 0) or 0)
+        self.has_body = self.chunked or self.remaining > 0
+        self.finished = not self.has_body
+
+    async def read(self):
+        if self.finished:
+            return b''
+        if self.chunked and self.remaining == 0:
+            size_line = await self.reader.readuntil(b'\r\n')
+            size = int(size_line.split(b';')[0].strip(), 16)
+            if size == 0:
+                # Discard optional trailers up to the terminating blank line
+                while await self.reader.readuntil(b'\r\n') != b'\r\n':
+                    pass
+                self.finished = True
+                return b''
+            self.remaining = size
+        chunk = await self.reader.read(min(self.remaining, BODY_READ_SIZE))
+        if not chunk:
+            raise asyncio.IncompleteReadError(b'', self.remaining)
+        self.remaining -= len(chunk)
+        if self.remaining == 0:
+            if self.chunked:
+                await self.reader.readexactly(2)
+            else:
+                self.finished = True
+        return chunk
+
+    async def read_limited(self, max_bytes):
+        """The whole body, or None once it passes max_bytes"""
+        chunks = []
+        length = 0
+        while chunk := await self.read():
+            length += len(chunk)
+            if length > max_bytes:
+                return None
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    async def read_all(self):
+        chunks = []
+        while chunk := await self.read():
+            chunks.append(chunk)
+        return b''.join(chunks)
+
+    async def discard(self, max_bytes, timeout):
+        """Skip the rest of the body; True when it ended within the limits"""
+        async def skip():
+            skipped = 0
+            while skipped <= max_bytes and (chunk := await self.read()):
+                skipped += len(chunk)
+        try:
+            await asyncio.wait_for(skip(), timeout)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError, ConnectionError):
+            return False
+        return self.finished
+
+async def handle_connection(reader, writer, mode):
+    """Serve HTTP/1.1 requests on one keep-alive connection"""
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b'\r\n\r\n')
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                return
+            lines = head.decode('latin-1').split('\r\n')
+            try:
+                method, target, version = lines[0].split(' ', 2)
+            except ValueError:
+                return
+            headers = {}
+            for line in lines[1:]:
+                key, sep, value = line.partition(':')
+                if sep:
+                    headers[key.strip().lower()] = value.strip()
+
+            body_stream = BodyStream(reader, headers)
+            path = target.partition('?')[0]
+
+            async def respond():
+                if (method == 'POST' and ('/submit' in path or '/upload' in path)) or method == 'PUT':
+                    # Uploads read the body as they go, and submits, upload sessions and chunks up to their limit, instead of buffering it first
+                    request = Request(method, target, headers, b'')
+                    request.stream = body_stream
+                elif body_stream.has_body:
+                    # Where the route's request.text() would run
+                    with time_phase('read-body'):
+                        request = Request(method, target, headers, await body_stream.read_all())
+                else:
+                    request = Request(method, target, headers, b'')
+                return await dispatch(request, mode)
+
+            if path.startswith('/api') and method in ('GET', 'HEAD', 'POST', 'PUT'):
+                response = await with_server_timing(method, path, respond)
+            else:
+                response = await respond()
+
+            connection = headers.get('connection', '').lower()
+            keep_alive = connection != 'close' and (version == 'HTTP/1.1' or connection == 'keep-alive')
+            # A response sent before the body was read ends the connection
+            # (the rest of the body is discarded briefly so the client still sees the response)
+            linger = not body_stream.finished
+            if linger:
+                keep_alive = False
+            status_line = f"HTTP/1.1 {response.status} {HTTPStatus(response.status).phrase}\r\n"
+            response_headers = dict(response.headers)
+            streaming = not isinstance(response.body, bytes)
+            if streaming:
+                response_headers['Transfer-Encoding'] = 'chunked'
+            elif response.status != 304:
+                response_headers['Content-Length'] = str(len(response.body))
+            response_headers['Connection'] = 'keep-alive' if keep_alive else 'close'
+            head_bytes = status_line + ''.join(f"{key}: {value}\r\n" for key, value in response_headers.items()) + '\r\n'
+            writer.write(head_bytes.encode('latin-1'))
+            if method == 'HEAD':
+                pass
+            elif streaming:
+                # Wait for the socket to drain between chunks so a slow reader applies backpressure
+                async for chunk in response.body:
+                    writer.write(f"{len(chunk):x}\r\n".encode('latin-1') + chunk + b'\r\n')
+                    await writer.drain()
+                writer.write(b'0\r\n\r\n')
+            else:
+                writer.write(response.body)
+            await writer.drain()
+            if linger:
+                await body_stream.discard(LINGER_MAX_BYTES, LINGER_TIMEOUT)
+            if not keep_alive:
+                return
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return
+    finally:
+        writer.close()
+
+# Event-loop delay windows from lib/event-loop.js
+EVENT_LOOP_WINDOW = 5.0
+EVENT_LOOP_RESOLUTION = 0.01
+
+class EventLoopMonitor:
+    """Equivalent of lib/event-loop.js: how late a RESOLUTION-second timer fires, over fixed windows"""
+
+    def __init__(self):
+        self.delays = []
+        self.last_window = None
+        self.task = None
+
+    def start(self):
+        self.task = asyncio.ensure_future(self.run())
+
+    def summarize(self):
+        delays = sorted(self.delays)
+        if not delays:
+            return {'meanMs': 0, 'p99Ms': 0, 'maxMs': 0}
+        return {
+            'meanMs': sum(delays) / len(delays) * 1000,
+            'p99Ms': delays[max(0, -(-99 * len(delays) // 100) - 1)] * 1000,
+            'maxMs': delays[-1] * 1000,
+        }
+
+    async def run(self):
+        window_started = time.perf_counter()
+        while True:
+            scheduled = time.perf_counter()
+            await asyncio.sleep(EVENT_LOOP_RESOLUTION)
+            now = time.perf_counter()
+            self.delays.append(max(0.0, now - scheduled - EVENT_LOOP_RESOLUTION))
+            if now - window_started >= EVENT_LOOP_WINDOW:
+                self.last_window = self.summarize()
+                self.delays = []
+                window_started = now
+
+    def get_metrics(self):
+        return {'windowMs': EVENT_LOOP_WINDOW * 1000, **(self.last_window or self.summarize())}
+
+event_loop_monitor = EventLoopMonitor()
+
+async def serve(host='127.0.0.1', port=3001, mode='demo'):
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(reader, writer, mode),
+        host, port, limit=MAX_HEADER_BYTES, backlog=4096
+    )
+    bound_port = server.sockets[0].getsockname()[1]
+    if STORAGE_DIR:
+        global DEMO_STORAGE_URL
+        DEMO_STORAGE_URL = f"http://{host}:{bound_port}/demo-storage"
+    # backend_test.py --local reads this line to discover the port
+    print(f"Listening on http://{host}:{bound_port}", flush=True)
+    event_loop_monitor.start()
+    async with server:
+        await server.serve_forever()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline stand-in for the hackathon submission API")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=3001, help="port to listen on (0 picks a free port)")
+    parser.add_argument('--mode', default='demo', help="value reported by /api/health")
+    parser.add_argument('--submit-delay', type=float, default=SUBMIT_DELAY, help="demo submit delay in seconds")
+    parser.add_argument('--upload-delay', type=float, default=UPLOAD_DELAY, help="demo upload delay in seconds")
+    parser.add_argument('--db-connections', type=int, default=DB_CONNECTIONS, help="limit concurrent simulated inserts (0 = unlimited)")
+    parser.add_argument('--coalesce-wait-ms', type=float, default=COALESCE_MAX_WAIT_MS, help="group commit window for /api/submit (0 disables)")
+    parser.add_argument('--coalesce-max-batch', type=int, default=COALESCE_MAX_BATCH, help="largest group commit flush")
+    parser.add_argument('--demo-store-capacity', type=int, default=DEMO_STORE_CAPACITY, help="rows kept in the demo store before the oldest are evicted")
+    parser.add_argument('--storage-dir', help="keep uploaded objects in this directory and serve them at /demo-storage/")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    SUBMIT_DELAY = args.submit_delay
+    UPLOAD_DELAY = args.upload_delay
+    DB_CONNECTIONS = args.db_connections
+    COALESCE_MAX_WAIT_MS = args.coalesce_wait_ms
+    submit_coalescer = WriteCoalescer(flush_coalesced_submissions, args.coalesce_max_batch, args.coalesce_wait_ms)
+    demo_store = DemoStore(args.demo_store_capacity)
+    STORAGE_DIR = args.storage_dir
+    try:
+        asyncio.run(serve(args.host, args.port, args.mode))
+    except KeyboardInterrupt:
+        pass
@@ -14,11 +14,19 @@ CREATE TABLE hackathon_submissions (
   project_url TEXT,
   project_logo_url TEXT,
   project_banner_url TEXT,
+  -- {"thumbnail": url, "medium": url} from /api/upload?variants=true, for galleries
+  project_logo_variants JSONB,
+  project_banner_variants JSONB,
   video_demo_link TEXT,
   created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
   updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Image variant columns added after the first release. Every insert writes them, so an existing
+-- deployment must run these two before upgrading or all submissions will fail
+ALTER TABLE hackathon_submissions ADD COLUMN IF NOT EXISTS project_logo_variants JSONB;
+ALTER TABLE hackathon_submissions ADD COLUMN IF NOT EXISTS project_banner_variants JSONB;
+
 -- Create storage bucket for hackathon assets (logos, banners)
 INSERT INTO storage.buckets (id, name, public) VALUES ('hackathon-assets', 'hackathon-assets', true);
 
@@ -39,9 +47,13 @@ CREATE POLICY "Allow public deletes" ON storage.objects FOR DELETE USING (bucket
 
 -- Create indexes for better performance
 CREATE INDEX idx_hackathon_created ON hackathon_submissions(created_at DESC);
-CREATE INDEX idx_hackathon_team ON hackathon_submissions(team_name);
-CREATE INDEX idx_hackathon_email ON hackathon_submissions(team_lead_email);
+-- text_pattern_ops lets the teamName prefix filter (LIKE 'prefix%') use the index
+CREATE INDEX idx_hackathon_team ON hackathon_submissions(team_name text_pattern_ops);
+-- Email lookups come back newest first, so keep them in created_at order
+CREATE INDEX idx_hackathon_email ON hackathon_submissions(team_lead_email, created_at DESC);
 CREATE INDEX idx_hackathon_project ON hackathon_submissions(project_title);
+-- Backs the title full-text filter (textSearch with the 'simple' config)
+CREATE INDEX idx_hackathon_title_search ON hackathon_submissions USING GIN (to_tsvector('simple', project_title));
 
 -- Auto-update timestamp trigger
 CREATE OR REPLACE FUNCTION update_hackathon_timestamp()